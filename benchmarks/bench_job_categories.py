@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the job categorization engine in terraform-import/job_categories.py
+
+Generates synthetic marketing job names (mostly categorized, some matching
+nothing) and times the compiled CategoryEngine against the re.search chain it
+replaced, which tested each category's regular expression in turn. Both must
+agree on every name.
+
+Usage:
+    python benchmarks/bench_job_categories.py
+    python benchmarks/bench_job_categories.py --names 1000 100000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+IMPORT_DIR = Path(__file__).resolve().parent.parent / "terraform-import"
+sys.path.insert(0, str(IMPORT_DIR))
+
+from job_categories import load_engine  # noqa: E402
+
+WORDS = [
+    "attribution", "touch", "channel", "campaign", "performance", "ads", "adwords",
+    "ltv", "lifetime", "customer", "segment", "executive", "dashboard", "kpi", "c-level", "C_Level",
+    "facebook", "google", "linkedin", "platform", "sync",
+    "daily", "weekly", "hourly", "refresh", "model", "build", "snapshot", "export",
+    "revenue", "orders", "funnel", "email", "web", "report", "prod", "staging",
+]
+FILLER = ["daily", "weekly", "hourly", "refresh", "model", "build", "snapshot", "export", "orders", "web"]
+
+
+def legacy_categorize(job_name: str) -> str:
+    """The re.search chain discovery used before job_categories.py, one expression per category"""
+    name_lower = job_name.lower()
+
+    if re.search(r'attribution|touch|channel', name_lower):
+        return 'attribution'
+    elif re.search(r'campaign|performance|ads?|adwords', name_lower):
+        return 'campaign'
+    elif re.search(r'ltv|lifetime|customer|segment', name_lower):
+        return 'customer_ltv'
+    elif re.search(r'executive|dashboard|kpi|c.level', name_lower):
+        return 'executive'
+    elif re.search(r'facebook|google|linkedin|platform|sync', name_lower):
+        return 'platform_integration'
+    else:
+        return 'general'
+
+
+def generate_names(count: int, seed: int = 42) -> list:
+    """count job names of 2-6 words; one in five uses only words that match no category"""
+    rng = random.Random(seed)
+    names = []
+    for index in range(count):
+        words = FILLER if index % 5 == 0 else WORDS
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(2, 6)))
+        names.append(f"Marketing {name.title()} {index}")
+    return names
+
+
+def best_of(repeat: int, categorize, names: list) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [categorize(name) for name in names]
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job categorization')
+    parser.add_argument('--names', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Job name counts to benchmark (default: 1000 10000 100000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size; the best is reported (default: 3)')
+    args = parser.parse_args()
+
+    engine = load_engine()
+
+    print(f"{'names':>8} {'legacy (ms)':>12} {'engine (ms)':>12} {'us/name':>8} {'speedup':>8}")
+    for count in args.names:
+        names = generate_names(count)
+        legacy, expected = best_of(args.repeat, legacy_categorize, names)
+        compiled, result = best_of(args.repeat, engine.categorize, names)
+
+        mismatches = [(name, want, got) for name, want, got in zip(names, expected, result) if want != got]
+        if mismatches:
+            name, want, got = mismatches[0]
+            print(f"❌ {len(mismatches)} names categorized differently, e.g. '{name}': {got}, expected {want}")
+            return 1
+
+        print(f"{count:>8} {legacy * 1000:>12.1f} {compiled * 1000:>12.1f} "
+              f"{compiled / count * 1e6:>8.2f} {legacy / compiled:>7.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
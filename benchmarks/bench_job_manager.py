@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for dbt_job_manager.py deploy, list and cleanup
+
+Runs JobManager.deploy_jobs, list_team_jobs and cleanup_old_jobs against the
+local API simulator (dbt_cloud_simulator.py) over a grid of scales: jobs per
+tfvars file, jobs already in the project, and simulated round-trip time. Each
+run gets a freshly seeded account and executes in its own process, so peak
+RSS is that run's alone. Reported per run: requests issued, wall-clock,
+p50/p95 request latency as served by the simulator (including the simulated
+RTT) and peak RSS.
+
+Every result is appended to a JSON-lines history file together with the
+commit it ran on. Each run is compared with the previous result for the same
+scenario, and wall-clock or request-count regressions are flagged.
+
+Operations:
+    deploy    - deploy a config of --config-jobs jobs that do not exist yet
+    redeploy  - deploy the same config again (every job unchanged)
+    list      - list the team's jobs
+    cleanup   - delete the team's branch jobs older than --cleanup-days
+
+Usage:
+    python benchmarks/bench_job_manager.py
+    python benchmarks/bench_job_manager.py --ops deploy list --config-jobs 100 1000 \\
+        --project-jobs 1000 10000 --rtt 0 0.05 --concurrency 16
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / "dbt-analytics-team" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from bench_tfvars_parser import generate_tfvars  # noqa: E402
+from dbt_cloud_simulator import DBTCloudSimulator, SimulatorConfig, SimulatorState  # noqa: E402
+
+OPERATIONS = ('deploy', 'redeploy', 'list', 'cleanup')
+TEAM_NAME = "analytics-team"
+DEFAULT_HISTORY = BENCH_DIR / "history" / "bench_job_manager.jsonl"
+
+# Flag runs that got this much slower (or issued this many more requests) than the last one
+REGRESSION_THRESHOLD = 0.20
+
+
+def _run_operation(operation: str, env: Dict[str, str], config_file: str, concurrency: int,
+                   use_async: bool, cleanup_days: int, results) -> None:
+    """Child process: run one JobManager operation and report wall-clock and peak RSS"""
+    os.environ.update(env)
+    from dbt_job_manager import JobManager
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        manager = JobManager(pool_size=concurrency)
+        start = time.perf_counter()
+        if operation in ('deploy', 'redeploy'):
+            manager.deploy_jobs(config_file, concurrency=concurrency, use_async=use_async)
+        elif operation == 'list':
+            manager.list_team_jobs(use_async=use_async, concurrency=concurrency)
+        else:
+            manager.cleanup_old_jobs(cleanup_days, concurrency=concurrency, use_async=use_async)
+        wall = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak_mb = peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    results.put({"wall_s": wall, "peak_rss_mb": peak_mb})
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_scenario(operation: str, config_jobs: int, project_jobs: int, rtt: float, args,
+                 config_file: str) -> Dict[str, Any]:
+    """Seed an account, run the operation in a child process and collect its metrics"""
+    state = SimulatorState.seeded(project_jobs, teams=(TEAM_NAME, "other-team"), seed=args.seed)
+    project_id = next(iter(state.resources['projects']))
+    dev_environment_id = next(env['id'] for env in state.resources['environments'].values()
+                              if env['name'] == 'Development')
+    config = SimulatorConfig(latency=rtt, page_size=args.page_size, seed=args.seed)
+
+    env = {
+        "DBTCLOUD_ACCOUNT_ID": str(state.account_id),
+        "DBTCLOUD_TOKEN": "benchmark",
+        "PROJECT_ID": str(project_id),
+        "ENVIRONMENT_ID": str(dev_environment_id),
+        "TEAM_NAME": TEAM_NAME,
+        "CI_COMMIT_REF_SLUG": "benchmark",
+        "GITLAB_USER_LOGIN": "benchmark",
+        # Measure parsing on every run rather than cache hits
+        "DBT_JOB_MANAGER_CACHE_DIR": "",
+        "DBTCLOUD_PAGE_SIZE": str(args.page_size),
+    }
+
+    context = multiprocessing.get_context('spawn')
+    with DBTCloudSimulator(state, config) as simulator:
+        env["DBTCLOUD_HOST_URL"] = simulator.url
+
+        def run(op: str) -> Dict[str, Any]:
+            results = context.Queue()
+            child = context.Process(target=_run_operation,
+                                    args=(op, env, config_file, args.concurrency, args.use_async,
+                                          args.cleanup_days, results))
+            child.start()
+            child.join()
+            if child.exitcode != 0:
+                raise RuntimeError(f"{op} run failed with exit code {child.exitcode}")
+            return results.get()
+
+        if operation == 'redeploy':
+            # The first deploy creates the jobs; only the second one is measured
+            run('deploy')
+            simulator.reset_stats()
+        outcome = run(operation)
+        latencies = list(simulator.latencies)
+        requests_by_status = dict(simulator.stats)
+
+    return {
+        "operation": operation,
+        "config_jobs": config_jobs if operation in ('deploy', 'redeploy') else None,
+        "project_jobs": project_jobs,
+        "rtt_ms": round(rtt * 1000, 3),
+        "concurrency": args.concurrency,
+        "async": args.use_async,
+        "requests": sum(requests_by_status.values()),
+        "requests_by_status": requests_by_status,
+        "wall_s": round(outcome['wall_s'], 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "peak_rss_mb": round(outcome['peak_rss_mb'], 1),
+    }
+
+
+def scenario_key(result: Dict[str, Any]) -> tuple:
+    return tuple(result.get(field) for field in
+                 ('operation', 'config_jobs', 'project_jobs', 'rtt_ms', 'concurrency', 'async'))
+
+
+def load_history(path: Path) -> Dict[tuple, Dict[str, Any]]:
+    """Most recent recorded result for each scenario"""
+    latest = {}
+    if path.exists():
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue
+                latest[scenario_key(result)] = result
+    return latest
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(result: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> str:
+    if not previous:
+        return "new"
+    notes = []
+    wall_change = (result['wall_s'] - previous['wall_s']) / previous['wall_s'] if previous['wall_s'] else 0.0
+    notes.append(f"{wall_change:+.0%} wall vs {previous.get('commit', '?')}")
+    if wall_change > REGRESSION_THRESHOLD:
+        notes.append("⚠️  slower")
+    if previous['requests'] and (result['requests'] - previous['requests']) / previous['requests'] > REGRESSION_THRESHOLD:
+        notes.append(f"⚠️  {result['requests'] - previous['requests']:+d} requests")
+    return ", ".join(notes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JobManager deploy, list and cleanup')
+    parser.add_argument('--ops', nargs='+', choices=OPERATIONS, default=list(OPERATIONS),
+                        help='Operations to run (default: all)')
+    parser.add_argument('--config-jobs', type=int, nargs='+', default=[10, 100, 500],
+                        help='Jobs per tfvars file for deploy/redeploy (default: 10 100 500)')
+    parser.add_argument('--project-jobs', type=int, nargs='+', default=[1000, 10000],
+                        help='Jobs already in the project (default: 1000 10000)')
+    parser.add_argument('--rtt', type=float, nargs='+', default=[0.0, 0.02],
+                        help='Simulated round-trip times in seconds (default: 0 0.02)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrency passed to JobManager (default: 8)')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio code paths')
+    parser.add_argument('--cleanup-days', type=int, default=28,
+                        help='Age threshold for cleanup; seeded jobs span 30 days (default: 28)')
+    parser.add_argument('--page-size', type=int, default=100, help='API page size (default: 100)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the simulated account (default: 0)')
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY,
+                        help=f'JSON-lines history file (default: {DEFAULT_HISTORY.relative_to(BENCH_DIR.parent)})')
+    parser.add_argument('--no-history', action='store_true', help='Do not read or append to the history file')
+    args = parser.parse_args()
+
+    history = {} if args.no_history else load_history(args.history)
+    run_info = {
+        "commit": git_commit(),
+        "recorded_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    print(f"{'operation':<10} {'cfg':>6} {'project':>8} {'rtt ms':>7} {'requests':>9} {'wall s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'RSS MB':>7}  vs previous")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for operation in args.ops:
+            config_sizes = args.config_jobs if operation in ('deploy', 'redeploy') else [None]
+            for config_jobs in config_sizes:
+                config_file = os.path.join(tmp, f"bench_{config_jobs or 0}.tfvars")
+                if config_jobs and not os.path.exists(config_file):
+                    with open(config_file, 'w') as f:
+                        f.write(generate_tfvars(config_jobs))
+                for project_jobs in args.project_jobs:
+                    for rtt in args.rtt:
+                        result = dict(run_scenario(operation, config_jobs, project_jobs, rtt, args, config_file),
+                                      **run_info)
+                        note = compare(result, history.get(scenario_key(result)))
+                        print(f"{operation:<10} {config_jobs or '-':>6} {project_jobs:>8} {result['rtt_ms']:>7g} "
+                              f"{result['requests']:>9} {result['wall_s']:>8.3f} {result['p50_ms']:>8.2f} "
+                              f"{result['p95_ms']:>8.2f} {result['peak_rss_mb']:>7.1f}  {note}")
+                        results.append(result)
+
+    if not args.no_history:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, 'a') as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print(f"\n💾 Appended {len(results)} results to {args.history}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
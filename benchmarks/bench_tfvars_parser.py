@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the .tfvars parser used by dbt_job_manager.py
+
+Generates synthetic tfvars files shaped like env_file/*.tfvars (comments,
+multi-line execute_steps, numeric lists, booleans) and times parse_tfvars at
+increasing job counts. Time per job should stay flat as the file grows.
+
+Usage:
+    python benchmarks/bench_tfvars_parser.py
+    python benchmarks/bench_tfvars_parser.py --jobs 1000 10000 50000 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "dbt-analytics-team" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from tfvars_parser import parse_tfvars  # noqa: E402
+
+
+def generate_tfvars(job_count: int) -> str:
+    """Build a tfvars document with job_count jobs"""
+    lines = [
+        '# Synthetic benchmark configuration',
+        'dbtcloud_account_id = "12345"',
+        'project_id = "101"  # From central infrastructure output',
+        'team_name = "analytics-team"',
+        '',
+        'jobs = [',
+    ]
+    for i in range(job_count):
+        lines.extend([
+            '  {',
+            f'    name           = "synthetic-job-{i}"',
+            f'    description    = "Synthetic job {i} with \\"quoted\\" text"',
+            '    environment_id = "999"  # shared terraform-dev environment',
+            '    execute_steps = [',
+            '      "dbt deps",',
+            f'      "dbt run --select tag:group_{i % 50}",',
+            f'      "dbt test --select tag:group_{i % 50}"',
+            '    ]',
+            '    schedule_type  = "custom"',
+            f'    schedule_hours = [{i % 24}, {(i + 12) % 24}]  // twice daily',
+            '    schedule_days  = [1, 2, 3, 4, 5]',
+            '    threads        = 8',
+            '    generate_docs  = true',
+            '  },',
+        ])
+    lines.append(']')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the tfvars parser')
+    parser.add_argument('--jobs', type=int, nargs='+', default=[100, 1000, 10000, 50000],
+                        help='Job counts to benchmark (default: 100 1000 10000 50000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size; the best is reported (default: 3)')
+    args = parser.parse_args()
+
+    print(f"{'jobs':>8} {'size (MB)':>10} {'best (s)':>10} {'us/job':>8} {'MB/s':>8}")
+    for job_count in args.jobs:
+        text = generate_tfvars(job_count)
+        size_mb = len(text.encode('utf-8')) / 1_000_000
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = parse_tfvars(text)
+            timings.append(time.perf_counter() - start)
+
+        if len(result['jobs']) != job_count:
+            print(f"❌ Parsed {len(result['jobs'])} jobs, expected {job_count}")
+            return 1
+
+        best = min(timings)
+        print(f"{job_count:>8} {size_mb:>10.2f} {best:>10.3f} {best / job_count * 1e6:>8.1f} {size_mb / best:>8.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
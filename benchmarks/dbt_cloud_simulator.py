@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the dbt Cloud v2 API used by the job manager and the
+terraform-import scripts
+
+Serves /api/v2/accounts/<id>/ on localhost from an in-memory data set:
+jobs (list, get, create, update, delete), projects, environments,
+connections, users, groups and repositories, with offset/limit pagination
+shaped like the real API (extra.pagination.total_count). Every request can be
+given simulated latency, a page size cap, injected 429/5xx responses and a
+token-bucket rate limit that answers 429 with Retry-After, so client retry and
+concurrency behaviour can be load tested without touching a real account.
+
+Data sets are seeded deterministically from 10 to 100k+ jobs. In record mode
+requests are forwarded to a real dbt Cloud host and the responses saved to a
+JSONL cassette (the token is never written); replay mode serves a cassette
+back, so a measurement can be repeated against identical responses.
+
+Usage:
+    python benchmarks/dbt_cloud_simulator.py --jobs 10000 --latency 0.05 --port 8765
+    python benchmarks/dbt_cloud_simulator.py --jobs 1000 --throttle-rate 0.05 --error-rate 0.02
+    python benchmarks/dbt_cloud_simulator.py --record cassette.jsonl --upstream https://cloud.getdbt.com
+    python benchmarks/dbt_cloud_simulator.py --replay cassette.jsonl --latency 0.08
+
+    # In-process, e.g. from a benchmark
+    with DBTCloudSimulator(SimulatorState.seeded(10000), SimulatorConfig(latency=0.05)) as sim:
+        os.environ["DBTCLOUD_HOST_URL"] = sim.url
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+RESOURCES = ('jobs', 'projects', 'environments', 'connections', 'users', 'groups', 'repositories')
+
+# Query parameters each list endpoint filters on
+LIST_FILTERS = {
+    'jobs': ('project_id', 'environment_id'),
+    'environments': ('project_id',),
+    'repositories': ('project_id',),
+}
+
+SERVER_ERRORS = (500, 502, 503, 504)
+
+_ROUTE_RE = re.compile(r'^/api/v2/accounts/(?P<account_id>\d+)/(?P<resource>[a-z_]+)/(?:(?P<item_id>\d+)/)?$')
+
+
+class SimulatorConfig:
+    """Per-request behaviour of the simulator"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, page_size: int = 100,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, rate_limit: float = 0.0,
+                 retry_after: float = 1.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.seed = seed
+
+
+class SimulatorState:
+    """In-memory account: resource name -> {id: object}"""
+
+    def __init__(self, account_id: int = 1):
+        self.account_id = account_id
+        self.resources: Dict[str, Dict[int, Dict[str, Any]]] = {resource: {} for resource in RESOURCES}
+        self.next_id = 1
+        self.lock = threading.Lock()
+        # Filtered listings are reused across pages until the resource changes
+        self._versions = Counter()
+        self._listing_cache: Dict[Tuple, Tuple[int, List[Dict[str, Any]]]] = {}
+
+    @classmethod
+    def seeded(cls, job_count: int, account_id: int = 1, project_count: int = 1,
+               teams: Tuple[str, ...] = ('analytics-team', 'marketing-analytics-team'),
+               branch_share: float = 0.8, seed: int = 0) -> "SimulatorState":
+        """Deterministic account with job_count jobs spread over projects and teams
+
+        Roughly branch_share of the jobs are tagged branch jobs named
+        team-branch-user-job; the rest are untagged production jobs named
+        team-job, as Terraform creates them. Creation times spread over 30 days.
+        """
+        rng = random.Random(seed)
+        state = cls(account_id)
+        now = datetime.utcnow()
+
+        users = [state.add('users', {"first_name": f"User{i}", "last_name": "Sim", "email": f"user{i}@example.com"})
+                 for i in range(20)]
+        for name in ('Owner', 'Member', 'Analyst', 'Developer', 'Read Only'):
+            state.add('groups', {"name": name, "assign_by_default": name == 'Member'})
+        connection = state.add('connections', {"name": "Simulated Warehouse", "type": "snowflake"})
+
+        projects = []
+        for p in range(project_count):
+            repository = state.add('repositories', {"remote_url": f"git@example.com:data/project-{p}.git"})
+            project = state.add('projects', {"name": f"Simulated Project {p}", "connection_id": connection['id'],
+                                             "repository_id": repository['id']})
+            repository['project_id'] = project['id']
+            environments = [state.add('environments', {"name": name, "project_id": project['id'],
+                                                       "type": "development" if name == 'Development' else "deployment",
+                                                       "dbt_version": "versionless"})
+                            for name in ('Development', 'Staging', 'Production')]
+            projects.append((project, environments))
+
+        # Shared sub-objects keep a 100k-job account small; updates replace whole jobs
+        settings = {"threads": 4, "target_name": "default", "generate_docs": True, "run_generate_sources": False}
+        triggers = {"github_webhook": False, "git_provider_webhook": False, "schedule": True, "on_merge": False}
+        schedule = {"cron": "0 6 * * *", "date": {"type": "custom_cron", "cron": "0 6 * * *"},
+                    "time": {"type": "every_hour", "interval": 1}}
+        for i in range(job_count):
+            project, environments = projects[i % project_count]
+            team = teams[i % len(teams)]
+            created_at = now - timedelta(seconds=rng.randrange(30 * 24 * 3600))
+            job = {
+                "project_id": project['id'],
+                "state": 1,
+                "execute_steps": ["dbt deps", f"dbt run --select tag:group_{i % 50}", f"dbt test --select tag:group_{i % 50}"],
+                "settings": settings,
+                "triggers": triggers,
+                "schedule": schedule,
+                "created_at": created_at.isoformat() + "+00:00",
+                "updated_at": created_at.isoformat() + "+00:00",
+            }
+            if rng.random() < branch_share:
+                branch = f"feature-{rng.randrange(200)}"
+                user = users[rng.randrange(len(users))]['first_name'].lower()
+                job.update({
+                    "name": f"{team}-{branch}-{user}-job-{i}",
+                    "environment_id": environments[0]['id'],
+                    "tags": [f"team:{team}", f"branch:{branch}", f"user:{user}", "commit:0000000f",
+                             f"deployed:{created_at.isoformat()}"],
+                })
+            else:
+                job.update({"name": f"{team}-job-{i}", "environment_id": environments[2]['id']})
+            state.add('jobs', job)
+        return state
+
+    def add(self, resource: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert an object with the next id"""
+        with self.lock:
+            obj = dict(obj, id=self.next_id, account_id=self.account_id)
+            self.next_id += 1
+            self.resources[resource][obj['id']] = obj
+            self._versions[resource] += 1
+        return obj
+
+    def get(self, resource: str, item_id: int) -> Optional[Dict[str, Any]]:
+        return self.resources[resource].get(item_id)
+
+    def listing(self, resource: str, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Objects ordered by id, filtered on the resource's filter parameters"""
+        applied = tuple(sorted((key, value) for key, value in filters.items()
+                               if key in LIST_FILTERS.get(resource, ())))
+        cache_key = (resource, applied)
+        with self.lock:
+            version = self._versions[resource]
+            cached = self._listing_cache.get(cache_key)
+            if cached and cached[0] == version:
+                return cached[1]
+            # Ids are assigned in increasing order, so insertion order is id order
+            items = [obj for obj in self.resources[resource].values()
+                     if all(str(obj.get(key)) == value for key, value in applied)]
+            self._listing_cache[cache_key] = (version, items)
+            return items
+
+    def replace(self, resource: str, item_id: int, obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            current = self.resources[resource].get(item_id)
+            if current is None:
+                return None
+            updated = dict(current, **obj)
+            updated.update(id=item_id, account_id=self.account_id, created_at=current.get('created_at'),
+                           updated_at=datetime.utcnow().isoformat() + "+00:00")
+            self.resources[resource][item_id] = updated
+            self._versions[resource] += 1
+            return updated
+
+    def remove(self, resource: str, item_id: int) -> bool:
+        with self.lock:
+            removed = self.resources[resource].pop(item_id, None)
+            if removed is not None:
+                self._versions[resource] += 1
+            return removed is not None
+
+
+class Cassette:
+    """Recorded responses keyed by method, path, query and request body
+
+    Repeated identical requests are replayed in recorded order, with the last
+    response repeating once they run out.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.positions = Counter()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, path: str, query: str, body: bytes) -> str:
+        normalized_query = urlencode(sorted(parse_qsl(query)))
+        return f"{method} {path}?{normalized_query} {hashlib.sha256(body).hexdigest()[:16]}"
+
+    def load(self) -> "Cassette":
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries.setdefault(entry['key'], []).append(entry)
+        return self
+
+    def record(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        entry = {"key": key, "status": status, "headers": headers, "body": body.decode('utf-8', 'replace')}
+        with self.lock:
+            self.entries.setdefault(key, []).append(entry)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def replay(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entries = self.entries.get(key)
+            if not entries:
+                return None
+            position = min(self.positions[key], len(entries) - 1)
+            self.positions[key] += 1
+            return entries[position]
+
+
+class DBTCloudSimulator:
+    """Threaded localhost server for a SimulatorState, a recording proxy or a replayed cassette"""
+
+    def __init__(self, state: Optional[SimulatorState] = None, config: Optional[SimulatorConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0, cassette: Optional[Cassette] = None,
+                 mode: str = "simulate", upstream: Optional[str] = None):
+        if mode not in ("simulate", "record", "replay"):
+            raise ValueError(f"Unknown simulator mode: {mode}")
+        if mode == "record" and not upstream:
+            raise ValueError("Record mode needs an upstream host")
+        if mode in ("record", "replay") and cassette is None:
+            raise ValueError(f"{mode.capitalize()} mode needs a cassette")
+
+        self.state = state or SimulatorState()
+        self.config = config or SimulatorConfig()
+        self.cassette = cassette
+        self.mode = mode
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self.stats = Counter()
+        self.latencies: List[float] = []
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._tokens = float(max(1, int(self.config.rate_limit)))
+        self._updated = time.monotonic()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "DBTCloudSimulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "DBTCloudSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.latencies.clear()
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _throttled(self) -> bool:
+        """Token-bucket rate limit plus random 429 injection"""
+        with self._lock:
+            if self.config.rate_limit > 0:
+                now = time.monotonic()
+                capacity = max(1, int(self.config.rate_limit))
+                self._tokens = min(capacity, self._tokens + (now - self._updated) * self.config.rate_limit)
+                self._updated = now
+                if self._tokens < 1:
+                    return True
+                self._tokens -= 1
+            return self.config.throttle_rate > 0 and self._rng.random() < self.config.throttle_rate
+
+    def _delay(self) -> None:
+        if self.config.latency or self.config.jitter:
+            delay = self.config.latency + self._random() * 2 * self.config.jitter - self.config.jitter
+            time.sleep(max(0.0, delay))
+
+    def handle(self, method: str, raw_path: str, headers: Dict[str, str],
+               body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """Produce (status, headers, body) for one request"""
+        parsed = urlparse(raw_path)
+
+        if self.mode == "record":
+            status, response_headers, response_body = self._forward(method, raw_path, headers, body)
+            self.cassette.record(Cassette.key(method, parsed.path, parsed.query, body),
+                                 status, response_headers, response_body)
+            return status, response_headers, response_body
+
+        self._delay()
+        if self._throttled():
+            return _json_response(429, _error(429, "Rate limit exceeded"),
+                                  {"Retry-After": f"{self.config.retry_after:g}"})
+        if self.config.error_rate > 0 and self._random() < self.config.error_rate:
+            status = SERVER_ERRORS[int(self._random() * len(SERVER_ERRORS))]
+            return _json_response(status, _error(status, "Injected server error"))
+
+        if self.mode == "replay":
+            entry = self.cassette.replay(Cassette.key(method, parsed.path, parsed.query, body))
+            if entry is None:
+                return _json_response(404, _error(404, f"No recorded response for {method} {parsed.path}"))
+            return entry['status'], entry['headers'], entry['body'].encode('utf-8')
+
+        if not headers.get('Authorization', '').startswith('Token '):
+            return _json_response(401, _error(401, "Invalid token"))
+        return self._simulate(method, parsed.path, dict(parse_qsl(parsed.query)), body)
+
+    def _simulate(self, method: str, path: str, query: Dict[str, str],
+                  body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        match = _ROUTE_RE.match(path)
+        if not match or match.group('resource') not in RESOURCES:
+            return _json_response(404, _error(404, f"Unknown endpoint {path}"))
+        if int(match.group('account_id')) != self.state.account_id:
+            return _json_response(403, _error(403, "Account not accessible with this token"))
+
+        resource = match.group('resource')
+        item_id = int(match.group('item_id')) if match.group('item_id') else None
+
+        if method == "GET" and item_id is None:
+            return self._list(resource, query)
+        if method == "GET":
+            obj = self.state.get(resource, item_id)
+            return _json_response(200, _ok(obj)) if obj else _json_response(404, _error(404, "Not found"))
+
+        if resource != 'jobs':
+            return _json_response(405, _error(405, f"{method} is not simulated for {resource}"))
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return _json_response(400, _error(400, "Request body is not valid JSON"))
+
+        if method == "POST" and item_id is None:
+            missing = [field for field in ('name', 'project_id', 'environment_id') if not payload.get(field)]
+            if missing:
+                return _json_response(400, _error(400, f"Missing required fields: {', '.join(missing)}"))
+            now = datetime.utcnow().isoformat() + "+00:00"
+            job = self.state.add('jobs', dict(payload, state=1, created_at=now, updated_at=now))
+            return _json_response(201, _ok(job))
+        if method == "POST":
+            job = self.state.replace('jobs', item_id, payload)
+            return _json_response(200, _ok(job)) if job else _json_response(404, _error(404, "Not found"))
+        if method == "DELETE" and item_id is not None:
+            if self.state.remove('jobs', item_id):
+                return 204, {}, b""
+            return _json_response(404, _error(404, "Not found"))
+        return _json_response(405, _error(405, f"{method} is not simulated"))
+
+    def _list(self, resource: str, query: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        try:
+            offset = max(0, int(query.get('offset', 0)))
+            limit = int(query.get('limit', self.config.page_size))
+        except ValueError:
+            return _json_response(400, _error(400, "offset and limit must be integers"))
+        # Like the real API, silently cap the page size
+        limit = max(1, min(limit, self.config.page_size))
+
+        items = self.state.listing(resource, query)
+        page = items[offset:offset + limit]
+        response = _ok(page)
+        response["extra"] = {
+            "filters": {key: value for key, value in query.items() if key not in ('offset', 'limit')},
+            "order_by": "id",
+            "pagination": {"count": len(page), "total_count": len(items)},
+        }
+        return _json_response(200, response)
+
+    def _forward(self, method: str, raw_path: str, headers: Dict[str, str],
+                 body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        forwarded = {key: value for key, value in headers.items()
+                     if key.lower() in ('authorization', 'content-type', 'accept')}
+        request = urllib.request.Request(self.upstream + raw_path, data=body or None, method=method,
+                                         headers=forwarded)
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                status, response_headers, response_body = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, response_headers, response_body = e.code, e.headers, e.read()
+        kept = {key: response_headers[key] for key in ('Content-Type', 'Retry-After') if response_headers.get(key)}
+        return status, kept, response_body
+
+    def _handler_class(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _serve(self):
+                start = time.perf_counter()
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, response_body = simulator.handle(self.command, self.path, dict(self.headers), body)
+
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(response_body)))
+                self.end_headers()
+                self.wfile.write(response_body)
+
+                with simulator._lock:
+                    simulator.stats[f"{self.command} {status}"] += 1
+                    simulator.latencies.append(time.perf_counter() - start)
+
+            do_GET = do_POST = do_DELETE = _serve
+
+        return Handler
+
+
+def _ok(data: Any) -> Dict[str, Any]:
+    return {"status": {"code": 200, "is_success": True}, "data": data}
+
+
+def _error(code: int, message: str) -> Dict[str, Any]:
+    return {"status": {"code": code, "is_success": False, "user_message": message}, "data": None}
+
+
+def _json_response(status: int, payload: Dict[str, Any],
+                   headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    return status, dict(headers or {}, **{"Content-Type": "application/json"}), json.dumps(payload).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local dbt Cloud v2 API simulator')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765, 0 for any)')
+    parser.add_argument('--account-id', type=int, default=1, help='Simulated account ID (default: 1)')
+    parser.add_argument('--jobs', type=int, default=1000, help='Number of seeded jobs (default: 1000)')
+    parser.add_argument('--projects', type=int, default=1, help='Number of seeded projects (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for data and faults (default: 0)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Uniform +/- seconds around --latency (default: 0)')
+    parser.add_argument('--page-size', type=int, default=100, help='Largest page returned by list endpoints (default: 100)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 5xx (default: 0)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with a 429 (default: 0)')
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help='Requests per second before 429 + Retry-After responses (default: unlimited)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s (default: 1)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='CASSETTE', help='Proxy to --upstream and append responses to CASSETTE')
+    mode.add_argument('--replay', metavar='CASSETTE', help='Serve responses recorded in CASSETTE')
+    parser.add_argument('--upstream', help='Real dbt Cloud host to record from, e.g. https://cloud.getdbt.com')
+    args = parser.parse_args()
+
+    config = SimulatorConfig(latency=args.latency, jitter=args.jitter, page_size=args.page_size,
+                             error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                             rate_limit=args.rate_limit, retry_after=args.retry_after, seed=args.seed)
+    if args.record:
+        if not args.upstream:
+            parser.error('--record requires --upstream')
+        simulator = DBTCloudSimulator(config=config, host=args.host, port=args.port,
+                                      cassette=Cassette(args.record), mode="record", upstream=args.upstream)
+        print(f"⏺️  Recording {args.upstream} to {args.record}")
+    elif args.replay:
+        simulator = DBTCloudSimulator(config=config, host=args.host, port=args.port,
+                                      cassette=Cassette(args.replay).load(), mode="replay")
+        print(f"▶️  Replaying {args.replay}")
+    else:
+        print(f"🌱 Seeding {args.jobs} jobs across {args.projects} project(s)...")
+        state = SimulatorState.seeded(args.jobs, account_id=args.account_id, project_count=args.projects,
+                                      seed=args.seed)
+        simulator = DBTCloudSimulator(state, config, host=args.host, port=args.port)
+        first_project = next(iter(state.resources['projects']))
+        print(f"   export DBTCLOUD_ACCOUNT_ID={args.account_id} PROJECT_ID={first_project} DBTCLOUD_TOKEN=simulated")
+
+    simulator.start()
+    print(f"   export DBTCLOUD_HOST_URL={simulator.url}")
+    print("🛰️  Simulator running, Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+        print("\n📊 Requests served:")
+        for key, count in sorted(simulator.stats.items()):
+            print(f"   {key}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
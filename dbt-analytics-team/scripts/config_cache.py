@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for parsed job configuration files
+
+Entries are keyed by a SHA-256 of the file content plus the parser that
+produced them, so an edited file or a parser change is always a miss. Values
+are stored as zlib-compressed JSON (compact, and safe to load from a shared CI
+cache). The directory is bounded in size; the least recently used entries are
+evicted first.
+
+The default location, .cache/dbt-job-manager, sits inside the project
+directory so a GitLab CI `cache:` entry can carry it between stages.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_CACHE_DIR = ".cache/dbt-job-manager"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump when the stored layout changes
+CACHE_FORMAT_VERSION = 1
+
+_ENTRY_SUFFIX = ".json.z"
+
+
+class ConfigCache:
+    """Content-addressed, size-bounded cache of parsed configurations"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(content: bytes, parser_id: str) -> str:
+        """Cache key for file content parsed by a given parser/version"""
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_FORMAT_VERSION}:{parser_id}\0".encode("utf-8"))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or unreadable entry"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, ValueError):
+            # Corrupt or truncated entry; drop it and reparse
+            self._remove(path)
+            return None
+
+        # Refresh the mtime so eviction is least-recently-used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value; cache failures never fail the caller"""
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            payload = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+            # Write atomically so concurrent pipelines never read a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Could not write config cache entry: {e}")
+            # Eviction only sees finished entries, so a leftover temp file would stay forever
+            if tmp_path:
+                self._remove(Path(tmp_path))
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for path in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
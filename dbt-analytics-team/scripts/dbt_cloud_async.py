@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+asyncio dbt Cloud REST API client
+
+Async counterpart to DBTCloudAPI for fanning out hundreds of requests from one
+process without a thread per request. Built on httpx (an optional dependency:
+`pip install "httpx[http2]"`); HTTP/2 is used when the h2 package is available.
+Every request waits on a semaphore, so callers can asyncio.gather() freely and
+at most `max_in_flight` requests are ever outstanding. Retry behaviour matches
+DBTCloudAPI: idempotent calls retry 5xx with jittered exponential backoff and
+429 responses honor Retry-After. Attempts are recorded in ApiMetrics. With an
+AIMDController the semaphore is replaced by an adaptive gate, so the limit
+moves between 1 and `max_in_flight` with the API's responses. A blocking rate
+limiter (RateLimiter or SharedRateLimiter) is consulted in a worker thread
+before each attempt.
+
+Usage:
+    async with AsyncDBTCloudAPI(account_id, token, max_in_flight=50) as api:
+        jobs = await api.list_jobs(project_id)
+        await asyncio.gather(*(api.delete_job(job['id']) for job in jobs))
+"""
+
+import asyncio
+import importlib.util
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from adaptive_concurrency import AIMDController
+from api_metrics import ApiMetrics
+from dbt_cloud_api import DEFAULT_PAGE_SIZE, RETRY_STATUS_CODES
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError(
+            "The async code path requires httpx: pip install \"httpx[http2]\""
+        ) from None
+    return httpx
+
+
+class AsyncConcurrencyGate:
+    """asyncio counterpart of adaptive_concurrency.ConcurrencyGate; create it inside the running event loop"""
+
+    def __init__(self, controller: AIMDController):
+        self.controller = controller
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self) -> "AsyncConcurrencyGate":
+        async with self.condition:
+            while self.in_flight >= self.controller.current:
+                try:
+                    await asyncio.wait_for(self.condition.wait(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+
+class AsyncDBTCloudAPI:
+    """asyncio dbt Cloud REST API client"""
+
+    def __init__(self, account_id: str, token: str, host_url: str = "https://cloud.getdbt.com",
+                 max_in_flight: int = 50, max_retries: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0, timeout: float = 30.0,
+                 page_size: int = DEFAULT_PAGE_SIZE, metrics: Optional[ApiMetrics] = None,
+                 concurrency: Optional[AIMDController] = None, rate_limiter=None):
+        self.account_id = account_id
+        self.base_url = f"{host_url}/api/v2/accounts/{account_id}"
+        self.headers = {
+            "Authorization": f"Token {token}",
+            "Content-Type": "application/json"
+        }
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.page_size = page_size
+        self.metrics = metrics or ApiMetrics()
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.http2 = importlib.util.find_spec("h2") is not None
+        self._client = None
+        self._semaphore = None
+
+    async def __aenter__(self) -> "AsyncDBTCloudAPI":
+        httpx = _import_httpx()
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            http2=self.http2,
+            limits=httpx.Limits(max_connections=self.max_in_flight,
+                                max_keepalive_connections=self.max_in_flight),
+        )
+        # Created here so it binds to the running event loop
+        if self.concurrency:
+            self._semaphore = AsyncConcurrencyGate(self.concurrency)
+        else:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    def _retry_after(self, response) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return min(self.max_backoff, max(0.0, float(value)))
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return min(self.max_backoff, max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds()))
+
+    async def _request(self, method: str, url: str, idempotent: bool = True, **kwargs):
+        """Send a request under the in-flight semaphore, retrying transient failures"""
+        httpx = _import_httpx()
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                # acquire() sleeps, so keep it off the event loop
+                await asyncio.to_thread(self.rate_limiter.acquire)
+            try:
+                async with self._semaphore:
+                    # Timed inside the semaphore so queueing is not counted as latency
+                    start = time.perf_counter()
+                    response = await self._client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.TimeoutException, httpx.RemoteProtocolError) as e:
+                self.metrics.record_request(method, url, e.__class__.__name__, time.perf_counter() - start)
+                if self.concurrency:
+                    self.concurrency.on_error(e.__class__.__name__)
+                # A non-idempotent request may have been applied before the failure
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                wait_kind, reason = "backoff", e.__class__.__name__
+                print(f"⚠️  {method} {url} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            else:
+                elapsed = time.perf_counter() - start
+                self.metrics.record_request(method, url, response.status_code, elapsed,
+                                            len(response.request.content), len(response.content))
+                if self.concurrency:
+                    self._adapt(response.status_code, elapsed, response)
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after(response) if response.status_code == 429 else None
+                wait_kind, reason = ("backoff" if delay is None else "retry_after"), response.status_code
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                print(f"⚠️  {method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+            self.metrics.record_retry(method, url, reason)
+            self.metrics.record_wait(wait_kind, delay)
+            # Sleep outside the semaphore so waiting retries do not hold a slot
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _adapt(self, status: int, elapsed: float, response) -> None:
+        """Feed one response into the concurrency controller"""
+        if status == 429:
+            self.concurrency.on_throttle(self._retry_after(response))
+        elif status >= 500:
+            self.concurrency.on_error(str(status))
+        else:
+            self.concurrency.on_success(elapsed)
+
+    async def _fetch_page(self, url: str, params: Dict[str, Any], offset: int, limit: int,
+                          label: str) -> Dict[str, Any]:
+        response = await self._request("GET", url, params={**params, "offset": offset, "limit": limit})
+        if response.status_code != 200:
+            print(f"❌ Failed to list {label}: {response.status_code} - {response.text}")
+            response.raise_for_status()
+        return response.json()
+
+    async def _list_all(self, url: str, params: Optional[Dict[str, Any]] = None,
+                        label: str = "resources") -> List[Dict[str, Any]]:
+        """Fetch every page of a list endpoint
+
+        The first page reports total_count, after which all remaining pages are
+        requested concurrently. Without a total the pages are walked in order.
+        """
+        params = dict(params or {})
+        first = await self._fetch_page(url, params, 0, self.page_size, label)
+        items = list(first.get('data') or [])
+        total_count = ((first.get('extra') or {}).get('pagination') or {}).get('total_count')
+
+        if total_count is not None:
+            # The server may cap the page size below what was requested
+            step = len(items)
+            if step == 0 or step >= total_count:
+                return items
+            offsets = range(step, total_count, step)
+            pages = await asyncio.gather(*(self._fetch_page(url, params, offset, step, label)
+                                           for offset in offsets))
+            for page in pages:
+                items.extend(page.get('data') or [])
+            return items
+
+        page = first
+        while len(page.get('data') or []) >= self.page_size:
+            page = await self._fetch_page(url, params, len(items), self.page_size, label)
+            items.extend(page.get('data') or [])
+        return items
+
+    async def get_resource(self, resource: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET every page of an account-level resource collection, as {"data": [...]}"""
+        data = await self._list_all(f"{self.base_url}/{resource}/", params, label=resource)
+        return {"data": data}
+
+    async def create_job(self, job_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new dbt Cloud job"""
+        print(f"Creating job: {job_config['name']}")
+        response = await self._request("POST", f"{self.base_url}/jobs/", idempotent=False, json=job_config)
+
+        if response.status_code == 201:
+            job_data = response.json()['data']
+            print(f"✅ Job created successfully - ID: {job_data['id']}")
+            return job_data
+        print(f"❌ Failed to create job: {response.status_code} - {response.text}")
+        response.raise_for_status()
+
+    async def update_job(self, job_id: int, job_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Update an existing dbt Cloud job"""
+        print(f"Updating job: {job_config['name']} (ID: {job_id})")
+        response = await self._request("POST", f"{self.base_url}/jobs/{job_id}/", json=job_config)
+
+        if response.status_code == 200:
+            job_data = response.json()['data']
+            print(f"✅ Job updated successfully - ID: {job_data['id']}")
+            return job_data
+        print(f"❌ Failed to update job: {response.status_code} - {response.text}")
+        response.raise_for_status()
+
+    async def delete_job(self, job_id: int) -> bool:
+        """Delete a dbt Cloud job"""
+        print(f"Deleting job ID: {job_id}")
+        response = await self._request("DELETE", f"{self.base_url}/jobs/{job_id}/")
+
+        if response.status_code == 204:
+            print(f"✅ Job deleted successfully - ID: {job_id}")
+            return True
+        print(f"❌ Failed to delete job: {response.status_code} - {response.text}")
+        return False
+
+    async def list_jobs(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List all jobs, optionally filtered by project"""
+        params = {"project_id": project_id} if project_id else None
+        return await self._list_all(f"{self.base_url}/jobs/", params, label="jobs")
+
+    async def iter_jobs(self, project_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield jobs page by page so callers can stop early"""
+        url = f"{self.base_url}/jobs/"
+        params = {"project_id": project_id} if project_id else {}
+        offset = 0
+        while True:
+            body = await self._fetch_page(url, params, offset, self.page_size, "jobs")
+            page = body.get('data') or []
+            for job in page:
+                yield job
+            offset += len(page)
+            total_count = ((body.get('extra') or {}).get('pagination') or {}).get('total_count')
+            if not page or (total_count is not None and offset >= total_count) or \
+                    (total_count is None and len(page) < self.page_size):
+                return
@@ -8,102 +8,50 @@ Reads job configurations directly from Terraform .tfvars files.
 
 Usage:
     python dbt_job_manager.py deploy --config env_file/dev_env.tfvars
+    python dbt_job_manager.py deploy --config env_file/dev_env.tfvars --concurrency 8
+    python dbt_job_manager.py deploy --config env_file/dev_env.tfvars --async --concurrency 100
+    python dbt_job_manager.py sync --config env_file/dev_env.tfvars
+    python dbt_job_manager.py plan --config env_file/dev_env.tfvars --out dbt-job-plan.json
+    python dbt_job_manager.py apply --plan dbt-job-plan.json --concurrency 16
     python dbt_job_manager.py cleanup --older-than 7
+    python dbt_job_manager.py cleanup --older-than 7 --concurrency 8 --rate-limit 5 --resume
+    python dbt_job_manager.py cleanup --older-than 7 --concurrency 32 --adaptive
     python dbt_job_manager.py list --team analytics-team
 """
 
 import os
 import sys
 import json
-import yaml
-import requests
+import hashlib
+import time
 import argparse
-import re
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Any
 
-class DBTCloudAPI:
-    """dbt Cloud REST API client"""
-    
-    def __init__(self, account_id: str, token: str, host_url: str = "https://cloud.getdbt.com"):
-        self.account_id = account_id
-        self.token = token
-        self.base_url = f"{host_url}/api/v2/accounts/{account_id}"
-        self.headers = {
-            "Authorization": f"Token {token}",
-            "Content-Type": "application/json"
-        }
-    
-    def create_job(self, job_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new dbt Cloud job"""
-        url = f"{self.base_url}/jobs/"
-        
-        print(f"Creating job: {job_config['name']}")
-        response = requests.post(url, headers=self.headers, json=job_config)
-        
-        if response.status_code == 201:
-            job_data = response.json()['data']
-            print(f"✅ Job created successfully - ID: {job_data['id']}")
-            return job_data
-        else:
-            print(f"❌ Failed to create job: {response.status_code} - {response.text}")
-            response.raise_for_status()
-    
-    def update_job(self, job_id: int, job_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Update an existing dbt Cloud job"""
-        url = f"{self.base_url}/jobs/{job_id}/"
-        
-        print(f"Updating job: {job_config['name']} (ID: {job_id})")
-        response = requests.post(url, headers=self.headers, json=job_config)
-        
-        if response.status_code == 200:
-            job_data = response.json()['data']
-            print(f"✅ Job updated successfully - ID: {job_data['id']}")
-            return job_data
-        else:
-            print(f"❌ Failed to update job: {response.status_code} - {response.text}")
-            response.raise_for_status()
-    
-    def delete_job(self, job_id: int) -> bool:
-        """Delete a dbt Cloud job"""
-        url = f"{self.base_url}/jobs/{job_id}/"
-        
-        print(f"Deleting job ID: {job_id}")
-        response = requests.delete(url, headers=self.headers)
-        
-        if response.status_code == 204:
-            print(f"✅ Job deleted successfully - ID: {job_id}")
-            return True
-        else:
-            print(f"❌ Failed to delete job: {response.status_code} - {response.text}")
-            return False
-    
-    def list_jobs(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """List all jobs, optionally filtered by project"""
-        url = f"{self.base_url}/jobs/"
-        if project_id:
-            url += f"?project_id={project_id}"
-        
-        response = requests.get(url, headers=self.headers)
-        
-        if response.status_code == 200:
-            return response.json()['data']
-        else:
-            print(f"❌ Failed to list jobs: {response.status_code} - {response.text}")
-            response.raise_for_status()
-    
-    def get_job_by_name(self, job_name: str, project_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
-        """Find a job by name"""
-        jobs = self.list_jobs(project_id)
-        for job in jobs:
-            if job['name'] == job_name:
-                return job
-        return None
+from adaptive_concurrency import AIMDController
+from api_metrics import ApiMetrics
+from config_cache import ConfigCache, DEFAULT_CACHE_DIR
+from dbt_cloud_api import DBTCloudAPI, RateLimiter, SharedRateLimiter
+from job_records import PRODUCTION_BRANCHES, JobRecord, OwnershipIndex
+from tfvars_parser import PARSER_VERSION, parse_tfvars
+
+# asyncio, httpx, requests, yaml and concurrent.futures are imported where they are
+# used, so a --dry-run of a .tfvars file in the validate stage loads none of them
+if TYPE_CHECKING:
+    from dbt_cloud_async import AsyncDBTCloudAPI
+
+# Bump when the plan file layout changes
+PLAN_FORMAT_VERSION = 1
+
+# Job fields that define what a job does; tags are excluded because they carry
+# the per-deploy timestamp and commit
+FINGERPRINT_FIELDS = ('execute_steps', 'settings', 'schedule', 'triggers', 'environment_id', 'description')
 
 class JobManager:
     """Manages dbt Cloud jobs for branch deployments"""
     
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None, adaptive: bool = False):
         # Get configuration from environment variables
         self.account_id = os.getenv('DBTCLOUD_ACCOUNT_ID')
         self.token = os.getenv('DBTCLOUD_TOKEN') 
@@ -116,6 +64,7 @@ class JobManager:
         self.branch_name = os.getenv('CI_COMMIT_REF_SLUG', 'local')
         self.gitlab_user = os.getenv('GITLAB_USER_LOGIN', 'unknown')
         self.commit_sha = os.getenv('CI_COMMIT_SHA', 'unknown')
+        self.pipeline_id = os.getenv('CI_PIPELINE_ID')
         
         # Validate required environment variables
         required_vars = ['DBTCLOUD_ACCOUNT_ID', 'DBTCLOUD_TOKEN', 'PROJECT_ID', 'ENVIRONMENT_ID']
@@ -123,17 +72,70 @@ class JobManager:
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {missing_vars}")
         
-        self.api = DBTCloudAPI(self.account_id, self.token, self.host_url)
+        # HTTP client tuning; the pool must be at least as large as the worker count
+        default_pool_size = int(os.getenv('DBTCLOUD_POOL_SIZE', '10'))
+        max_concurrency = pool_size or default_pool_size
+        pool_size = max(default_pool_size, pool_size or 0)
+        max_retries = int(os.getenv('DBTCLOUD_MAX_RETRIES', '3'))
+        page_size = int(os.getenv('DBTCLOUD_PAGE_SIZE', '100'))
+        
+        # Shared by every client so a command reports one set of request metrics
+        self.metrics = ApiMetrics()
+        
+        # With adaptive concurrency --concurrency is the ceiling; the controller finds the level the API tolerates.
+        # The connection pool may be larger (DBTCLOUD_POOL_SIZE); the number of requests in flight may not.
+        self.concurrency = None
+        if adaptive:
+            self.concurrency = AIMDController(
+                initial=min(max_concurrency, int(os.getenv('DBTCLOUD_ADAPTIVE_INITIAL', '4'))),
+                maximum=max_concurrency,
+                latency_tolerance=float(os.getenv('DBTCLOUD_ADAPTIVE_LATENCY_TOLERANCE', '2.0')),
+                metrics=self.metrics,
+            )
+        
+        # Request budget shared with every other pipeline using the same file on the runner volume
+        self.shared_limiter = None
+        shared_rate = float(os.getenv('DBTCLOUD_SHARED_RATE_LIMIT', '0'))
+        shared_path = os.getenv('DBTCLOUD_SHARED_RATE_LIMIT_PATH')
+        if shared_rate > 0 and shared_path:
+            import sqlite3
+            try:
+                self.shared_limiter = SharedRateLimiter(
+                    shared_path, shared_rate,
+                    burst=int(os.getenv('DBTCLOUD_SHARED_RATE_BURST', '0')) or None,
+                    key=f"account-{self.account_id}", metrics=self.metrics,
+                )
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️  Shared rate limiter disabled, cannot open {shared_path}: {e}")
+        
+        self.api = DBTCloudAPI(self.account_id, self.token, self.host_url,
+                               pool_size=pool_size, max_retries=max_retries, page_size=page_size,
+                               metrics=self.metrics, concurrency=self.concurrency,
+                               rate_limiter=self.shared_limiter)
+        
+        # Parsed-config cache shared across CI stages; an empty dir disables it
+        cache_dir = os.getenv('DBT_JOB_MANAGER_CACHE_DIR', DEFAULT_CACHE_DIR)
+        cache_max_mb = int(os.getenv('DBT_JOB_MANAGER_CACHE_MAX_MB', '64'))
+        self.config_cache = ConfigCache(cache_dir, cache_max_mb * 1024 * 1024) if cache_dir else None
+        
+        # Journal of in-flight cleanups, kept next to the cache so a retried CI job can carry on
+        self.cleanup_journal = os.path.join(
+            cache_dir or DEFAULT_CACHE_DIR, f"cleanup-{self.team_name}-{self.project_id}.jsonl"
+        )
         
         print(f"🚀 Job Manager initialized for team: {self.team_name}")
         print(f"   Branch: {self.branch_name}")
         print(f"   User: {self.gitlab_user}")
         print(f"   Environment ID: {self.environment_id}")
+        if self.concurrency:
+            print(f"   Adaptive concurrency: {self.concurrency.current} to start, up to {max_concurrency}")
+        if self.shared_limiter:
+            print(f"   Shared rate limit: {shared_rate:g} requests/s across pipelines ({shared_path})")
     
     def generate_job_name(self, job_base_name: str) -> str:
         """Generate unique job name for branch deployment"""
         # For master/production branches, use simple naming
-        if self.branch_name in ['main', 'master', 'production']:
+        if self.branch_name in PRODUCTION_BRANCHES:
             return f"{self.team_name}-{job_base_name}"
         
         # For feature branches, include branch and user for uniqueness
@@ -202,128 +204,100 @@ class JobManager:
         
         return None
     
-    def parse_tfvars_file(self, tfvars_file: str) -> Dict[str, Any]:
-        """Parse a .tfvars file and extract job configurations"""
-        print(f"\n📋 Loading job configurations from: {tfvars_file}")
-        
-        with open(tfvars_file, 'r') as f:
+    def load_jobs_config(self, jobs_config_file: str) -> Dict[str, Any]:
+        """Load a jobs configuration file (.tfvars, .yaml, .json), reusing a cached parse if unchanged"""
+        with open(jobs_config_file, 'rb') as f:
             content = f.read()
         
-        # Parse jobs array from tfvars content
-        config = {"jobs": []}
-        
-        # Find the jobs array using bracket matching
-        jobs_start = content.find('jobs = [')
-        if jobs_start == -1:
-            raise ValueError(f"No 'jobs = [' found in {tfvars_file}")
-        
-        # Find the matching closing bracket
-        bracket_count = 0
-        jobs_end = -1
-        start_pos = jobs_start + len('jobs = [')
-        
-        for i, char in enumerate(content[start_pos:], start_pos):
-            if char == '[':
-                bracket_count += 1
-            elif char == ']':
-                if bracket_count == 0:
-                    jobs_end = i
-                    break
-                bracket_count -= 1
+        if jobs_config_file.endswith('.tfvars'):
+            parser_id = f"tfvars-{PARSER_VERSION}"
+        elif jobs_config_file.endswith('.yaml') or jobs_config_file.endswith('.yml'):
+            parser_id = "yaml"
+        else:
+            parser_id = "json"
+        
+        cache_key = ConfigCache.key(content, parser_id) if self.config_cache else None
+        if cache_key:
+            config = self.config_cache.get(cache_key)
+            if config is not None:
+                print(f"\n📋 Loaded {len(config.get('jobs', []))} job configurations from cache for: {jobs_config_file}")
+                return config
         
-        if jobs_end == -1:
-            raise ValueError(f"No matching ']' found for jobs array in {tfvars_file}")
+        text = content.decode('utf-8')
+        if parser_id.startswith("tfvars"):
+            config = self.parse_tfvars_file(jobs_config_file, text)
+        elif parser_id == "yaml":
+            # Keep existing YAML/JSON support for backwards compatibility
+            import yaml
+            config = yaml.safe_load(text)
+        else:
+            config = json.loads(text)
         
-        jobs_content = content[start_pos:jobs_end]
+        if cache_key:
+            self.config_cache.put(cache_key, config)
+        return config
+    
+    def parse_tfvars_file(self, tfvars_file: str, content: Optional[str] = None) -> Dict[str, Any]:
+        """Parse a .tfvars file and extract job configurations"""
+        print(f"\n📋 Loading job configurations from: {tfvars_file}")
         
-        # Split individual job objects using brace matching
-        job_objects = []
-        brace_count = 0
-        current_job = ""
-        in_job = False
+        if content is None:
+            with open(tfvars_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        variables = parse_tfvars(content, source=tfvars_file)
+        if 'jobs' not in variables:
+            raise ValueError(f"No 'jobs' variable found in {tfvars_file}")
         
-        for char in jobs_content:
-            if char == '{':
-                if brace_count == 0:
-                    in_job = True
-                    current_job = ""
-                else:
-                    current_job += char
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0 and in_job:
-                    job_objects.append(current_job)
-                    in_job = False
-                    current_job = ""
-                else:
-                    current_job += char
-            elif in_job:
-                current_job += char
+        jobs = variables['jobs']
+        if not isinstance(jobs, list):
+            raise ValueError(f"'jobs' in {tfvars_file} must be a list of objects")
         
-        for job_obj in job_objects:
-            job = {}
-            
-            # Parse each field in the job object
-            for line in job_obj.split('\n'):
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Match field = value patterns
-                match = re.match(r'(\w+)\s*=\s*(.+)', line)
-                if match:
-                    field, value = match.groups()
-                    
-                    # Remove trailing comma
-                    value = value.rstrip(',').strip()
-                    
-                    # Parse different value types
-                    if value.startswith('"') and value.endswith('"'):
-                        # String value
-                        job[field] = value[1:-1]
-                    elif value.startswith('[') and value.endswith(']'):
-                        # Array value
-                        array_content = value[1:-1]
-                        if array_content.strip():
-                            # Handle string arrays
-                            if '"' in array_content:
-                                items = re.findall(r'"([^"]*)"', array_content)
-                            else:
-                                # Handle number arrays
-                                items = [int(x.strip()) for x in array_content.split(',') if x.strip()]
-                        else:
-                            items = []
-                        job[field] = items
-                    else:
-                        # Try to parse as number
-                        try:
-                            job[field] = int(value)
-                        except ValueError:
-                            # Fall back to string (remove quotes if present)
-                            job[field] = value.strip('"')
-            
-            if job:  # Only add non-empty job objects
-                config["jobs"].append(job)
+        # Only keep non-empty job objects
+        config = {"jobs": [job for job in jobs if isinstance(job, dict) and job]}
         
         print(f"🎯 Found {len(config['jobs'])} job configurations")
         return config
 
-    def deploy_jobs(self, jobs_config_file: str, dry_run: bool = False) -> List[Dict[str, Any]]:
+    def build_job_index(self, jobs: List[Dict[str, Any]],
+                        owners: Optional[OwnershipIndex] = None) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        """Index this deploy's own jobs by name and by ID for constant-time lookups
+        
+        Only the jobs the ownership index files under this team and branch/user
+        (the team's production jobs on a production branch) are indexed, so a
+        deploy never updates a job that belongs to another team or branch.
+        """
+        owners = owners or self.build_ownership_index(jobs)
+        job_index = {"by_name": {}, "by_id": {}}
+        for row in self.own_job_rows(owners):
+            job = jobs[row]
+            # Keep the first job for a duplicated name, matching get_job_by_name
+            job_index['by_name'].setdefault(job['name'], job)
+            job_index['by_id'][job['id']] = job
+        return job_index
+    
+    def _index_job(self, job_index: Dict[str, Dict[Any, Dict[str, Any]]], job: Dict[str, Any]) -> None:
+        """Add or replace a created/updated job in the index"""
+        job_index['by_name'][job['name']] = job
+        job_index['by_id'][job['id']] = job
+    
+    def build_ownership_index(self, jobs: Iterable[Dict[str, Any]]) -> OwnershipIndex:
+        """Group jobs by owning team/branch/user in one pass over a listing"""
+        return OwnershipIndex.from_jobs(jobs, self.team_name, self.branch_name, self.gitlab_user)
+    
+    def own_job_rows(self, owners: OwnershipIndex) -> List[int]:
+        """Rows of the jobs this team and branch/user deploys"""
+        if self.branch_name in PRODUCTION_BRANCHES:
+            return owners.production_rows(self.team_name)
+        return owners.branch_rows(self.team_name, self.branch_name, self.gitlab_user)
+
+    def deploy_jobs(self, jobs_config_file: str, dry_run: bool = False, concurrency: int = 1,
+                    use_async: bool = False) -> List[Dict[str, Any]]:
         """Deploy jobs from configuration file (supports .tfvars, .yaml, .json)"""
         
-        if jobs_config_file.endswith('.tfvars'):
-            config = self.parse_tfvars_file(jobs_config_file)
-        else:
-            # Keep existing YAML/JSON support for backwards compatibility
-            with open(jobs_config_file, 'r') as f:
-                if jobs_config_file.endswith('.yaml') or jobs_config_file.endswith('.yml'):
-                    config = yaml.safe_load(f)
-                else:
-                    config = json.load(f)
+        with self.metrics.phase('parse'):
+            config = self.load_jobs_config(jobs_config_file)
         
         jobs_spec = config.get('jobs', [])
-        deployed_jobs = []
         
         if dry_run:
             print(f"🔍 [DRY RUN] Would deploy {len(jobs_spec)} jobs to environment {self.environment_id}")
@@ -337,138 +311,711 @@ class JobManager:
             print(f"🔍 [DRY RUN] Configuration validation complete")
             return []
         
-        print(f"🎯 Deploying {len(jobs_spec)} jobs to environment {self.environment_id}")
+        concurrency = max(1, concurrency)
+        mode = "async" if use_async else "threads"
+        print(f"🎯 Deploying {len(jobs_spec)} jobs to environment {self.environment_id} "
+              f"(concurrency: {concurrency}, {mode})")
         
-        for job_spec in jobs_spec:
-            try:
-                job_config = self.prepare_job_config(job_spec)
-                job_name = job_config['name']
-                
-                # Check if job already exists
-                existing_job = self.api.get_job_by_name(job_name, self.project_id)
-                
-                if existing_job:
-                    # Update existing job
-                    job_data = self.api.update_job(existing_job['id'], job_config)
-                else:
-                    # Create new job
-                    job_data = self.api.create_job(job_config)
-                
-                deployed_jobs.append(job_data)
-                
-            except Exception as e:
-                print(f"❌ Failed to deploy job {job_spec['name']}: {str(e)}")
-                continue
+        # Prepare every config up front; an invalid spec fails without touching the API
+        with self.metrics.phase('prepare'):
+            spec_groups = {}
+            for position, job_spec in enumerate(jobs_spec):
+                try:
+                    job_config = self.prepare_job_config(job_spec)
+                except Exception as e:
+                    print(f"❌ Invalid job configuration for {job_spec.get('name', 'unknown')}: {str(e)}")
+                    continue
+                # Configs sharing a name are deployed in order by a single worker, so a
+                # repeated spec updates the job created by the first instead of racing it
+                spec_groups.setdefault(job_config['name'], []).append((position, job_config))
+        
+        if use_async:
+            import asyncio
+            results = asyncio.run(self._deploy_jobs_async(spec_groups, len(jobs_spec), concurrency))
+        else:
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            
+            # Fetch the project's jobs once and resolve every config against the index
+            with self.metrics.phase('list'):
+                job_index = self.build_job_index(list(self.api.iter_jobs(self.project_id, prefetch=True)))
+            index_lock = threading.Lock()
+            
+            results = [None] * len(jobs_spec)
+            with self.metrics.phase('write'), ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [
+                    executor.submit(self._deploy_job_group, group, job_index, index_lock)
+                    for group in spec_groups.values()
+                ]
+                for future in as_completed(futures):
+                    for position, result in future.result():
+                        results[position] = result
         
-        print(f"\n✅ Successfully deployed {len(deployed_jobs)} jobs")
+        # Report in config order regardless of completion order
+        deployed_jobs = [job_data for action, job_data in filter(None, results)]
+        action_counts = {'created': 0, 'updated': 0, 'unchanged': 0}
+        for action, job_data in filter(None, results):
+            action_counts[action] += 1
+        failed_count = len(jobs_spec) - len(deployed_jobs)
+        
+        print(f"\n✅ Successfully deployed {len(deployed_jobs)} jobs "
+              f"({action_counts['created']} created, {action_counts['updated']} updated, "
+              f"{action_counts['unchanged']} unchanged)")
+        if failed_count:
+            print(f"❌ Failed to deploy {failed_count} jobs")
         return deployed_jobs
     
-    def cleanup_old_jobs(self, days_old: int = 7, dry_run: bool = False) -> List[int]:
-        """Clean up branch jobs older than specified days"""
-        print(f"\n🧹 Cleaning up branch jobs older than {days_old} days")
+    def _deploy_job_group(self, group: List[Any], job_index: Dict[str, Dict[Any, Dict[str, Any]]],
+                          index_lock: threading.Lock) -> List[Any]:
+        """Deploy a group of same-named job configs in order, returning (position, (action, job_data)) pairs"""
+        results = []
+        for position, job_config in group:
+            try:
+                result = self._deploy_job(job_config, job_index, index_lock)
+            except Exception as e:
+                print(f"❌ Failed to deploy job {job_config['name']}: {str(e)}")
+                result = None
+            results.append((position, result))
+        return results
+    
+    def _deploy_job(self, job_config: Dict[str, Any], job_index: Dict[str, Dict[Any, Dict[str, Any]]],
+                    index_lock: threading.Lock) -> Any:
+        """Create or update a single job against the shared job index, returning (action, job_data)"""
+        job_name = job_config['name']
         
-        all_jobs = self.api.list_jobs(self.project_id)
-        cutoff_date = datetime.utcnow() - timedelta(days=days_old)
+        # Check if job already exists
+        with index_lock:
+            existing_job = job_index['by_name'].get(job_name)
+        
+        if existing_job:
+            if self._is_unchanged(job_config, existing_job):
+                return 'unchanged', existing_job
+            
+            # Update existing job
+            job_data = self.api.update_job(existing_job['id'], job_config)
+            action = 'updated'
+        else:
+            # Create new job
+            job_data = self.api.create_job(job_config)
+            action = 'created'
         
-        jobs_to_delete = []
+        # Keep the index current so later specs see this job
+        with index_lock:
+            self._index_job(job_index, job_data)
+        return action, job_data
+    
+    async def _deploy_jobs_async(self, spec_groups: Dict[Any, List[Any]], job_count: int,
+                                 concurrency: int) -> List[Any]:
+        """Async counterpart of the thread pool deploy, with at most `concurrency` requests in flight"""
+        import asyncio
         
-        for job in all_jobs:
-            job_name = job['name']
+        results = [None] * job_count
+        async with self._async_api(concurrency) as api:
+            with self.metrics.phase('list'):
+                job_index = self.build_job_index(await api.list_jobs(self.project_id))
             
-            # Only clean up branch jobs (contain branch and user in name)
-            if not self._is_branch_job(job_name):
-                continue
+            async def deploy_group(group: List[Any]) -> None:
+                for position, job_config in group:
+                    try:
+                        results[position] = await self._deploy_job_async(api, job_config, job_index)
+                    except Exception as e:
+                        print(f"❌ Failed to deploy job {job_config['name']}: {str(e)}")
             
-            # Check if job is old enough
-            job_created = datetime.fromisoformat(job['created_at'].replace('Z', '+00:00'))
-            if job_created.replace(tzinfo=None) > cutoff_date:
+            with self.metrics.phase('write'):
+                await asyncio.gather(*(deploy_group(group) for group in spec_groups.values()))
+        return results
+    
+    async def _deploy_job_async(self, api: "AsyncDBTCloudAPI", job_config: Dict[str, Any],
+                                job_index: Dict[str, Dict[Any, Dict[str, Any]]]) -> Any:
+        """Create or update a single job on the event loop, returning (action, job_data)"""
+        existing_job = job_index['by_name'].get(job_config['name'])
+        
+        if existing_job:
+            if self._is_unchanged(job_config, existing_job):
+                return 'unchanged', existing_job
+            job_data = await api.update_job(existing_job['id'], job_config)
+            action = 'updated'
+        else:
+            job_data = await api.create_job(job_config)
+            action = 'created'
+        
+        # Single-threaded event loop, so the index needs no lock
+        self._index_job(job_index, job_data)
+        return action, job_data
+    
+    def report_metrics(self, command: str, json_path: Optional[str] = None,
+                       prometheus_path: Optional[str] = None) -> None:
+        """Print the phase breakdown and API totals, and export them if asked"""
+        lines = self.metrics.summary_lines()
+        if lines:
+            print(f"\n📊 {command} metrics:")
+            for line in lines:
+                print(line)
+        
+        # Branch and user are left out to keep Prometheus label cardinality low
+        labels = {"team": self.team_name, "command": command, "project_id": self.project_id}
+        for path, write in ((json_path, self.metrics.write_json), (prometheus_path, self.metrics.write_prometheus)):
+            if not path:
+                continue
+            try:
+                write(path, labels)
+                print(f"💾 Wrote metrics to {path}")
+            except OSError as e:
+                print(f"⚠️  Could not write metrics to {path}: {e}")
+    
+    def _async_api(self, max_in_flight: int) -> "AsyncDBTCloudAPI":
+        """Async client configured like the blocking one"""
+        from dbt_cloud_async import AsyncDBTCloudAPI
+        
+        return AsyncDBTCloudAPI(self.account_id, self.token, self.host_url,
+                                max_in_flight=max_in_flight, max_retries=self.api.max_retries,
+                                page_size=self.api.page_size, metrics=self.metrics,
+                                concurrency=self.concurrency, rate_limiter=self.shared_limiter)
+    
+    def _is_unchanged(self, job_config: Dict[str, Any], existing_job: Dict[str, Any]) -> bool:
+        """Skip the write when nothing that matters has changed"""
+        if self.job_fingerprint(existing_job, job_config) == self.job_fingerprint(job_config):
+            print(f"⏭️  Job unchanged: {job_config['name']} (ID: {existing_job['id']})")
+            return True
+        return False
+    
+    def job_fingerprint(self, job: Dict[str, Any], shape: Optional[Dict[str, Any]] = None) -> str:
+        """Stable hash of a job's semantic fields
+        
+        Live jobs carry extra server-side keys, so the job is projected onto
+        the keys present in ``shape`` (the desired config) before hashing.
+        """
+        shape = job if shape is None else shape
+        semantic = {
+            field: self._schedule_cron(job.get(field)) if field == 'schedule'
+            else self._project(job.get(field), shape.get(field))
+            for field in FINGERPRINT_FIELDS
+            if field in shape
+        }
+        canonical = json.dumps(semantic, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def _project(self, value: Any, shape: Any) -> Any:
+        """Keep only the nested dict keys that appear in shape"""
+        if isinstance(value, dict) and isinstance(shape, dict):
+            return {key: self._project(value.get(key), shape[key]) for key in shape}
+        return value
+    
+    def _schedule_cron(self, schedule: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Canonical cron string of a schedule, in either the config or the API shape
+        
+        The config says {"days": [...], "hours": [...]} or {"cron": ...}, while
+        dbt Cloud returns {"cron", "date", "time"}, so both are reduced to one
+        cron string: numeric lists sorted, Sunday as 0, and a list of every
+        value as "*".
+        """
+        if not schedule:
+            return None
+        cron = schedule.get('cron')
+        if not cron:
+            date = schedule.get('date') or {}
+            hours = schedule.get('hours') or (schedule.get('time') or {}).get('hours')
+            days = schedule.get('days') or date.get('days')
+            if not hours:
+                # Intervals and other shapes without a cron equivalent compare as-is
+                return json.dumps(schedule, sort_keys=True, default=str)
+            days_field = ','.join(map(str, days)) if days and date.get('type') != 'every_day' else '*'
+            cron = f"0 {','.join(map(str, hours))} * * {days_field}"
+        
+        fields = cron.split()
+        if len(fields) != 5:
+            return cron.strip()
+        
+        def normalize(field: str, values: range, sunday: bool = False) -> str:
+            parts = field.split(',')
+            if not all(part.isdigit() for part in parts):
+                return field
+            numbers = sorted({0 if sunday and int(part) == 7 else int(part) for part in parts})
+            return '*' if numbers == list(values) else ','.join(map(str, numbers))
+        
+        fields[1] = normalize(fields[1], range(24))
+        fields[4] = normalize(fields[4], range(7), sunday=True)
+        return ' '.join(fields)
+    
+    def plan_changes(self, jobs_config_file: str) -> Dict[str, Any]:
+        """Build a change set from the config and a single listing of live jobs
+        
+        Each desired job is a create, update or no-op, matched by name among
+        the jobs this team and branch/user own. Updates carry a field-level
+        diff. This branch/user's live jobs that are no longer in the config
+        become deletes. Production branches never plan
+        deletes, because their jobs are managed by Terraform.
+        """
+        with self.metrics.phase('parse'):
+            config = self.load_jobs_config(jobs_config_file)
+        jobs_spec = config.get('jobs', [])
+        
+        # The last spec wins when several share a name, as in a sequential deploy
+        desired = {}
+        with self.metrics.phase('prepare'):
+            for job_spec in jobs_spec:
+                job_config = self.prepare_job_config(job_spec)
+                if job_config['name'] in desired:
+                    print(f"⚠️  Duplicate job name {job_config['name']}; using the last definition")
+                desired[job_config['name']] = job_config
+        
+        print(f"\n🔍 Fetching live jobs for project {self.project_id}")
+        with self.metrics.phase('list'):
+            live_jobs = list(self.api.iter_jobs(self.project_id, prefetch=True))
+            owners = self.build_ownership_index(live_jobs)
+            job_index = self.build_job_index(live_jobs, owners)
+        
+        with self.metrics.phase('diff'):
+            changes = self._diff_changes(desired, job_index, owners)
+        
+        return {
+            "version": PLAN_FORMAT_VERSION,
+            "created_at": datetime.utcnow().isoformat(),
+            "config_file": jobs_config_file,
+            "account_id": self.account_id,
+            "project_id": self.project_id,
+            "environment_id": self.environment_id,
+            "team": self.team_name,
+            "branch": self.branch_name,
+            "user": self.gitlab_user,
+            "changes": changes,
+        }
+    
+    def _diff_changes(self, desired: Dict[str, Dict[str, Any]], job_index: Dict[str, Dict[Any, Dict[str, Any]]],
+                      owners: OwnershipIndex) -> List[Dict[str, Any]]:
+        """Create/update/no-op/delete changes that turn the live jobs into the desired ones"""
+        changes = []
+        for job_name, job_config in desired.items():
+            existing_job = job_index['by_name'].get(job_name)
+            if not existing_job:
+                changes.append({"action": "create", "name": job_name, "config": job_config})
                 continue
             
-            jobs_to_delete.append(job)
+            diff = self.diff_job(existing_job, job_config)
+            if diff:
+                changes.append({"action": "update", "name": job_name, "job_id": existing_job['id'],
+                                "config": job_config, "diff": diff})
+            else:
+                changes.append({"action": "no-op", "name": job_name, "job_id": existing_job['id']})
         
-        print(f"🎯 Found {len(jobs_to_delete)} jobs to clean up")
+        # Jobs on production branches are indexed as production jobs, so none are deleted
+        own_rows = owners.branch_rows(self.team_name, self.branch_name, self.gitlab_user)
+        for job in owners.table.records(own_rows):
+            if job.name not in desired:
+                changes.append({"action": "delete", "name": job.name, "job_id": job.id})
+        return changes
+    
+    def diff_job(self, existing_job: Dict[str, Any], job_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Field-level diff of the semantic fields, as {"field.path": {"old": ..., "new": ...}}"""
+        diff = {}
         
-        deleted_job_ids = []
+        def walk(path: str, old: Any, new: Any) -> None:
+            if isinstance(old, dict) and isinstance(new, dict):
+                for key in new:
+                    walk(f"{path}.{key}", old.get(key), new[key])
+            elif old != new:
+                diff[path] = {"old": old, "new": new}
+        
+        for field in FINGERPRINT_FIELDS:
+            if field == 'schedule' and field in job_config:
+                # Compared as cron strings, like the fingerprint
+                walk(field, self._schedule_cron(existing_job.get(field)), self._schedule_cron(job_config[field]))
+            elif field in job_config:
+                walk(field, existing_job.get(field), job_config[field])
+        return diff
+    
+    def print_plan(self, plan: Dict[str, Any]) -> None:
+        """Print a terraform-style summary of a change set"""
+        symbols = {"create": "+", "update": "~", "delete": "-", "no-op": " "}
+        print(f"\n📋 Plan for {plan['team']} (branch: {plan['branch']}, user: {plan['user']})")
+        for change in plan['changes']:
+            job_id = f" (ID: {change['job_id']})" if change.get('job_id') else ""
+            print(f"  {symbols[change['action']]} {change['name']}{job_id}")
+            for field, values in change.get('diff', {}).items():
+                print(f"      {field}: {json.dumps(values['old'])} -> {json.dumps(values['new'])}")
         
-        for job in jobs_to_delete:
-            if dry_run:
-                print(f"[DRY RUN] Would delete: {job['name']} (ID: {job['id']}, Created: {job['created_at']})")
+        counts = {action: 0 for action in symbols}
+        for change in plan['changes']:
+            counts[change['action']] += 1
+        print(f"\nPlan: {counts['create']} to create, {counts['update']} to update, "
+              f"{counts['delete']} to delete, {counts['no-op']} unchanged")
+    
+    def write_plan(self, jobs_config_file: str, plan_file: str) -> Dict[str, Any]:
+        """Plan changes for a config file and save the change set for a later apply"""
+        plan = self.plan_changes(jobs_config_file)
+        self.print_plan(plan)
+        
+        with open(plan_file, 'w') as f:
+            json.dump(plan, f, indent=2)
+        print(f"💾 Saved plan to {plan_file}")
+        return plan
+    
+    def apply_plan(self, plan_file: str, concurrency: int = 1, use_async: bool = False) -> Dict[str, int]:
+        """Execute a saved change set without re-listing the project"""
+        with open(plan_file, 'r') as f:
+            plan = json.load(f)
+        
+        if plan.get('version') != PLAN_FORMAT_VERSION:
+            raise ValueError(f"Unsupported plan format version {plan.get('version')} in {plan_file}")
+        if str(plan['account_id']) != str(self.account_id) or int(plan['project_id']) != self.project_id:
+            raise ValueError(f"{plan_file} was planned for account {plan['account_id']} / project "
+                             f"{plan['project_id']}, not {self.account_id} / {self.project_id}")
+        
+        changes = [change for change in plan['changes'] if change['action'] != 'no-op']
+        print(f"\n🚀 Applying {len(changes)} changes from {plan_file} (planned {plan['created_at']}, "
+              f"concurrency: {max(1, concurrency)})")
+        return self._execute_changes(changes, concurrency, use_async)
+    
+    def sync_jobs(self, jobs_config_file: str, dry_run: bool = False, concurrency: int = 1,
+                  use_async: bool = False) -> Dict[str, int]:
+        """Make this branch's live jobs match the config in one pass
+        
+        Like deploy, but jobs this branch/user deployed earlier that are no longer
+        in the config are deleted straight away instead of waiting for the
+        age-based cleanup.
+        """
+        plan = self.plan_changes(jobs_config_file)
+        self.print_plan(plan)
+        
+        if dry_run:
+            print("\n🔍 DRY RUN - No changes made")
+            return {"create": 0, "update": 0, "delete": 0, "failed": 0}
+        
+        changes = [change for change in plan['changes'] if change['action'] != 'no-op']
+        if not changes:
+            print("\n✅ Jobs already in sync")
+            return {"create": 0, "update": 0, "delete": 0, "failed": 0}
+        
+        print(f"\n🔄 Syncing {len(changes)} changes (concurrency: {max(1, concurrency)})")
+        return self._execute_changes(changes, concurrency, use_async)
+    
+    def _execute_changes(self, changes: List[Dict[str, Any]], concurrency: int,
+                         use_async: bool) -> Dict[str, int]:
+        concurrency = max(1, concurrency)
+        with self.metrics.phase('write'):
+            if use_async:
+                import asyncio
+                outcomes = asyncio.run(self._apply_changes_async(changes, concurrency))
             else:
-                if self.api.delete_job(job['id']):
-                    deleted_job_ids.append(job['id'])
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    outcomes = list(executor.map(self._apply_change, changes))
+        
+        counts = {"create": 0, "update": 0, "delete": 0, "failed": 0}
+        for change, succeeded in zip(changes, outcomes):
+            counts[change['action'] if succeeded else 'failed'] += 1
+        
+        print(f"\n✅ Applied: {counts['create']} created, {counts['update']} updated, "
+              f"{counts['delete']} deleted")
+        if counts['failed']:
+            print(f"❌ Failed to apply {counts['failed']} changes")
+        return counts
+    
+    def _apply_change(self, change: Dict[str, Any]) -> bool:
+        try:
+            if change['action'] == 'create':
+                self.api.create_job(change['config'])
+                return True
+            if change['action'] == 'update':
+                self.api.update_job(change['job_id'], change['config'])
+                return True
+            return self.api.delete_job(change['job_id'])
+        except Exception as e:
+            print(f"❌ Failed to {change['action']} job {change['name']}: {str(e)}")
+            return False
+    
+    async def _apply_changes_async(self, changes: List[Dict[str, Any]], concurrency: int) -> List[bool]:
+        import asyncio
+        
+        async with self._async_api(concurrency) as api:
+            
+            async def apply(change: Dict[str, Any]) -> bool:
+                try:
+                    if change['action'] == 'create':
+                        await api.create_job(change['config'])
+                        return True
+                    if change['action'] == 'update':
+                        await api.update_job(change['job_id'], change['config'])
+                        return True
+                    return await api.delete_job(change['job_id'])
+                except Exception as e:
+                    print(f"❌ Failed to {change['action']} job {change['name']}: {str(e)}")
+                    return False
+            
+            return await asyncio.gather(*(apply(change) for change in changes))
+    
+    def cleanup_old_jobs(self, days_old: int = 7, dry_run: bool = False, concurrency: int = 1,
+                         rate_limit: float = 0.0, retries: int = 2, resume: bool = False,
+                         use_async: bool = False) -> List[int]:
+        """Clean up branch jobs older than specified days
+        
+        Deletes run through a bounded worker pool, optionally rate limited to
+        `rate_limit` deletes per second. Failed deletes are retried in up to
+        `retries` further rounds. Progress is journaled so an interrupted run
+        can be continued with `resume` without re-listing the project, by the
+        same pipeline only: a later pipeline lists the project afresh. With
+        `use_async`, deletes are sent from one event loop instead of threads.
+        """
+        print(f"\n🧹 Cleaning up branch jobs older than {days_old} days")
+        
+        resumed = self._load_cleanup_journal() if resume and not dry_run else None
+        if resumed:
+            jobs_to_delete, skipped_count = resumed
+            print(f"♻️  Resuming interrupted cleanup from {self.cleanup_journal} "
+                  f"({skipped_count} jobs already deleted)")
+        else:
+            with self.metrics.phase('list'):
+                jobs_to_delete = self._find_jobs_to_clean_up(days_old)
+            skipped_count = 0
+        
+        print(f"🎯 Found {len(jobs_to_delete)} jobs to clean up")
         
         if dry_run:
+            for job in jobs_to_delete:
+                print(f"[DRY RUN] Would delete: {job.name} (ID: {job.id}, Created: {job.created_at})")
             print(f"\n[DRY RUN] Would delete {len(jobs_to_delete)} jobs")
+            return []
+        
+        if not resumed:
+            self._start_cleanup_journal(jobs_to_delete)
+        
+        limiter = RateLimiter(rate_limit, metrics=self.metrics) if rate_limit > 0 else None
+        journal_lock = threading.Lock()
+        
+        with self.metrics.phase('write'):
+            deleted_job_ids, failed_jobs = self._delete_jobs(jobs_to_delete, concurrency, limiter, journal_lock, use_async)
+            for attempt in range(1, retries + 1):
+                if not failed_jobs:
+                    break
+                delay = min(30, 2 ** attempt)
+                print(f"\n🔁 Retrying {len(failed_jobs)} failed deletes in {delay}s (attempt {attempt}/{retries})")
+                self.metrics.record_wait("backoff", delay)
+                time.sleep(delay)
+                retried_ids, failed_jobs = self._delete_jobs(failed_jobs, concurrency, limiter, journal_lock, use_async)
+                deleted_job_ids.extend(retried_ids)
+        
+        print(f"\n✅ Successfully deleted {len(deleted_job_ids)} jobs")
+        if skipped_count:
+            print(f"⏭️  Skipped {skipped_count} jobs deleted by the interrupted run")
+        if failed_jobs:
+            print(f"❌ Failed to delete {len(failed_jobs)} jobs: {', '.join(str(job.id) for job in failed_jobs)}")
+            print("   Re-run with --resume to retry them without re-listing the project")
         else:
-            print(f"\n✅ Successfully deleted {len(deleted_job_ids)} jobs")
+            self._finish_cleanup_journal()
         
         return deleted_job_ids
     
-    def _is_branch_job(self, job_name: str) -> bool:
-        """Check if job name indicates it's a branch job"""
-        # Branch jobs have format: team-branch-user-job
-        # Production jobs have format: team-job
-        parts = job_name.split('-')
-        
-        # If job has more than 2 parts and doesn't start with team-main or team-master
-        if len(parts) > 2 and not (len(parts) == 2 or 
-                                  job_name.startswith(f"{self.team_name}-main-") or
-                                  job_name.startswith(f"{self.team_name}-master-") or
-                                  job_name.startswith(f"{self.team_name}-production-")):
-            return True
+    def _find_jobs_to_clean_up(self, days_old: int) -> List[JobRecord]:
+        """List branch jobs created more than days_old days ago"""
+        cutoff_date = datetime.utcnow() - timedelta(days=days_old)
         
-        return False
+        # Stream the project's jobs page by page into compact columns
+        owners = self.build_ownership_index(self.api.iter_jobs(self.project_id, prefetch=True))
+        
+        # Only clean up this team's branch jobs
+        branch_rows = owners.branch_rows(self.team_name)
+        return owners.table.records(owners.table.select(created_before=cutoff_date, rows=branch_rows))
     
-    def list_team_jobs(self, show_details: bool = False) -> List[Dict[str, Any]]:
-        """List all jobs for this team"""
-        print(f"\n📋 Listing jobs for team: {self.team_name}")
+    def _delete_jobs(self, jobs: List[JobRecord], concurrency: int, limiter: Optional[RateLimiter],
+                     journal_lock: threading.Lock, use_async: bool = False) -> Any:
+        """Delete jobs concurrently, returning (deleted_job_ids, failed_jobs)"""
+        if use_async:
+            import asyncio
+            return asyncio.run(self._delete_jobs_async(jobs, concurrency, limiter))
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def delete(job: JobRecord) -> bool:
+            if limiter:
+                limiter.acquire()
+            try:
+                deleted = self.api.delete_job(job.id)
+            except Exception as e:
+                print(f"❌ Failed to delete job {job.id}: {str(e)}")
+                deleted = False
+            if deleted:
+                with journal_lock:
+                    self._append_cleanup_journal({"deleted": job.id})
+            return deleted
+        
+        deleted_job_ids = []
+        failed_jobs = []
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for job, deleted in zip(jobs, executor.map(delete, jobs)):
+                if deleted:
+                    deleted_job_ids.append(job.id)
+                else:
+                    failed_jobs.append(job)
+        return deleted_job_ids, failed_jobs
+    
+    async def _delete_jobs_async(self, jobs: List[JobRecord], concurrency: int,
+                                 limiter: Optional[RateLimiter]) -> Any:
+        """Async counterpart of _delete_jobs"""
+        import asyncio
         
-        all_jobs = self.api.list_jobs(self.project_id)
-        team_jobs = [job for job in all_jobs if job['name'].startswith(f"{self.team_name}-")]
+        async with self._async_api(concurrency) as api:
+            
+            async def delete(job: JobRecord) -> bool:
+                if limiter:
+                    # The limiter blocks, so wait for it off the event loop
+                    await asyncio.to_thread(limiter.acquire)
+                try:
+                    deleted = await api.delete_job(job.id)
+                except Exception as e:
+                    print(f"❌ Failed to delete job {job.id}: {str(e)}")
+                    deleted = False
+                if deleted:
+                    self._append_cleanup_journal({"deleted": job.id})
+                return deleted
+            
+            outcomes = await asyncio.gather(*(delete(job) for job in jobs))
+        
+        deleted_job_ids = [job.id for job, deleted in zip(jobs, outcomes) if deleted]
+        failed_jobs = [job for job, deleted in zip(jobs, outcomes) if not deleted]
+        return deleted_job_ids, failed_jobs
+    
+    def _start_cleanup_journal(self, jobs: List[JobRecord]) -> None:
+        """Record the planned deletions, replacing any previous journal"""
+        try:
+            os.makedirs(os.path.dirname(self.cleanup_journal) or '.', exist_ok=True)
+            with open(self.cleanup_journal, 'w') as f:
+                planned = [job.to_dict() for job in jobs]
+                f.write(json.dumps({"planned": planned, "pipeline": self.pipeline_id}) + "\n")
+        except OSError as e:
+            print(f"⚠️  Could not write cleanup journal: {e}")
+    
+    def _append_cleanup_journal(self, entry: Dict[str, Any]) -> None:
+        try:
+            with open(self.cleanup_journal, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+    
+    def _load_cleanup_journal(self) -> Optional[Any]:
+        """Return (pending_jobs, already_deleted_count) from an unfinished journal, if any"""
+        try:
+            with open(self.cleanup_journal, 'r') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return None
+        
+        planned = []
+        deleted_ids = set()
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A run killed mid-write leaves a partial last line
+                continue
+            if 'planned' in entry:
+                if entry.get('pipeline') != self.pipeline_id:
+                    # Only a retry of the same pipeline resumes; a later one re-lists the project
+                    print(f"⚠️  Ignoring cleanup journal from pipeline {entry.get('pipeline') or 'outside CI'}")
+                    return None
+                planned = entry['planned']
+            elif 'deleted' in entry:
+                deleted_ids.add(entry['deleted'])
         
-        branch_jobs = []
-        production_jobs = []
+        pending = [JobRecord.from_api(job) for job in planned if job['id'] not in deleted_ids]
+        return pending, len(planned) - len(pending)
+    
+    def _finish_cleanup_journal(self) -> None:
+        try:
+            os.remove(self.cleanup_journal)
+        except FileNotFoundError:
+            pass
+    
+    def list_team_jobs(self, show_details: bool = False, use_async: bool = False,
+                       concurrency: int = 10) -> List[JobRecord]:
+        """List all jobs for this team"""
+        print(f"\n📋 Listing jobs for team: {self.team_name}")
         
-        for job in team_jobs:
-            if self._is_branch_job(job['name']):
-                branch_jobs.append(job)
+        with self.metrics.phase('list'):
+            if use_async:
+                # Pages after the first are fetched concurrently
+                import asyncio
+                all_jobs = asyncio.run(self._list_jobs_async(concurrency))
             else:
-                production_jobs.append(job)
+                all_jobs = self.api.iter_jobs(self.project_id, prefetch=True)
+            owners = self.build_ownership_index(all_jobs)
+        production_jobs = owners.table.records(owners.production_rows(self.team_name))
+        branch_jobs = owners.table.records(owners.branch_rows(self.team_name))
+        team_jobs = production_jobs + branch_jobs
         
         print(f"\n🏭 Production Jobs ({len(production_jobs)}):")
         for job in production_jobs:
-            status = "✅ Active" if job.get('state') == 1 else "❌ Inactive"
-            print(f"  - {job['name']} (ID: {job['id']}) - {status}")
+            status = "✅ Active" if job.is_active else "❌ Inactive"
+            print(f"  - {job.name} (ID: {job.id}) - {status}")
             if show_details:
-                print(f"    Environment: {job.get('environment_id')}")
-                print(f"    Created: {job.get('created_at')}")
+                print(f"    Environment: {job.environment_id}")
+                print(f"    Created: {job.created_at}")
         
         print(f"\n🌿 Branch Jobs ({len(branch_jobs)}):")
         for job in branch_jobs:
-            status = "✅ Active" if job.get('state') == 1 else "❌ Inactive"
-            print(f"  - {job['name']} (ID: {job['id']}) - {status}")
+            status = "✅ Active" if job.is_active else "❌ Inactive"
+            print(f"  - {job.name} (ID: {job.id}) - {status}")
             if show_details:
-                print(f"    Created: {job.get('created_at')}")
+                print(f"    Created: {job.created_at}")
         
         return team_jobs
+    
+    async def _list_jobs_async(self, concurrency: int) -> List[Dict[str, Any]]:
+        """Fetch every page of the project's jobs with the async client"""
+        async with self._async_api(concurrency) as api:
+            return await api.list_jobs(self.project_id)
 
 def main():
     parser = argparse.ArgumentParser(description='dbt Cloud Job Manager')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
+    # Options shared by every command
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument('--metrics-json', default=os.getenv('DBT_JOB_MANAGER_METRICS_JSON'),
+                               help='Write request metrics and the phase breakdown as JSON to this path')
+    common_parser.add_argument('--metrics-prom', default=os.getenv('DBT_JOB_MANAGER_METRICS_PROM'),
+                               help='Write request metrics as a Prometheus textfile to this path')
+    common_parser.add_argument('--adaptive', action='store_true',
+                               default=os.getenv('DBTCLOUD_ADAPTIVE_CONCURRENCY', '').lower() in ('1', 'true', 'yes'),
+                               help='Adapt requests in flight to 429s and latency, up to --concurrency')
+    
     # Deploy command
-    deploy_parser = subparsers.add_parser('deploy', help='Deploy jobs from config file')
+    deploy_parser = subparsers.add_parser('deploy', parents=[common_parser], help='Deploy jobs from config file')
     deploy_parser.add_argument('--config', required=True, help='Path to jobs configuration file (.tfvars, .yaml, or .json)')
     deploy_parser.add_argument('--dry-run', action='store_true', help='Validate configuration without deploying')
+    deploy_parser.add_argument('--concurrency', type=int, default=1, help='Number of jobs to create/update in parallel (default: 1)')
+    deploy_parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio client (requires httpx) instead of threads')
+    
+    # Plan command
+    plan_parser = subparsers.add_parser('plan', parents=[common_parser], help='Write the change set a deploy would make, without applying it')
+    plan_parser.add_argument('--config', required=True, help='Path to jobs configuration file (.tfvars, .yaml, or .json)')
+    plan_parser.add_argument('--out', default='dbt-job-plan.json', help='Where to write the change set (default: dbt-job-plan.json)')
+    
+    # Apply command
+    apply_parser = subparsers.add_parser('apply', parents=[common_parser], help='Execute a change set written by plan')
+    apply_parser.add_argument('--plan', default='dbt-job-plan.json', help='Change set to apply (default: dbt-job-plan.json)')
+    apply_parser.add_argument('--concurrency', type=int, default=8, help='Number of changes to apply in parallel (default: 8)')
+    apply_parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio client (requires httpx) instead of threads')
+    
+    # Sync command
+    sync_parser = subparsers.add_parser('sync', parents=[common_parser], help="Deploy jobs and delete this branch's jobs that were removed from the config")
+    sync_parser.add_argument('--config', required=True, help='Path to jobs configuration file (.tfvars, .yaml, or .json)')
+    sync_parser.add_argument('--dry-run', action='store_true', help='Show the changes without making them')
+    sync_parser.add_argument('--concurrency', type=int, default=8, help='Number of changes to apply in parallel (default: 8)')
+    sync_parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio client (requires httpx) instead of threads')
     
     # Cleanup command
-    cleanup_parser = subparsers.add_parser('cleanup', help='Clean up old branch jobs')
+    cleanup_parser = subparsers.add_parser('cleanup', parents=[common_parser], help='Clean up old branch jobs')
     cleanup_parser.add_argument('--older-than', type=int, default=7, help='Delete jobs older than N days (default: 7)')
     cleanup_parser.add_argument('--dry-run', action='store_true', help='Show what would be deleted without actually deleting')
+    cleanup_parser.add_argument('--concurrency', type=int, default=1, help='Number of jobs to delete in parallel (default: 1)')
+    cleanup_parser.add_argument('--rate-limit', type=float, default=0.0, help='Maximum deletes per second, 0 for unlimited (default: 0)')
+    cleanup_parser.add_argument('--retries', type=int, default=2, help='Extra rounds for failed deletes (default: 2)')
+    cleanup_parser.add_argument('--resume', action='store_true', help="Continue this pipeline's interrupted cleanup from its journal")
+    cleanup_parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio client (requires httpx) instead of threads')
     
     # List command
-    list_parser = subparsers.add_parser('list', help='List team jobs')
+    list_parser = subparsers.add_parser('list', parents=[common_parser], help='List team jobs')
     list_parser.add_argument('--details', action='store_true', help='Show detailed job information')
+    list_parser.add_argument('--async', dest='use_async', action='store_true', help='Fetch job pages concurrently with the asyncio client (requires httpx)')
+    list_parser.add_argument('--concurrency', type=int, default=10, help='Pages fetched in parallel with --async (default: 10)')
     
     args = parser.parse_args()
     
@@ -476,21 +1023,42 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    manager = None
     try:
-        manager = JobManager()
+        # Give every deploy worker its own keep-alive connection
+        manager = JobManager(pool_size=getattr(args, 'concurrency', None), adaptive=args.adaptive)
         
         if args.command == 'deploy':
-            manager.deploy_jobs(args.config, args.dry_run)
+            manager.deploy_jobs(args.config, args.dry_run, args.concurrency, args.use_async)
+        
+        elif args.command == 'plan':
+            manager.write_plan(args.config, args.out)
+        
+        elif args.command == 'apply':
+            counts = manager.apply_plan(args.plan, args.concurrency, args.use_async)
+            if counts['failed']:
+                sys.exit(1)
+        
+        elif args.command == 'sync':
+            counts = manager.sync_jobs(args.config, args.dry_run, args.concurrency, args.use_async)
+            if counts['failed']:
+                sys.exit(1)
         
         elif args.command == 'cleanup':
-            manager.cleanup_old_jobs(args.older_than, args.dry_run)
+            manager.cleanup_old_jobs(args.older_than, args.dry_run, args.concurrency,
+                                     args.rate_limit, args.retries, args.resume, args.use_async)
         
         elif args.command == 'list':
-            manager.list_team_jobs(args.details)
+            manager.list_team_jobs(args.details, args.use_async, args.concurrency)
             
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         sys.exit(1)
+    
+    finally:
+        # Runs on failures and sys.exit too, so failed runs are still graphed
+        if manager:
+            manager.report_metrics(args.command, args.metrics_json, args.metrics_prom)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Terraform .tfvars parser
+
+Single-pass tokenizer and recursive-descent parser for the subset of HCL used
+in env_file/*.tfvars: top-level attribute assignments whose values are strings
+(with escapes), heredocs (<<EOF and the indented <<-EOF), numbers, booleans,
+null, lists and objects, spread over any number of lines, with #, // and /* */
+comments. Runs in linear time.
+
+Usage:
+    from tfvars_parser import load_tfvars
+    variables = load_tfvars("env_file/dev_env.tfvars")
+    jobs = variables["jobs"]
+"""
+
+import re
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+# Bump whenever parsing results change so cached parses are invalidated
+PARSER_VERSION = 1
+
+# Each match consumes any leading whitespace/comments plus exactly one token
+_TOKEN_RE = re.compile(r'''
+    (?:[ \t\r\n\f]+|\#[^\n]*|//[^\n]*|/\*.*?\*/)*
+    (?:
+        (?P<string>"(?:[^"\\\n]|\\.)*")
+      | (?P<heredoc><<-?(?P<marker>[A-Za-z_][A-Za-z0-9_-]*)[ \t]*\r?\n.*?^[ \t]*(?P=marker)[ \t]*\r?$)
+      | (?P<number>-?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+      | (?P<ident>[A-Za-z_][A-Za-z0-9_-]*)
+      | (?P<punct>[=:,\[\]{}])
+      | (?P<eof>\Z)
+      | (?P<error>.)
+    )
+''', re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+_ESCAPE_RE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)', re.DOTALL)
+
+_SIMPLE_ESCAPES = {
+    'n': '\n',
+    't': '\t',
+    'r': '\r',
+    '"': '"',
+    '\\': '\\',
+}
+
+_KEYWORDS = {
+    'true': True,
+    'false': False,
+    'null': None,
+}
+
+
+class TfvarsSyntaxError(ValueError):
+    """Raised when a .tfvars document cannot be parsed"""
+
+    def __init__(self, message: str, line: int, column: int, source: str = "<tfvars>"):
+        super().__init__(f"{source}:{line}:{column}: {message}")
+        self.line = line
+        self.column = column
+        self.source = source
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    offset: int
+
+
+def _position(text: str, offset: int) -> Tuple[int, int]:
+    """1-based line and column of an offset; only computed when reporting errors"""
+    line_start = text.rfind('\n', 0, offset) + 1
+    return text.count('\n', 0, offset) + 1, offset - line_start + 1
+
+
+def tokenize(text: str, source: str = "<tfvars>") -> Iterator[Token]:
+    """Yield significant tokens, skipping whitespace and comments"""
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'error':
+            line, column = _position(text, match.start(kind))
+            if text.startswith('<<', match.start(kind)):
+                raise TfvarsSyntaxError("Unterminated heredoc", line, column, source)
+            raise TfvarsSyntaxError(f"Unexpected character {match.group(kind)!r}", line, column, source)
+        yield Token(kind, match.group(kind), match.start(kind))
+        if kind == 'eof':
+            return
+
+
+def _unescape(escape: 're.Match') -> str:
+    code = escape.group(1)
+    if code[0] in 'uU' and len(code) > 1:
+        return chr(int(code[1:], 16))
+    # Unknown escapes are kept verbatim, as Terraform does for \$ and friends
+    return _SIMPLE_ESCAPES.get(code, escape.group(0))
+
+
+def _heredoc(token: str) -> str:
+    """Text of a heredoc token; <<- strips the indentation the lines share"""
+    lines = [line.rstrip('\r') for line in token.split('\n')[1:-1]]
+    if token.startswith('<<-'):
+        indents = [len(line) - len(line.lstrip(' \t')) for line in lines if line.strip()]
+        strip = min(indents, default=0)
+        lines = [line[strip:] for line in lines]
+    # Like Terraform, escapes are not processed and the last line keeps its newline
+    return ''.join(line + '\n' for line in lines)
+
+
+class _Parser:
+    """Recursive-descent parser over the token stream with one token of lookahead"""
+
+    def __init__(self, text: str, source: str):
+        self.text = text
+        self.source = source
+        self.tokens = tokenize(text, source)
+        self.current = next(self.tokens)
+
+    def error(self, message: str, token: Optional[Token] = None) -> TfvarsSyntaxError:
+        token = token or self.current
+        line, column = _position(self.text, token.offset)
+        return TfvarsSyntaxError(message, line, column, self.source)
+
+    def advance(self) -> Token:
+        token = self.current
+        self.current = next(self.tokens)
+        return token
+
+    def expect(self, value: str) -> Token:
+        if self.current.value != value or self.current.kind not in ('punct', 'eof'):
+            found = self.current.value or 'end of file'
+            raise self.error(f"Expected {value!r}, found {found!r}")
+        return self.advance()
+
+    def parse_document(self) -> Dict[str, Any]:
+        attributes = {}
+        while self.current.kind != 'eof':
+            key_token = self.current
+            if key_token.kind != 'ident':
+                raise self.error(f"Expected attribute name, found {key_token.value!r}")
+            self.advance()
+            self.expect('=')
+            if key_token.value in attributes:
+                raise self.error(f"Duplicate attribute {key_token.value!r}", key_token)
+            attributes[key_token.value] = self.parse_value()
+        return attributes
+
+    def parse_value(self) -> Any:
+        token = self.current
+        if token.kind == 'string':
+            self.advance()
+            return _ESCAPE_RE.sub(_unescape, token.value[1:-1])
+        if token.kind == 'heredoc':
+            self.advance()
+            return _heredoc(token.value)
+        if token.kind == 'number':
+            self.advance()
+            if '.' in token.value or 'e' in token.value or 'E' in token.value:
+                return float(token.value)
+            return int(token.value)
+        if token.kind == 'ident':
+            if token.value not in _KEYWORDS:
+                raise self.error(f"Unsupported expression {token.value!r}")
+            self.advance()
+            return _KEYWORDS[token.value]
+        if token.value == '[':
+            return self.parse_list()
+        if token.value == '{':
+            return self.parse_object()
+        raise self.error(f"Expected a value, found {token.value or 'end of file'!r}")
+
+    def parse_list(self) -> list:
+        self.expect('[')
+        items = []
+        while self.current.value != ']':
+            if self.current.kind == 'eof':
+                raise self.error("Unterminated list")
+            items.append(self.parse_value())
+            if self.current.value == ',':
+                self.advance()
+            elif self.current.value != ']':
+                raise self.error(f"Expected ',' or ']', found {self.current.value!r}")
+        self.advance()
+        return items
+
+    def parse_object(self) -> Dict[str, Any]:
+        self.expect('{')
+        obj = {}
+        while self.current.value != '}':
+            key_token = self.current
+            if key_token.kind == 'ident':
+                key = key_token.value
+            elif key_token.kind == 'string':
+                key = _ESCAPE_RE.sub(_unescape, key_token.value[1:-1])
+            elif key_token.kind == 'eof':
+                raise self.error("Unterminated object")
+            else:
+                raise self.error(f"Expected object key, found {key_token.value!r}")
+            self.advance()
+            if self.current.value not in ('=', ':'):
+                raise self.error(f"Expected '=' after {key!r}, found {self.current.value!r}")
+            self.advance()
+            if key in obj:
+                raise self.error(f"Duplicate key {key!r}", key_token)
+            obj[key] = self.parse_value()
+            # Attributes are separated by newlines or commas; newlines are not tokens
+            if self.current.value == ',':
+                self.advance()
+        self.advance()
+        return obj
+
+
+def parse_tfvars(text: str, source: str = "<tfvars>") -> Dict[str, Any]:
+    """Parse .tfvars content into a dict of variable name -> value"""
+    return _Parser(text, source).parse_document()
+
+
+def load_tfvars(path: str) -> Dict[str, Any]:
+    """Read and parse a .tfvars file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_tfvars(f.read(), source=str(path))
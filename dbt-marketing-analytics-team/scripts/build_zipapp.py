@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Build dbt_job_manager.py into a single-file zipapp
+
+Packages the job manager and its sibling modules into dist/dbt_job_manager.pyz.
+With --with-deps the packages from requirements.txt are installed into the
+archive too, so it runs on a bare Python image without a pip install step.
+Every module is precompiled: Python never writes bytecode caches into a zip,
+so an archive of plain sources would be recompiled on every start.
+
+After building, startup is measured as the median wall-clock of a
+`deploy --dry-run` on a .tfvars file (what the validate stage runs) and the
+build fails if it exceeds the budget. With --no-build only the measurement
+runs, against an archive built earlier (CI builds and measures in separate
+jobs).
+
+Usage:
+    python scripts/build_zipapp.py
+    python scripts/build_zipapp.py --with-deps --startup-budget-ms 500
+    python scripts/build_zipapp.py --no-build --startup-budget-ms 500
+    python dist/dbt_job_manager.pyz deploy --config env_file/dev_env.tfvars --dry-run
+"""
+
+import argparse
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipapp
+from pathlib import Path
+from typing import List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+TEAM_DIR = SCRIPTS_DIR.parent
+ENTRY_POINT = "dbt_job_manager:main"
+
+# Build tooling that does not belong in the archive
+EXCLUDE = {"build_zipapp.py"}
+
+# Stand-in settings for the measured dry run, which never calls the API
+MEASURE_ENV = {
+    "DBTCLOUD_ACCOUNT_ID": "1",
+    "DBTCLOUD_TOKEN": "startup-budget",
+    "PROJECT_ID": "1",
+    "ENVIRONMENT_ID": "1",
+    # Measure a real parse, not a cache hit
+    "DBT_JOB_MANAGER_CACHE_DIR": "",
+}
+
+
+def stage_sources(build_dir: Path) -> None:
+    for source in sorted(SCRIPTS_DIR.glob("*.py")):
+        if source.name not in EXCLUDE:
+            shutil.copy2(source, build_dir / source.name)
+
+
+def install_dependencies(build_dir: Path, requirements: Path) -> None:
+    print(f"📦 Installing {requirements.name} into the archive...")
+    subprocess.run([sys.executable, "-m", "pip", "install", "--quiet", "--no-compile",
+                    "--target", str(build_dir), "-r", str(requirements)], check=True)
+    # Console scripts cannot run from inside a zip
+    shutil.rmtree(build_dir / "bin", ignore_errors=True)
+
+
+def precompile(build_dir: Path) -> int:
+    """Write module.pyc next to each module.py, the layout zipimport looks for"""
+    compiled = 0
+    for source in build_dir.rglob("*.py"):
+        # Unchecked hash-based pycs skip the source timestamp check, which zip mtimes would break
+        py_compile.compile(str(source), cfile=str(source.with_suffix(".pyc")), doraise=True,
+                           invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        compiled += 1
+    for cache_dir in list(build_dir.rglob("__pycache__")):
+        shutil.rmtree(cache_dir)
+    return compiled
+
+
+def build(output: Path, with_deps: bool, requirements: Path) -> Path:
+    with tempfile.TemporaryDirectory() as tmp:
+        build_dir = Path(tmp)
+        stage_sources(build_dir)
+        if with_deps:
+            install_dependencies(build_dir, requirements)
+        compiled = precompile(build_dir)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Stored rather than deflated: decompressing costs more at startup than the size saves
+        zipapp.create_archive(build_dir, output, interpreter="/usr/bin/env python3", main=ENTRY_POINT)
+    print(f"✅ Built {output} ({compiled} modules, {output.stat().st_size / 1024:.0f} KiB)")
+    return output
+
+
+def median_ms(command: List[str], env: dict, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def measure_startup(archive: Path, config: Optional[Path], runs: int) -> float:
+    """Median wall-clock of the validate stage's dry run, in milliseconds"""
+    env = dict(os.environ, **MEASURE_ENV)
+    if config:
+        command = [sys.executable, str(archive), "deploy", "--config", str(config), "--dry-run"]
+        label = f"deploy --dry-run on {config.name}"
+    else:
+        command = [sys.executable, str(archive), "deploy", "--help"]
+        label = "deploy --help"
+    interpreter = median_ms([sys.executable, "-c", "pass"], env, runs)
+    total = median_ms(command, env, runs)
+    print(f"⏱️  Startup ({label}, median of {runs}): {total:.0f}ms "
+          f"({interpreter:.0f}ms interpreter, {total - interpreter:.0f}ms job manager)")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build dbt_job_manager.py into a zipapp and check its startup time")
+    parser.add_argument("--output", type=Path, default=TEAM_DIR / "dist" / "dbt_job_manager.pyz",
+                        help="Archive to write (default: dist/dbt_job_manager.pyz)")
+    parser.add_argument("--with-deps", action="store_true",
+                        help="Install requirements.txt into the archive so it needs no pip install")
+    parser.add_argument("--requirements", type=Path, default=TEAM_DIR / "requirements.txt",
+                        help="Requirements installed by --with-deps (default: requirements.txt)")
+    parser.add_argument("--config", type=Path, default=TEAM_DIR / "env_file" / "dev_env.tfvars",
+                        help="Config used for the measured dry run (default: env_file/dev_env.tfvars)")
+    parser.add_argument("--startup-budget-ms", type=float, default=500.0,
+                        help="Fail if the measured startup exceeds this, 0 to skip measuring (default: 500)")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs for the startup measurement (default: 5)")
+    parser.add_argument("--no-build", action="store_true",
+                        help="Only measure the startup of the existing --output archive")
+    args = parser.parse_args()
+
+    if args.no_build:
+        if not args.output.exists():
+            print(f"❌ {args.output} not found; build it first")
+            return 1
+        archive = args.output
+    else:
+        archive = build(args.output, args.with_deps, args.requirements)
+    if args.startup_budget_ms <= 0:
+        return 0
+
+    config = args.config if args.config.exists() else None
+    startup = measure_startup(archive, config, max(1, args.runs))
+    if startup > args.startup_budget_ms:
+        print(f"❌ Startup {startup:.0f}ms exceeds the {args.startup_budget_ms:.0f}ms budget")
+        return 1
+    print(f"✅ Within the {args.startup_budget_ms:.0f}ms startup budget")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
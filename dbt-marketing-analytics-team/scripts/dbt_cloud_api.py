@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+dbt Cloud REST API client
+
+Shared by the job manager and the terraform-import discovery scripts. All calls
+go through one pooled keep-alive requests.Session; idempotent calls are retried
+with exponential backoff and jitter, and 429 responses honor Retry-After.
+Collection endpoints are walked page by page with offset/limit. Every attempt
+is recorded in an ApiMetrics instance (see api_metrics.py). With an
+AIMDController (see adaptive_concurrency.py) the number of requests in flight
+adapts to 429s, errors and latency instead of being fixed by the pool size.
+A rate limiter, either in-process (RateLimiter) or shared by every process on
+a runner volume (SharedRateLimiter), is consulted before each attempt.
+
+requests (and sqlite3, concurrent.futures) are imported on first use, so
+commands that never reach the API, such as a --dry-run, do not pay for them.
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Any
+
+if TYPE_CHECKING:
+    import requests
+
+from adaptive_concurrency import AIMDController, ConcurrencyGate
+from api_metrics import ApiMetrics
+
+# Status codes worth retrying; 429 is retried even for non-idempotent calls
+# because a throttled request was never processed
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Largest page the v2 API returns for list endpoints
+DEFAULT_PAGE_SIZE = 100
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting calls to `rate` per second"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None, metrics: Optional[ApiMetrics] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.metrics = metrics
+
+    def acquire(self) -> None:
+        """Block until a call is allowed"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+        if waited and self.metrics:
+            self.metrics.record_wait("rate_limit", waited)
+
+
+class SharedRateLimiter:
+    """Token bucket shared by every process that opens the same SQLite file
+
+    Concurrent pipelines point at one file on a shared runner volume so their
+    combined request rate stays under `rate` per second. Taking a token is a
+    short write transaction, serialised across processes by SQLite's file
+    lock. Buckets are keyed (by account, typically) so one file can serve
+    several accounts. Refill uses wall-clock time, so hosts sharing the file
+    need synchronised clocks. If the database becomes unusable the limiter
+    disables itself rather than failing the deploy.
+    """
+
+    def __init__(self, path: str, rate: float, burst: Optional[int] = None, key: str = "default",
+                 metrics: Optional[ApiMetrics] = None):
+        self.path = path
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.key = key
+        self.metrics = metrics
+        self.disabled = False
+        self.lock = threading.Lock()
+
+        import sqlite3
+        self._db_error = sqlite3.Error
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one is"""
+        with self.lock:
+            # Take the write lock up front so no other process refills the same snapshot
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.connection.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (self.key,)
+                ).fetchone()
+                now = time.time()
+                if row is None:
+                    tokens = float(self.capacity)
+                else:
+                    tokens = min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / self.rate
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (self.key, tokens, now)
+                )
+                self.connection.execute("COMMIT")
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            return wait
+
+    def acquire(self) -> None:
+        """Block until the shared bucket allows a call"""
+        waited = 0.0
+        while not self.disabled:
+            try:
+                wait = self._take()
+            except self._db_error as e:
+                self.disabled = True
+                print(f"⚠️  Shared rate limiter at {self.path} unavailable ({e}), continuing without it")
+                break
+            if not wait:
+                break
+            time.sleep(wait)
+            waited += wait
+        if waited and self.metrics:
+            self.metrics.record_wait("shared_rate_limit", waited)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class DBTCloudAPI:
+    """dbt Cloud REST API client"""
+
+    def __init__(self, account_id: str, token: str, host_url: str = "https://cloud.getdbt.com",
+                 pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0, timeout: float = 30.0,
+                 page_size: int = DEFAULT_PAGE_SIZE, metrics: Optional[ApiMetrics] = None,
+                 concurrency: Optional[AIMDController] = None, rate_limiter=None):
+        self.account_id = account_id
+        self.token = token
+        self.base_url = f"{host_url}/api/v2/accounts/{account_id}"
+        self.headers = {
+            "Authorization": f"Token {token}",
+            "Content-Type": "application/json"
+        }
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.page_size = page_size
+        self.metrics = metrics or ApiMetrics()
+        self.concurrency = concurrency
+        self._gate = ConcurrencyGate(concurrency) if concurrency else None
+        # Anything with acquire(): RateLimiter or SharedRateLimiter
+        self.rate_limiter = rate_limiter
+
+        # One keep-alive session shared by every call (and every worker thread), opened on first use
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    session.headers.update(self.headers)
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        if self._session is not None:
+            self._session.close()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    def _retry_after(self, response: "requests.Response") -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return min(self.max_backoff, max(0.0, float(value)))
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return min(self.max_backoff, max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds()))
+
+    def _request(self, method: str, url: str, idempotent: bool = True, **kwargs) -> "requests.Response":
+        """Send a request through the pooled session, retrying transient failures"""
+        import requests
+
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                if self._gate:
+                    with self._gate:
+                        # Timed inside the gate so queueing is not counted as latency
+                        start = time.perf_counter()
+                        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                else:
+                    start = time.perf_counter()
+                    response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.metrics.record_request(method, url, e.__class__.__name__, time.perf_counter() - start)
+                if self.concurrency:
+                    self.concurrency.on_error(e.__class__.__name__)
+                # A non-idempotent request may have been applied before the failure
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                wait_kind, reason = "backoff", e.__class__.__name__
+                print(f"⚠️  {method} {url} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            else:
+                elapsed = time.perf_counter() - start
+                body = response.request.body
+                self.metrics.record_request(method, url, response.status_code, elapsed,
+                                            len(body) if body else 0, len(response.content))
+                if self.concurrency:
+                    self._adapt(response.status_code, elapsed, response)
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after(response) if response.status_code == 429 else None
+                wait_kind, reason = ("backoff" if delay is None else "retry_after"), response.status_code
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                print(f"⚠️  {method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+            self.metrics.record_retry(method, url, reason)
+            self.metrics.record_wait(wait_kind, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _adapt(self, status: int, elapsed: float, response) -> None:
+        """Feed one response into the concurrency controller"""
+        if status == 429:
+            self.concurrency.on_throttle(self._retry_after(response))
+        elif status >= 500:
+            self.concurrency.on_error(str(status))
+        else:
+            self.concurrency.on_success(elapsed)
+
+    def get_resource(self, resource: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET an account-level resource collection (projects, environments, ...) as raw JSON"""
+        response = self._request("GET", f"{self.base_url}/{resource}/", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def create_job(self, job_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new dbt Cloud job"""
+        url = f"{self.base_url}/jobs/"
+
+        print(f"Creating job: {job_config['name']}")
+        response = self._request("POST", url, idempotent=False, json=job_config)
+
+        if response.status_code == 201:
+            job_data = response.json()['data']
+            print(f"✅ Job created successfully - ID: {job_data['id']}")
+            return job_data
+        else:
+            print(f"❌ Failed to create job: {response.status_code} - {response.text}")
+            response.raise_for_status()
+
+    def update_job(self, job_id: int, job_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Update an existing dbt Cloud job"""
+        url = f"{self.base_url}/jobs/{job_id}/"
+
+        print(f"Updating job: {job_config['name']} (ID: {job_id})")
+        # Updating a job by ID replaces its definition, so it is safe to retry
+        response = self._request("POST", url, json=job_config)
+
+        if response.status_code == 200:
+            job_data = response.json()['data']
+            print(f"✅ Job updated successfully - ID: {job_data['id']}")
+            return job_data
+        else:
+            print(f"❌ Failed to update job: {response.status_code} - {response.text}")
+            response.raise_for_status()
+
+    def delete_job(self, job_id: int) -> bool:
+        """Delete a dbt Cloud job"""
+        url = f"{self.base_url}/jobs/{job_id}/"
+
+        print(f"Deleting job ID: {job_id}")
+        response = self._request("DELETE", url)
+
+        if response.status_code == 204:
+            print(f"✅ Job deleted successfully - ID: {job_id}")
+            return True
+        else:
+            print(f"❌ Failed to delete job: {response.status_code} - {response.text}")
+            return False
+
+    def _iter_pages(self, url: str, params: Optional[Dict[str, Any]] = None, page_size: Optional[int] = None,
+                    prefetch: bool = False, label: str = "resources") -> Iterator[List[Dict[str, Any]]]:
+        """Yield successive pages of a list endpoint using offset/limit pagination
+
+        With prefetch, the next page is requested in the background while the
+        caller processes the current one.
+        """
+        page_size = page_size or self.page_size
+        base_params = dict(params or {})
+
+        def fetch(offset: int) -> Dict[str, Any]:
+            response = self._request("GET", url, params={**base_params, "offset": offset, "limit": page_size})
+            if response.status_code != 200:
+                print(f"❌ Failed to list {label}: {response.status_code} - {response.text}")
+                response.raise_for_status()
+            return response.json()
+
+        executor = None
+        if prefetch:
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=1)
+        pending = None
+        offset = 0
+        try:
+            while True:
+                body = pending.result() if pending else fetch(offset)
+                pending = None
+                page = body.get('data') or []
+                offset += len(page)
+
+                # Trust the reported total when present; the API may cap the page size below our limit
+                total_count = ((body.get('extra') or {}).get('pagination') or {}).get('total_count')
+                if total_count is not None:
+                    has_more = bool(page) and offset < total_count
+                else:
+                    has_more = len(page) >= page_size
+
+                if has_more and executor:
+                    pending = executor.submit(fetch, offset)
+                yield page
+                if not has_more:
+                    return
+        finally:
+            # Runs on exhaustion and when the caller stops early
+            if executor:
+                if pending:
+                    pending.cancel()
+                executor.shutdown(wait=False)
+
+    def iter_jobs(self, project_id: Optional[int] = None, page_size: Optional[int] = None,
+                  prefetch: bool = False) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every job, optionally filtered by project, one page at a time"""
+        params = {"project_id": project_id} if project_id else None
+        for page in self._iter_pages(f"{self.base_url}/jobs/", params, page_size, prefetch, label="jobs"):
+            yield from page
+
+    def list_jobs(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List all jobs, optionally filtered by project"""
+        return list(self.iter_jobs(project_id, prefetch=True))
+
+    def get_job_by_name(self, job_name: str, project_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Find a job by name, stopping at the first match"""
+        for job in self.iter_jobs(project_id):
+            if job['name'] == job_name:
+                return job
+        return None
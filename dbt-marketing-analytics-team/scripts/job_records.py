@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Compact job records for account-scale listings
+
+The jobs API returns every field of every job, but listing, cleanup and
+ownership checks only need a handful of them. JobRecord keeps those fields in
+__slots__ and parses timestamps and tags on first use. JobTable stores a
+listing column by column (ids, environment ids, states and creation times in
+typed arrays; team/branch/user as interned strings), so the raw response dicts
+can be dropped as soon as each page is consumed and filters are plain scans
+over a few columns.
+
+Usage:
+    table = JobTable.from_jobs(api.iter_jobs(project_id))
+    rows = table.select(team="analytics-team", created_before=cutoff)
+    for job in table.records(rows):
+        print(job.id, job.name, job.created_at)
+"""
+
+import math
+import re
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Tags written by JobManager.prepare_job_config that identify a job's owner
+OWNERSHIP_TAGS = ('team', 'branch', 'user')
+
+# Branches whose jobs use plain team-job naming
+PRODUCTION_BRANCHES = ('main', 'master', 'production')
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Owner that prepare_job_config appends to every job description
+_BRANCH_MARKER_RE = re.compile(r'\(Branch: (?P<branch>[^,()]+), User: (?P<user>[^()]+)\)$')
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API timestamp into a naive UTC datetime, or None if it cannot be parsed"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_tags(tags: Optional[Iterable[Any]]) -> Dict[str, str]:
+    """Turn ["team:analytics-team", "branch:feat", ...] into a dict"""
+    parsed = {}
+    for tag in tags or ():
+        if isinstance(tag, str) and ':' in tag:
+            key, value = tag.split(':', 1)
+            parsed[key] = value
+    return parsed
+
+
+class JobRecord:
+    """The fields of a dbt Cloud job that listing and cleanup need"""
+
+    __slots__ = ('id', 'name', 'project_id', 'environment_id', 'state', '_created_at', '_tags')
+
+    def __init__(self, id: int, name: str, project_id: Optional[int] = None,
+                 environment_id: Optional[int] = None, state: Optional[int] = None,
+                 created_at: Union[str, datetime, None] = None,
+                 tags: Union[List[Any], Dict[str, str], None] = None):
+        self.id = id
+        self.name = name
+        self.project_id = project_id
+        self.environment_id = environment_id
+        self.state = state
+        # Raw API values; parsed on first access
+        self._created_at = created_at
+        self._tags = tags
+
+    @classmethod
+    def from_api(cls, job: Dict[str, Any]) -> "JobRecord":
+        """Build a record from a jobs API response item (or a to_dict() result)"""
+        return cls(job['id'], job['name'], job.get('project_id'), job.get('environment_id'),
+                   job.get('state'), job.get('created_at'), job.get('tags'))
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        """Creation time as a naive UTC datetime"""
+        if isinstance(self._created_at, str):
+            self._created_at = parse_timestamp(self._created_at)
+        return self._created_at
+
+    @property
+    def tags(self) -> Dict[str, str]:
+        """Tags as a key -> value dict"""
+        if not isinstance(self._tags, dict):
+            self._tags = parse_tags(self._tags)
+        return self._tags
+
+    @property
+    def team(self) -> Optional[str]:
+        return self.tags.get('team')
+
+    @property
+    def branch(self) -> Optional[str]:
+        return self.tags.get('branch')
+
+    @property
+    def user(self) -> Optional[str]:
+        return self.tags.get('user')
+
+    @property
+    def is_active(self) -> bool:
+        return self.state == 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form that from_api() accepts"""
+        created_at = self.created_at
+        return {
+            "id": self.id,
+            "name": self.name,
+            "project_id": self.project_id,
+            "environment_id": self.environment_id,
+            "state": self.state,
+            "created_at": created_at.isoformat() if created_at else None,
+            "tags": [f"{key}:{value}" for key, value in self.tags.items()],
+        }
+
+    def __repr__(self) -> str:
+        return f"JobRecord(id={self.id!r}, name={self.name!r})"
+
+
+class JobTable:
+    """Column-oriented table of jobs with fast filtering by owner and age"""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.names: List[str] = []
+        self.project_ids = array('q')
+        self.environment_ids = array('q')
+        self.states = array('b')
+        # Seconds since the epoch (UTC); NaN when the API gave no usable timestamp
+        self.created = array('d')
+        self.teams: List[Optional[str]] = []
+        self.branches: List[Optional[str]] = []
+        self.users: List[Optional[str]] = []
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Dict[str, Any]]) -> "JobTable":
+        """Build a table in one pass; works with a streaming iterator of API dicts"""
+        table = cls()
+        table.extend(jobs)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def extend(self, jobs: Iterable[Dict[str, Any]]) -> None:
+        for job in jobs:
+            self.append(job)
+
+    def append(self, job: Dict[str, Any]) -> None:
+        """Add one API job dict; only the tracked fields are kept"""
+        created_at = parse_timestamp(job.get('created_at'))
+        tags = parse_tags(job.get('tags'))
+
+        self.ids.append(job['id'])
+        self.names.append(job['name'])
+        # 0 stands for a missing id; dbt Cloud ids start at 1
+        self.project_ids.append(job.get('project_id') or 0)
+        self.environment_ids.append(job.get('environment_id') or 0)
+        self.states.append(job.get('state') or 0)
+        self.created.append((created_at - _EPOCH).total_seconds() if created_at else math.nan)
+        # Owners repeat across thousands of jobs; interning stores each string once
+        self.teams.append(_intern(tags.get('team')))
+        self.branches.append(_intern(tags.get('branch')))
+        self.users.append(_intern(tags.get('user')))
+
+    def select(self, team: Optional[str] = None, branch: Optional[str] = None,
+               user: Optional[str] = None, created_before: Optional[datetime] = None,
+               rows: Optional[Iterable[int]] = None) -> List[int]:
+        """Row numbers of jobs matching every given filter
+
+        Owner filters compare against the job's tags; untagged jobs never
+        match them. created_before is a naive UTC datetime; jobs without a
+        creation time never match it. `rows` narrows the search to a subset,
+        such as rows looked up in an OwnershipIndex.
+        """
+        if rows is None:
+            rows = range(len(self))
+        if team is not None:
+            rows = [row for row in rows if self.teams[row] == team]
+        if branch is not None:
+            rows = [row for row in rows if self.branches[row] == branch]
+        if user is not None:
+            rows = [row for row in rows if self.users[row] == user]
+        if created_before is not None:
+            # NaN compares false, so jobs without a timestamp drop out
+            cutoff = (created_before - _EPOCH).total_seconds()
+            rows = [row for row in rows if self.created[row] < cutoff]
+        return list(rows)
+
+    def record(self, row: int) -> JobRecord:
+        """Materialize one row as a JobRecord"""
+        created = self.created[row]
+        owners = (self.teams[row], self.branches[row], self.users[row])
+        tags = {key: value for key, value in zip(OWNERSHIP_TAGS, owners) if value is not None}
+        return JobRecord(
+            self.ids[row],
+            self.names[row],
+            self.project_ids[row] or None,
+            self.environment_ids[row] or None,
+            self.states[row],
+            None if math.isnan(created) else _EPOCH + timedelta(seconds=created),
+            tags,
+        )
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> List[JobRecord]:
+        """Materialize the given rows (default: all) as JobRecords"""
+        if rows is None:
+            rows = range(len(self))
+        return [self.record(row) for row in rows]
+
+
+class OwnershipIndex:
+    """Jobs of a JobTable grouped by owner: team -> branch -> user -> row numbers
+
+    Owners come from the team/branch/user tags that prepare_job_config writes.
+    Untagged jobs (production jobs created by Terraform, jobs made by hand, or
+    branch jobs whose tags were lost) fall back to their name, which must start
+    with `team-`. `team-branch-user-...` belongs to the current branch/user.
+    Another branch's `team-<branch>-<user>-...` is recognized by the
+    "(Branch: <branch>, User: <user>)" that prepare_job_config appends to the
+    description, since job names may contain hyphens themselves. Any other
+    `team-...` name is a production job, and anything else is not indexed.
+    Production jobs are filed under branch None, user None.
+    """
+
+    def __init__(self, table: JobTable, team_name: str, branch_name: Optional[str] = None,
+                 user: Optional[str] = None):
+        self.table = table
+        self.team_name = team_name
+        self.branch_name = branch_name
+        self.user = user
+        self.owners: Dict[str, Dict[Optional[str], Dict[Optional[str], List[int]]]] = {}
+
+        if branch_name and user and branch_name not in PRODUCTION_BRANCHES:
+            branch_prefix = f"(?P<branch_job>{re.escape(branch_name)}-{re.escape(user)}-)?"
+        else:
+            branch_prefix = ""
+        self._name_pattern = re.compile(f"{re.escape(team_name)}-{branch_prefix}")
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Dict[str, Any]], team_name: str, branch_name: Optional[str] = None,
+                  user: Optional[str] = None) -> "OwnershipIndex":
+        """Build a JobTable and its index in one pass over API job dicts"""
+        index = cls(JobTable(), team_name, branch_name, user)
+        for job in jobs:
+            index.table.append(job)
+            index._add(len(index.table) - 1, job.get('description'))
+        return index
+
+    def _add(self, row: int, description: Optional[str] = None) -> None:
+        team = self.table.teams[row]
+        if team is not None:
+            branch, user = self.table.branches[row], self.table.users[row]
+        else:
+            name = self.table.names[row]
+            match = self._name_pattern.match(name)
+            if not match:
+                return
+            team = self.team_name
+            branch, user = None, None
+            if match.lastgroup == 'branch_job':
+                branch, user = self.branch_name, self.user
+            elif description:
+                marker = _BRANCH_MARKER_RE.search(description)
+                if marker and name.startswith(f"{team}-{marker['branch']}-{marker['user']}-"):
+                    branch, user = marker['branch'], marker['user']
+
+        if branch in PRODUCTION_BRANCHES:
+            branch, user = None, None
+        self.owners.setdefault(team, {}).setdefault(branch, {}).setdefault(user, []).append(row)
+
+    def production_rows(self, team: str) -> List[int]:
+        """Rows of the team's production jobs"""
+        return list(self.owners.get(team, {}).get(None, {}).get(None, []))
+
+    def branch_rows(self, team: str, branch: Optional[str] = None, user: Optional[str] = None) -> List[int]:
+        """Rows of the team's branch jobs, optionally for one branch and/or user"""
+        rows = []
+        for branch_name, users in self.owners.get(team, {}).items():
+            if branch_name is None or (branch is not None and branch_name != branch):
+                continue
+            for user_name, user_rows in users.items():
+                if user is None or user_name == user:
+                    rows.extend(user_rows)
+        return sorted(rows)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Adaptive (AIMD) limit on in-flight dbt Cloud API requests
+
+A fixed worker count either underuses the API or gets throttled. AIMDController
+starts low, raises the limit by one request per window of healthy responses
+(additive increase) and halves it on a 429, a 5xx, a connection failure or when
+latency climbs well above the best seen so far (multiplicative decrease). After
+a decrease it waits out a cooldown, or the server's Retry-After, before growing
+again, so one burst of 429s only counts once.
+
+ConcurrencyGate enforces the current limit around each blocking request (its
+asyncio counterpart lives in dbt_cloud_async.py, keeping asyncio off the
+startup path); the clients report every outcome back to the controller.
+Decisions are printed when the limit changes and counted in ApiMetrics so the
+tuning knobs can be checked against real runs.
+
+Usage:
+    controller = AIMDController(initial=4, maximum=32)
+    api = DBTCloudAPI(account_id, token, pool_size=32, concurrency=controller)
+"""
+
+import threading
+import time
+from typing import Optional
+
+from api_metrics import ApiMetrics
+
+
+class AIMDController:
+    """Additive-increase/multiplicative-decrease concurrency limit"""
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64, increase: float = 1.0,
+                 decrease: float = 0.5, latency_tolerance: float = 2.0, cooldown: float = 1.0,
+                 metrics: Optional[ApiMetrics] = None, verbose: bool = True):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.metrics = metrics
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        # Lowest latency seen, drifting up slowly so a permanently slower API is accepted
+        self.baseline_latency: Optional[float] = None
+        self.smoothed_latency: Optional[float] = None
+        self._hold_until = 0.0
+        if metrics:
+            metrics.record_concurrency(self.current)
+
+    @property
+    def current(self) -> int:
+        """Requests allowed in flight right now"""
+        return int(self.limit)
+
+    def on_success(self, latency: float) -> None:
+        """A request completed normally"""
+        with self.lock:
+            if self.baseline_latency is None or latency < self.baseline_latency:
+                self.baseline_latency = latency
+            else:
+                self.baseline_latency += 0.01 * (latency - self.baseline_latency)
+            if self.smoothed_latency is None:
+                self.smoothed_latency = latency
+            else:
+                self.smoothed_latency += 0.2 * (latency - self.smoothed_latency)
+
+            if self.smoothed_latency > self.latency_tolerance * self.baseline_latency:
+                self._decrease(f"latency {self.smoothed_latency * 1000:.0f}ms vs "
+                               f"{self.baseline_latency * 1000:.0f}ms baseline")
+            elif time.monotonic() >= self._hold_until:
+                # One extra slot per `limit` successes, i.e. about +1 per round trip
+                self._set(min(self.maximum, self.limit + self.increase / self.limit), "healthy")
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """The API answered 429"""
+        reason = f"429, Retry-After {retry_after:g}s" if retry_after is not None else "429"
+        with self.lock:
+            self._decrease(reason, hold=retry_after)
+
+    def on_error(self, reason: str) -> None:
+        """A 5xx response or connection failure"""
+        with self.lock:
+            self._decrease(reason)
+
+    def _decrease(self, reason: str, hold: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if now < self._hold_until:
+            # Already backed off for this burst
+            return
+        self._hold_until = now + max(self.cooldown, hold or 0.0)
+        self._set(max(self.minimum, self.limit * self.decrease), reason)
+        # Latency measured at the old level no longer applies
+        self.smoothed_latency = self.baseline_latency
+
+    def _set(self, limit: float, reason: str) -> None:
+        before = int(self.limit)
+        self.limit = limit
+        after = int(limit)
+        if after == before:
+            return
+        if self.metrics:
+            self.metrics.record_concurrency(after, "increase" if after > before else "decrease")
+        if self.verbose:
+            arrow = "📈" if after > before else "📉"
+            print(f"{arrow} Concurrency {before} → {after} ({reason})")
+
+
+class ConcurrencyGate:
+    """Blocks threads while the controller's limit of requests is in flight"""
+
+    def __init__(self, controller: AIMDController):
+        self.controller = controller
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def __enter__(self) -> "ConcurrencyGate":
+        with self.condition:
+            while self.in_flight >= self.controller.current:
+                # Wake up periodically; the limit can grow without anyone releasing
+                self.condition.wait(timeout=0.5)
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Request metrics for the dbt Cloud API clients
+
+ApiMetrics is shared by DBTCloudAPI, AsyncDBTCloudAPI and RateLimiter. Every
+HTTP attempt is timed and counted by method, endpoint and status, together with
+bytes sent and received, retries (by reason) and time spent waiting (backoff,
+Retry-After, rate limiting). When an AIMDController adapts the number of
+requests in flight, its limit and adjustments are tracked too. Commands wrap
+their steps in phase() blocks to get a parse/list/prepare/write breakdown.
+
+Metrics can be exported as JSON or as a Prometheus textfile (for the node
+exporter textfile collector or a CI job that pushes them), with constant
+labels such as team and command so runs can be graphed per team.
+
+Usage:
+    metrics = ApiMetrics()
+    api = DBTCloudAPI(account_id, token, metrics=metrics)
+    with metrics.phase("list"):
+        jobs = api.list_jobs(project_id)
+    metrics.write_prometheus("metrics/deploy.prom", {"team": "analytics-team", "command": "deploy"})
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Histogram buckets for request latency, in seconds
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ACCOUNT_PATH_RE = re.compile(r'/api/v2/accounts/\d+/(?P<path>[^?]*)')
+_ID_SEGMENT_RE = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def endpoint_name(url: str) -> str:
+    """Collapse a request URL to a low-cardinality endpoint such as "jobs/{id}" """
+    match = _ACCOUNT_PATH_RE.search(url)
+    path = match.group('path') if match else url.split('?', 1)[0]
+    path = _ID_SEGMENT_RE.sub('{id}', '/' + path.strip('/'))
+    return path.lstrip('/') or '/'
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class ApiMetrics:
+    """Thread-safe counters, timings and phase durations for one command run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        # (method, endpoint, status) -> list of attempt durations in seconds
+        self.durations: Dict[Tuple[str, str, str], List[float]] = {}
+        # (method, endpoint, reason) -> retry count
+        self.retries: Dict[Tuple[str, str, str], int] = {}
+        # wait kind -> seconds
+        self.waits: Dict[str, float] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # phase -> seconds, in first-entered order
+        self.phases: Dict[str, float] = {}
+        # Adaptive concurrency: current limit, lowest/highest seen and adjustments by direction
+        self.concurrency_limit: Optional[int] = None
+        self.concurrency_min: Optional[int] = None
+        self.concurrency_max: Optional[int] = None
+        self.concurrency_changes: Dict[str, int] = {}
+
+    def record_request(self, method: str, url: str, status: Any, duration: float,
+                       bytes_sent: int = 0, bytes_received: int = 0) -> None:
+        """Record one HTTP attempt; status is the response code or an exception name"""
+        key = (method, endpoint_name(url), str(status))
+        with self.lock:
+            self.durations.setdefault(key, []).append(duration)
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def record_retry(self, method: str, url: str, reason: Any) -> None:
+        key = (method, endpoint_name(url), str(reason))
+        with self.lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def record_wait(self, kind: str, seconds: float) -> None:
+        """Record time spent sleeping: "backoff", "retry_after", "rate_limit" or "shared_rate_limit" """
+        with self.lock:
+            self.waits[kind] = self.waits.get(kind, 0.0) + seconds
+
+    def record_concurrency(self, limit: int, direction: Optional[str] = None) -> None:
+        """Record the adaptive concurrency limit; direction is "increase", "decrease" or None for the start"""
+        with self.lock:
+            self.concurrency_limit = limit
+            self.concurrency_min = limit if self.concurrency_min is None else min(self.concurrency_min, limit)
+            self.concurrency_max = limit if self.concurrency_max is None else max(self.concurrency_max, limit)
+            if direction:
+                self.concurrency_changes[direction] = self.concurrency_changes.get(direction, 0) + 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall-clock time of the block to a named phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def totals(self) -> Dict[str, Any]:
+        with self.lock:
+            all_durations = [d for durations in self.durations.values() for d in durations]
+            throttled = sum(len(d) for (_, _, status), d in self.durations.items() if status == '429')
+            return {
+                "requests": len(all_durations),
+                "throttled": throttled,
+                "retries": sum(self.retries.values()),
+                "wait_seconds": round(sum(self.waits.values()), 4),
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "request_seconds": round(sum(all_durations), 4),
+                "p50_seconds": round(_percentile(all_durations, 0.50), 4),
+                "p95_seconds": round(_percentile(all_durations, 0.95), 4),
+            }
+
+    def to_dict(self, labels: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """JSON-serializable snapshot"""
+        totals = self.totals()
+        with self.lock:
+            requests = [
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "status": status,
+                    "count": len(durations),
+                    "seconds": round(sum(durations), 4),
+                    "p50_seconds": round(_percentile(durations, 0.50), 4),
+                    "p95_seconds": round(_percentile(durations, 0.95), 4),
+                }
+                for (method, endpoint, status), durations in sorted(self.durations.items())
+            ]
+            retries = [
+                {"method": method, "endpoint": endpoint, "reason": reason, "count": count}
+                for (method, endpoint, reason), count in sorted(self.retries.items())
+            ]
+            concurrency = None
+            if self.concurrency_limit is not None:
+                concurrency = {
+                    "final": self.concurrency_limit,
+                    "min": self.concurrency_min,
+                    "max": self.concurrency_max,
+                    "increases": self.concurrency_changes.get("increase", 0),
+                    "decreases": self.concurrency_changes.get("decrease", 0),
+                }
+            return {
+                "labels": dict(labels or {}),
+                "started_at": self.started,
+                "duration_seconds": round(time.time() - self.started, 4),
+                "totals": totals,
+                "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+                "waits": {kind: round(seconds, 4) for kind, seconds in sorted(self.waits.items())},
+                "requests": requests,
+                "retries": retries,
+                "concurrency": concurrency,
+            }
+
+    def to_prometheus(self, labels: Optional[Dict[str, Any]] = None) -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        base = dict(labels or {})
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self.lock:
+            metric("dbtcloud_api_requests_total", "counter", "HTTP requests sent to the dbt Cloud API, including retries")
+            for (method, endpoint, status), durations in sorted(self.durations.items()):
+                request_labels = dict(base, method=method, endpoint=endpoint, status=status)
+                lines.append(f"dbtcloud_api_requests_total{_labels(request_labels)} {len(durations)}")
+
+            metric("dbtcloud_api_request_duration_seconds", "histogram", "dbt Cloud API request latency")
+            by_endpoint: Dict[Tuple[str, str], List[float]] = {}
+            for (method, endpoint, _), durations in self.durations.items():
+                by_endpoint.setdefault((method, endpoint), []).extend(durations)
+            for (method, endpoint), durations in sorted(by_endpoint.items()):
+                endpoint_labels = dict(base, method=method, endpoint=endpoint)
+                for bound in LATENCY_BUCKETS:
+                    count = sum(1 for d in durations if d <= bound)
+                    lines.append(f"dbtcloud_api_request_duration_seconds_bucket"
+                                 f"{_labels(dict(endpoint_labels, le=f'{bound:g}'))} {count}")
+                lines.append(f"dbtcloud_api_request_duration_seconds_bucket"
+                             f"{_labels(dict(endpoint_labels, le='+Inf'))} {len(durations)}")
+                lines.append(f"dbtcloud_api_request_duration_seconds_sum{_labels(endpoint_labels)} {sum(durations):.6f}")
+                lines.append(f"dbtcloud_api_request_duration_seconds_count{_labels(endpoint_labels)} {len(durations)}")
+
+            metric("dbtcloud_api_retries_total", "counter", "Retried dbt Cloud API requests by reason")
+            for (method, endpoint, reason), count in sorted(self.retries.items()):
+                lines.append(f"dbtcloud_api_retries_total{_labels(dict(base, method=method, endpoint=endpoint, reason=reason))} {count}")
+
+            metric("dbtcloud_api_wait_seconds_total", "counter", "Time spent waiting on backoff, Retry-After and rate limits")
+            for kind, seconds in sorted(self.waits.items()):
+                lines.append(f"dbtcloud_api_wait_seconds_total{_labels(dict(base, kind=kind))} {seconds:.6f}")
+
+            metric("dbtcloud_api_bytes_sent_total", "counter", "Request body bytes sent to the dbt Cloud API")
+            lines.append(f"dbtcloud_api_bytes_sent_total{_labels(base)} {self.bytes_sent}")
+            metric("dbtcloud_api_bytes_received_total", "counter", "Response body bytes received from the dbt Cloud API")
+            lines.append(f"dbtcloud_api_bytes_received_total{_labels(base)} {self.bytes_received}")
+
+            if self.concurrency_limit is not None:
+                metric("dbtcloud_api_concurrency_limit", "gauge", "Adaptive limit on in-flight requests at the end of the run")
+                lines.append(f"dbtcloud_api_concurrency_limit{_labels(base)} {self.concurrency_limit}")
+                metric("dbtcloud_api_concurrency_adjustments_total", "counter", "Adaptive concurrency limit changes by direction")
+                for direction in ("increase", "decrease"):
+                    lines.append(f"dbtcloud_api_concurrency_adjustments_total"
+                                 f"{_labels(dict(base, direction=direction))} {self.concurrency_changes.get(direction, 0)}")
+
+            metric("dbt_job_manager_phase_seconds", "gauge", "Wall-clock time of each command phase")
+            for name, seconds in self.phases.items():
+                lines.append(f"dbt_job_manager_phase_seconds{_labels(dict(base, phase=name))} {seconds:.6f}")
+
+        metric("dbt_job_manager_last_run_timestamp_seconds", "gauge", "When the command started")
+        lines.append(f"dbt_job_manager_last_run_timestamp_seconds{_labels(base)} {self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str, labels: Optional[Dict[str, Any]] = None) -> None:
+        _write_atomic(path, json.dumps(self.to_dict(labels), indent=2) + "\n")
+
+    def write_prometheus(self, path: str, labels: Optional[Dict[str, Any]] = None) -> None:
+        # The textfile collector may read at any moment, so never expose a partial file
+        _write_atomic(path, self.to_prometheus(labels))
+
+    def summary_lines(self) -> List[str]:
+        """Human-readable phase breakdown and API totals"""
+        totals = self.totals()
+        lines = []
+        with self.lock:
+            phases = list(self.phases.items())
+            concurrency = (self.concurrency_limit, self.concurrency_min, self.concurrency_max,
+                           self.concurrency_changes.get("increase", 0), self.concurrency_changes.get("decrease", 0))
+        if phases:
+            lines.append("   Phases: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases))
+        if totals['requests']:
+            lines.append(
+                f"   API: {totals['requests']} requests, {totals['retries']} retries "
+                f"({totals['throttled']} throttled), {totals['wait_seconds']:.2f}s waiting, "
+                f"p50 {totals['p50_seconds'] * 1000:.0f}ms / p95 {totals['p95_seconds'] * 1000:.0f}ms, "
+                f"{totals['bytes_sent'] / 1024:.1f} KiB sent / {totals['bytes_received'] / 1024:.1f} KiB received"
+            )
+        if concurrency[0] is not None:
+            lines.append(f"   Concurrency: {concurrency[0]} at the end (range {concurrency[1]}-{concurrency[2]}, "
+                         f"{concurrency[3]} increases, {concurrency[4]} decreases)")
+        return lines
+
+
+def _write_atomic(path: str, content: str) -> None:
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    # mkstemp creates the file private; exporters running as another user must read it
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
@@ -2,27 +2,34 @@
 # complete_import.py
 
 import os
-import json
+import argparse
 import subprocess
 import sys
 from pathlib import Path
 
+from discovery_store import DELTA_FILE, delta_snapshot, find_snapshot_note, load_records, mark_imported
+from terraform_imports import (IMPORT_BLOCKS_FILE, IMPORT_JOURNAL_FILE, ImportJournal, ImportTracker, StateIndex,
+                               batch_import, read_import_blocks, terraform_init, write_import_blocks)
+
 def safe_import(resource, resource_id):
-    """Safely import a resource, ignoring errors if already imported"""
+    """Import one resource; returns None on success, otherwise the error"""
     print(f"Importing {resource} with ID {resource_id}...")
     try:
         result = subprocess.run(
-            ["terraform", "import", resource, str(resource_id)],
+            ["terraform", "import", "-input=false", resource, str(resource_id)],
             capture_output=True,
             text=True,
             check=False
         )
-        if result.returncode == 0:
-            print(f"  ✅ Successfully imported {resource}")
-        else:
-            print(f"  ⚠️  Already imported or failed: {resource}")
     except Exception as e:
         print(f"  ❌ Error importing {resource}: {e}")
+        return str(e)
+    if result.returncode == 0:
+        print(f"  ✅ Successfully imported {resource}")
+        return None
+    # Resources already in the state were skipped up front, so this is a real failure
+    print(f"  ❌ Import failed: {resource}")
+    return result.stderr.strip() or f"terraform import exited with {result.returncode}"
 
 def clean_name(name):
     """Clean name for Terraform resource naming"""
@@ -33,7 +40,63 @@ def clean_name(name):
     cleaned = re.sub(r'[^a-z0-9_]', '', cleaned)
     return cleaned
 
+def finish_batch(args, tracker=None, imports=(), snapshot=None):
+    """Apply imports.tf in one Terraform run, recording the outcome of the imports it was written from"""
+    failed = batch_import(args.var_files, allow_changes=args.allow_changes, initialized=True) != 0
+    if tracker:
+        for resource, resource_id in imports:
+            tracker.record(resource, resource_id, "batch plan/apply failed" if failed else None)
+        tracker.report()
+    if failed:
+        return 1
+    if snapshot:
+        # The next --delta starts after what was just imported
+        mark_imported(*snapshot)
+    print("✅ Import process complete!")
+    print("📋 Next steps:")
+    print(f"1. Delete {IMPORT_BLOCKS_FILE}: the resources are in the Terraform state now")
+    print("2. Run 'terraform plan' and confirm it shows 'No changes'")
+    print("3. You're ready to manage your dbt Cloud infrastructure with Terraform!")
+    return 0
+
+def import_existing_blocks(args, tracker):
+    """Apply an existing imports.tf, minus the blocks of resources already in the state"""
+    try:
+        blocks, header = read_import_blocks(IMPORT_BLOCKS_FILE)
+    except ValueError as e:
+        print(f"❌ Error: {IMPORT_BLOCKS_FILE}: {e}")
+        return 1
+    snapshot = find_snapshot_note(header)
+    print(f"📄 Using {len(blocks)} import blocks from the existing {IMPORT_BLOCKS_FILE}")
+    
+    imports = [(resource, resource_id) for resource, resource_id in blocks if tracker.pending(resource, resource_id)]
+    if not imports:
+        tracker.report()
+        if snapshot:
+            mark_imported(*snapshot)
+        print(f"✅ Nothing to import: every block in {IMPORT_BLOCKS_FILE} is already managed")
+        return 0
+    if len(imports) < len(blocks):
+        note = f"{len(blocks) - len(imports)} blocks for resources already in the state removed by complete_import.py"
+        write_import_blocks(IMPORT_BLOCKS_FILE, imports, "\n".join(filter(None, [header, note])))
+        print(f"📝 Kept {len(imports)} import blocks in {IMPORT_BLOCKS_FILE}")
+    return finish_batch(args, tracker, imports, snapshot)
+
 def main():
+    parser = argparse.ArgumentParser(description='Import discovered dbt Cloud resources into Terraform')
+    parser.add_argument('--delta', action='store_true',
+                        help='Only import resources added since the last import (dbt_discovery/delta.json)')
+    parser.add_argument('--batch', action='store_true',
+                        help=f'Import everything with one plan/apply of Terraform 1.5 import blocks ({IMPORT_BLOCKS_FILE}) '
+                             f'instead of one terraform import per resource')
+    parser.add_argument('--var-file', action='append', dest='var_files', default=[],
+                        help='tfvars for the --batch plan, repeatable')
+    parser.add_argument('--allow-changes', action='store_true',
+                        help='With --batch, also apply changes the plan makes to imported resources')
+    parser.add_argument('--resume', action='store_true',
+                        help=f'Also skip resources {IMPORT_JOURNAL_FILE} records as imported by an interrupted run')
+    args = parser.parse_args()
+    
     print("🚀 Starting complete dbt Cloud import process...")
     
     # Verify environment variables
@@ -48,78 +111,108 @@ def main():
     if not discovery_dir.exists():
         print("❌ Error: Run discover_dbt_resources.py first")
         return 1
+    if args.delta and not (discovery_dir / DELTA_FILE).exists():
+        print(f"❌ Error: No {DELTA_FILE}; run discover_dbt_resources.py with the discovery store enabled first")
+        return 1
     
     # Initialize Terraform
-    print("🔧 Initializing Terraform...")
-    try:
-        subprocess.run(["terraform", "init"], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to initialize Terraform: {e}")
+    if not terraform_init():
         return 1
     
+    # Read the state once, so resources it already has are never attempted
+    tracker = ImportTracker(StateIndex.load(), ImportJournal(), resume=args.resume)
+    
+    if args.batch and Path(IMPORT_BLOCKS_FILE).exists():
+        # Written by generate_import_commands.py --format blocks, possibly reviewed since
+        return import_existing_blocks(args, tracker)
+    
+    # The discovery snapshot the delta baseline moves to once everything is imported
+    snapshot = delta_snapshot(discovery_dir)
+    imports = []
+    action = "Collecting" if args.batch else "Importing"
+    
+    def import_resource(resource, resource_id):
+        if not tracker.pending(resource, resource_id):
+            return
+        if args.batch:
+            # Collected into import blocks and applied together at the end
+            imports.append((resource, resource_id))
+        else:
+            tracker.record(resource, resource_id, safe_import(resource, resource_id))
+    
     # Import Projects
-    print("📁 Importing Projects...")
+    print(f"📁 {action} Projects...")
     try:
-        with open(discovery_dir / "projects.json", 'r') as f:
-            projects = json.load(f)
+        projects = load_records(discovery_dir, "projects", args.delta)
         
-        for project in projects.get('data', []):
+        for project in projects:
             resource_name = clean_name(project['name'])
-            safe_import(f"dbtcloud_project.{resource_name}", project['id'])
+            import_resource(f"dbtcloud_project.{resource_name}", project['id'])
     except FileNotFoundError:
         print("⚠️  No projects.json found")
     
     # Import Environments
-    print("🌍 Importing Environments...")
+    print(f"🌍 {action} Environments...")
     try:
-        with open(discovery_dir / "environments.json", 'r') as f:
-            environments = json.load(f)
+        environments = load_records(discovery_dir, "environments", args.delta)
         
-        for env in environments.get('data', []):
+        for env in environments:
             resource_name = clean_name(env['name'])
-            safe_import(f"dbtcloud_environment.{resource_name}", env['id'])
+            import_resource(f"dbtcloud_environment.{resource_name}", env['id'])
     except FileNotFoundError:
         print("⚠️  No environments.json found")
     
     # Import Connections
-    print("🔗 Importing Connections...")
+    print(f"🔗 {action} Connections...")
     try:
-        with open(discovery_dir / "connections.json", 'r') as f:
-            connections = json.load(f)
+        connections = load_records(discovery_dir, "connections", args.delta)
         
-        for conn in connections.get('data', []):
+        for conn in connections:
             resource_name = clean_name(conn['name'])
             conn_type = "snowflake_connection" if conn['type'] == 'snowflake' else "connection"
-            safe_import(f"dbtcloud_{conn_type}.{resource_name}", conn['id'])
+            import_resource(f"dbtcloud_{conn_type}.{resource_name}", conn['id'])
     except FileNotFoundError:
         print("⚠️  No connections.json found")
     
     # Import Users
-    print("👥 Importing Users...")
+    print(f"👥 {action} Users...")
     try:
-        with open(discovery_dir / "users.json", 'r') as f:
-            users = json.load(f)
+        users = load_records(discovery_dir, "users", args.delta)
         
-        for user in users.get('data', []):
+        for user in users:
             first_name = clean_name(user.get('first_name', 'user'))
             last_name = clean_name(user.get('last_name', 'name'))
             resource_name = f"{first_name}_{last_name}"
-            safe_import(f"dbtcloud_user.{resource_name}", user['id'])
+            import_resource(f"dbtcloud_user.{resource_name}", user['id'])
     except FileNotFoundError:
         print("⚠️  No users.json found")
     
     # Import Groups
-    print("🏢 Importing Groups...")
+    print(f"🏢 {action} Groups...")
     try:
-        with open(discovery_dir / "groups.json", 'r') as f:
-            groups = json.load(f)
+        groups = load_records(discovery_dir, "groups", args.delta)
         
-        for group in groups.get('data', []):
+        for group in groups:
             resource_name = clean_name(group['name'])
-            safe_import(f"dbtcloud_group.{resource_name}", group['id'])
+            import_resource(f"dbtcloud_group.{resource_name}", group['id'])
     except FileNotFoundError:
         print("⚠️  No groups.json found")
     
+    if args.batch:
+        if not imports:
+            tracker.report()
+            if snapshot:
+                mark_imported(*snapshot)
+            print("✅ Nothing to import: every discovered resource is already managed")
+            return 0
+        count = write_import_blocks(IMPORT_BLOCKS_FILE, imports, "Generated by complete_import.py --batch")
+        print(f"📝 Wrote {count} import blocks to {IMPORT_BLOCKS_FILE}")
+        return finish_batch(args, tracker, imports, snapshot)
+    
+    if tracker.report() != 0:
+        return 1
+    if snapshot:
+        mark_imported(*snapshot)
     print("✅ Import process complete!")
     print("📋 Next steps:")
     print("1. Run 'terraform plan' to see any configuration drift")
@@ -6,6 +6,8 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+from job_categories import load_engine
+
 def main():
     # Check for both analytics and marketing job discovery directories
     analytics_discovery_dir = Path("job_discovery")
@@ -39,6 +41,10 @@ def main():
             "jobs = ["
         ]
         
+        # Marketing jobs are labelled with the category discovery filed them under
+        engine = load_engine() if team_type == "marketing" else None
+        category_counts = {}
+        
         for job in production_jobs.get('data', []):
             # Clean job name (remove team prefix if present)
             job_name = job['name']
@@ -62,8 +68,13 @@ def main():
             threads = job.get('settings', {}).get('threads', 4)
             generate_docs = job.get('settings', {}).get('generate_docs', True)
             
+            tfvars_content.append("  {")
+            if engine:
+                category = engine.category(job['name'])
+                category_counts[category.name] = category_counts.get(category.name, 0) + 1
+                tfvars_content.append(f"    # Category: {category.label or category.name}")
+            
             tfvars_content.extend([
-                "  {",
                 f'    name          = "{job_name}"',
                 f'    description   = "{description}"',
                 f"    execute_steps = [{steps_str}]",
@@ -82,6 +93,9 @@ def main():
             f.write('\n'.join(tfvars_content))
         
         print(f"✅ Conversion complete! Check converted_{team_type}_jobs.tfvars")
+        for name, label in (engine.labels.items() if engine else []):
+            if category_counts.get(name):
+                print(f"{label or name}: {category_counts[name]}")
         print("")
         print("📝 Next steps:")
         print(f"1. Review converted_{team_type}_jobs.tfvars")
@@ -1,12 +1,140 @@
 #!/usr/bin/env python3
 # discover_dbt_resources.py
+#
+# Every resource type and every page of it is fetched at the same time, with at
+# most --concurrency requests in flight, and each resource is written to
+# dbt_discovery/ as soon as its last page arrives. A full-account discovery
+# therefore takes about as long as the slowest endpoint, not the sum of them.
+# A complete run is then snapshotted (see discovery_store.py) and the changes
+# since the previous run are written to dbt_discovery/delta.json.
 
 import os
 import json
-import requests
+import time
+import argparse
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
+from adaptive_concurrency import AIMDController
+from dbt_cloud_api import DBTCloudAPI
+from dbt_cloud_async import AsyncDBTCloudAPI
+from discovery_store import record_snapshot
+
+# Resource types to discover
+RESOURCES = {
+    "projects": "📁",
+    "environments": "🌍",
+    "connections": "🔗",
+    "users": "👥",
+    "groups": "🏢",
+    "repositories": "📚",
+}
+
+def write_resource(output_dir, resource, items, elapsed, pages=None):
+    """Save one resource type and report its count and timing"""
+    with open(output_dir / f"{resource}.json", 'w') as f:
+        json.dump({"data": items}, f, indent=2)
+    page_info = f", {pages} page{'s' if pages != 1 else ''}" if pages else ""
+    print(f"{RESOURCES[resource]} Found {len(items)} {resource} in {elapsed:.2f}s{page_info}")
+
+def discover_threaded(api, resources, concurrency, output_dir):
+    """Fetch every page of every resource type on one bounded thread pool
+
+    The first page of each type reports total_count, after which its remaining
+    pages are queued at once; without a total the pages are walked in order.
+    The main thread handles completions, so no worker ever waits on another.
+    Returns ({resource: records}, {resource: error}).
+    """
+    page_size = api.page_size
+    state = {
+        resource: {"pages": {}, "outstanding": 0, "total": None, "started": time.perf_counter()}
+        for resource in resources
+    }
+    results = {}
+    errors = {}
+    futures = {}
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        
+        def submit(resource, offset):
+            future = executor.submit(api.get_resource, resource, {"offset": offset, "limit": page_size})
+            futures[future] = (resource, offset)
+            state[resource]["outstanding"] += 1
+        
+        for resource in resources:
+            submit(resource, 0)
+        
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                resource, offset = futures.pop(future)
+                entry = state[resource]
+                entry["outstanding"] -= 1
+                if resource in errors:
+                    continue
+                try:
+                    body = future.result()
+                except Exception as e:
+                    # requests errors; the other resource types carry on
+                    errors[resource] = e
+                    print(f"❌ Error fetching {resource}: {e}")
+                    continue
+                
+                page = body.get('data') or []
+                entry["pages"][offset] = page
+                if offset == 0:
+                    entry["total"] = ((body.get('extra') or {}).get('pagination') or {}).get('total_count')
+                    # The server may cap the page size below what was requested
+                    if entry["total"] is not None and page:
+                        for next_offset in range(len(page), entry["total"], len(page)):
+                            submit(resource, next_offset)
+                if entry["total"] is None and len(page) >= page_size:
+                    submit(resource, offset + len(page))
+                
+                if entry["outstanding"] == 0:
+                    items = [item for _, page in sorted(entry["pages"].items()) for item in page]
+                    write_resource(output_dir, resource, items,
+                                   time.perf_counter() - entry["started"], len(entry["pages"]))
+                    results[resource] = items
+    return results, errors
+
+async def discover_async(account_id, token, host_url, resources, concurrency, output_dir, controller=None):
+    """Async counterpart of discover_threaded, writing each resource type as it completes"""
+    async with AsyncDBTCloudAPI(account_id, token, host_url, max_in_flight=concurrency,
+                                concurrency=controller) as api:
+        
+        async def fetch(resource):
+            started = time.perf_counter()
+            try:
+                data = await api.get_resource(resource)
+            except Exception as e:
+                # httpx errors; the other resource types carry on
+                return resource, e, time.perf_counter() - started
+            return resource, data['data'], time.perf_counter() - started
+        
+        results = {}
+        errors = {}
+        for next_done in asyncio.as_completed([fetch(resource) for resource in resources]):
+            resource, items, elapsed = await next_done
+            if isinstance(items, Exception):
+                errors[resource] = items
+                print(f"❌ Error fetching {resource}: {items}")
+            else:
+                write_resource(output_dir, resource, items, elapsed)
+                results[resource] = items
+    return results, errors
+
 def main():
+    parser = argparse.ArgumentParser(description='Discover dbt Cloud resources')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Use the asyncio client (requires httpx) instead of a thread pool')
+    parser.add_argument('--concurrency', type=int, default=20,
+                        help='Maximum requests in flight (default: 20)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Adapt requests in flight to 429s and latency, up to --concurrency')
+    args = parser.parse_args()
+    
     # Get environment variables
     account_id = os.getenv('DBTCLOUD_ACCOUNT_ID')
     token = os.getenv('DBTCLOUD_TOKEN')
@@ -16,46 +144,39 @@ def main():
         print("❌ Error: DBTCLOUD_ACCOUNT_ID and DBTCLOUD_TOKEN must be set")
         return 1
     
+    concurrency = max(1, args.concurrency)
     print("🔍 Discovering your dbt Cloud resources...")
     print(f"Account ID: {account_id}")
     print(f"Host: {host_url}")
+    print(f"Fetching {len(RESOURCES)} resource types, all pages at once "
+          f"(max {concurrency} requests in flight{', adaptive' if args.adaptive else ''})")
     print("")
     
-    base_url = f"{host_url}/api/v2/accounts/{account_id}"
-    headers = {"Authorization": f"Token {token}"}
-    
     # Create output directory
     output_dir = Path("dbt_discovery")
     output_dir.mkdir(exist_ok=True)
     
-    # Resource types to discover
-    resources = {
-        "projects": "📁 Getting Projects...",
-        "environments": "🌍 Getting Environments...",
-        "connections": "🔗 Getting Connections...",
-        "users": "👥 Getting Users...",
-        "groups": "🏢 Getting Groups...",
-        "repositories": "📚 Getting Repositories..."
-    }
-    
-    for resource, message in resources.items():
-        print(message)
+    controller = AIMDController(initial=min(4, concurrency), maximum=concurrency) if args.adaptive else None
+    started = time.perf_counter()
+    if args.use_async:
+        results, errors = asyncio.run(
+            discover_async(account_id, token, host_url, list(RESOURCES), concurrency, output_dir, controller)
+        )
+    else:
+        api = DBTCloudAPI(account_id, token, host_url, pool_size=concurrency, concurrency=controller)
         try:
-            response = requests.get(f"{base_url}/{resource}/", headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Save to file
-            with open(output_dir / f"{resource}.json", 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            count = len(data.get('data', []))
-            print(f"Found {count} {resource}")
-            
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching {resource}: {e}")
-        
-        print("")
+            results, errors = discover_threaded(api, list(RESOURCES), concurrency, output_dir)
+        finally:
+            api.close()
+    
+    print("")
+    print(f"⏱️  Discovery took {time.perf_counter() - started:.2f}s")
+    if errors:
+        # A partial snapshot would report the missing types as removed
+        print(f"❌ Failed to fetch: {', '.join(errors)} (no snapshot taken)")
+        return 1
+    
+    record_snapshot(output_dir, f"account-{account_id}", results)
     
     print("✅ Discovery complete! Check the dbt_discovery/ folder for details.")
     print("💡 Tip: Review these files to understand your current setup before importing.")
@@ -63,4 +184,4 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# discover_jobs.py
+#
+# Job discovery for any number of teams in one run. Each project's jobs are
+# fetched once, however many teams share the project, and every team's jobs are
+# classified in a single pass by its rule table in RULES: production jobs,
+# development/branch jobs and, for teams with categories, one file per
+# category (job_categories.json, shared with the import scripts). Each team's
+# files, snapshot and delta.json are the same as the single-team scripts write;
+# discover_team_jobs.py and discover_marketing_jobs.py are this script with one
+# team taken from the environment.
+#
+# Usage:
+#   python discover_jobs.py \
+#       --team name=analytics-team,project=101,rules=analytics,prod_env=301,staging_env=202 \
+#       --team name=marketing-team,project=102,rules=marketing,prod_env=311,staging_env=212
+
+import os
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from dbt_cloud_api import DBTCloudAPI
+from discovery_store import record_snapshot
+from job_categories import load_engine
+
+# Name keywords shared by every team's rules
+PRODUCTION_KEYWORDS = ('prod', 'production', 'staging')
+DEVELOPMENT_KEYWORDS = ('dev', 'branch', 'feature')
+
+class TeamRules:
+    """How one kind of team splits its project's jobs into discovery files"""
+    
+    def __init__(self, output_dir, all_file, production_file, development_file=None,
+                 engine=None, scope="{team}-jobs-{project}"):
+        self.output_dir = output_dir
+        self.all_file = all_file
+        self.production_file = production_file
+        # Development jobs are written only by teams that manage them through the API
+        self.development_file = development_file
+        # engine() -> CategoryEngine, called only once jobs are classified
+        self.engine = engine
+        self.scope = scope
+    
+    @property
+    def categorize(self):
+        """categorize(name) -> category, or None for teams without categories"""
+        return self.engine().categorize if self.engine else None
+    
+    @property
+    def categories(self):
+        """Each category's summary label (None: not shown)"""
+        return self.engine().labels if self.engine else {}
+
+# Per-team rule tables; a new kind of team is one more entry
+RULES = {
+    "analytics": TeamRules(
+        "job_discovery", "all_jobs", "production_jobs",
+        development_file="development_jobs",
+    ),
+    "marketing": TeamRules(
+        "marketing_job_discovery", "all_marketing_jobs", "production_marketing_jobs",
+        engine=load_engine,
+        scope="marketing-jobs-{project}",
+    ),
+}
+
+class Team:
+    """One team to discover: its project, environments and rules"""
+    
+    def __init__(self, name, project_id, rules, prod_env_id=None, staging_env_id=None, output_dir=None):
+        if rules not in RULES:
+            raise ValueError(f"unknown rules '{rules}' (known: {', '.join(RULES)})")
+        self.name = name
+        self.project_id = str(project_id)
+        self.rules = RULES[rules]
+        self.production_env_ids = {str(env_id) for env_id in (prod_env_id, staging_env_id) if env_id}
+        self.output_dir = Path(output_dir or self.rules.output_dir)
+    
+    @classmethod
+    def parse(cls, spec):
+        """Team from a --team spec: name=...,project=...,rules=...[,prod_env=...][,staging_env=...][,dir=...]"""
+        try:
+            fields = dict(item.split('=', 1) for item in spec.split(','))
+            return cls(fields.pop('name'), fields.pop('project'), fields.pop('rules', 'analytics'),
+                       fields.pop('prod_env', None), fields.pop('staging_env', None), fields.pop('dir', None),
+                       **fields)
+        except (KeyError, TypeError, ValueError) as e:
+            raise argparse.ArgumentTypeError(f"invalid team '{spec}': {e}")
+    
+    @classmethod
+    def from_env(cls, rules, default_name):
+        """The single team described by PROJECT_ID, TEAM_NAME and the environment ids"""
+        return cls(os.getenv('TEAM_NAME', default_name), os.getenv('PROJECT_ID'), rules,
+                   os.getenv('PROD_ENVIRONMENT_ID'), os.getenv('STAGING_ENVIRONMENT_ID'))
+    
+    @property
+    def scope(self):
+        return self.rules.scope.format(team=self.name, project=self.project_id)
+
+def classify(team, jobs):
+    """Split a project's jobs into the team's discovery files in one pass"""
+    rules = team.rules
+    outputs = {rules.all_file: jobs, rules.production_file: []}
+    if rules.development_file:
+        outputs[rules.development_file] = []
+    for category in rules.categories:
+        outputs[f"{category}_jobs"] = []
+    
+    categorize = rules.categorize
+    branch_prefix = f"{team.name}-"
+    for job in jobs:
+        name = job.get('name', '')
+        name_lower = name.lower()
+        if (str(job.get('environment_id')) in team.production_env_ids or
+                any(keyword in name_lower for keyword in PRODUCTION_KEYWORDS)):
+            outputs[rules.production_file].append(job)
+        elif rules.development_file and (
+                branch_prefix in name or any(keyword in name_lower for keyword in DEVELOPMENT_KEYWORDS)):
+            # Production was checked first, so no job lands in both files
+            outputs[rules.development_file].append(job)
+        if categorize:
+            outputs[f"{categorize(name)}_jobs"].append(job)
+    return outputs
+
+def fetch_projects(api, project_ids):
+    """Every job of each project, one listing per project however many teams share it
+
+    Returns ({project_id: jobs}, {project_id: error}).
+    """
+    project_ids = sorted(set(project_ids))
+    
+    def fetch(project_id):
+        try:
+            # Walk every page so large projects are not truncated
+            return project_id, api.list_jobs(project_id), None
+        except Exception as e:
+            # requests errors; the other projects carry on
+            return project_id, None, e
+    
+    jobs_by_project = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=min(8, len(project_ids))) as executor:
+        for project_id, jobs, error in executor.map(fetch, project_ids):
+            if error is not None:
+                print(f"❌ Error fetching jobs for project {project_id}: {error}")
+                errors[project_id] = error
+            else:
+                print(f"📋 Project {project_id}: {len(jobs)} jobs")
+                jobs_by_project[project_id] = jobs
+    return jobs_by_project, errors
+
+def write_team(team, outputs, all_jobs_json):
+    """Write a team's discovery files and snapshot, then summarize them"""
+    rules = team.rules
+    team.output_dir.mkdir(parents=True, exist_ok=True)
+    for stem, jobs in outputs.items():
+        # The full listing is serialized once per project and shared by its teams
+        content = all_jobs_json if stem == rules.all_file else json.dumps({"data": jobs}, indent=2)
+        with open(team.output_dir / f"{stem}.json", 'w') as f:
+            f.write(content)
+    
+    # Changes since the last run go to <output_dir>/delta.json
+    record_snapshot(team.output_dir, team.scope, outputs)
+    
+    print(f"📊 {team.name} (project {team.project_id}) → {team.output_dir}/")
+    print(f"Found {len(outputs[rules.all_file])} total jobs")
+    for category, label in rules.categories.items():
+        if label:
+            print(f"{label}: {len(outputs[f'{category}_jobs'])}")
+    if rules.engine:
+        print(f"🏭 Production Jobs (to import): {len(outputs[rules.production_file])}")
+    
+    print("Production Jobs (will import to Terraform):")
+    for job in outputs[rules.production_file]:
+        print(f"  - {job['name']} (ID: {job['id']}) - Env: {job.get('environment_id')}")
+    if rules.development_file:
+        print("Development Jobs (will manage via API, not imported):")
+        for job in outputs[rules.development_file]:
+            print(f"  - {job['name']} (ID: {job['id']}) - Env: {job.get('environment_id')}")
+    print("")
+
+def discover(teams, account_id, token, host_url):
+    """Fetch each team's project once and write every team's files; returns an exit code"""
+    # Category rules are compiled here, not at import, so a broken rules file only stops discovery
+    try:
+        for team in teams:
+            if team.rules.engine:
+                team.rules.engine()
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        print(f"❌ Error: Could not load the job categories: {e}")
+        return 1
+    
+    api = DBTCloudAPI(account_id, token, host_url)
+    try:
+        jobs_by_project, errors = fetch_projects(api, [team.project_id for team in teams])
+    finally:
+        api.close()
+    print("")
+    
+    all_jobs_json = {
+        project_id: json.dumps({"data": jobs}, indent=2) for project_id, jobs in jobs_by_project.items()
+    }
+    for team in teams:
+        if team.project_id in errors:
+            print(f"⚠️  Skipping {team.name}: project {team.project_id} could not be listed")
+            continue
+        write_team(team, classify(team, jobs_by_project[team.project_id]), all_jobs_json[team.project_id])
+    
+    if errors:
+        return 1
+    print(f"✅ Discovery complete for {len(teams)} team{'s' if len(teams) != 1 else ''}!")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Discover the jobs of one or more teams in a single run')
+    parser.add_argument('--team', action='append', dest='teams', type=Team.parse, default=[],
+                        help='name=...,project=...,rules=analytics|marketing[,prod_env=...][,staging_env=...][,dir=...]; '
+                             'repeatable (default: one team from TEAM_NAME, PROJECT_ID and the environment ids)')
+    parser.add_argument('--rules', choices=sorted(RULES), default='analytics',
+                        help='Rules for the team taken from the environment when no --team is given')
+    args = parser.parse_args()
+    
+    # Get environment variables
+    account_id = os.getenv('DBTCLOUD_ACCOUNT_ID')
+    token = os.getenv('DBTCLOUD_TOKEN')
+    host_url = os.getenv('DBTCLOUD_HOST_URL', 'https://cloud.getdbt.com')
+    
+    if not args.teams and not os.getenv('PROJECT_ID'):
+        print("❌ Error: Pass --team, or set PROJECT_ID")
+        return 1
+    if not account_id or not token:
+        print("❌ Error: DBTCLOUD_ACCOUNT_ID and DBTCLOUD_TOKEN must be set")
+        return 1
+    
+    teams = args.teams or [Team.from_env(args.rules, f"{args.rules}-team")]
+    output_dirs = [team.output_dir.resolve() for team in teams]
+    if len(set(output_dirs)) != len(output_dirs):
+        print("❌ Error: Teams with the same rules need their own dir=... output folder")
+        return 1
+    
+    print(f"🔍 Discovering jobs for {', '.join(team.name for team in teams)}...")
+    return discover(teams, account_id, token, host_url)
+
+if __name__ == "__main__":
+    exit(main())
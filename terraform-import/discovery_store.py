@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store of discovery snapshots
+
+Each discovery run commits its records to a store shared by every run:
+records are saved once under the SHA-256 of their canonical JSON, so an
+unchanged project, environment or job costs nothing on the next run. A
+snapshot is a small manifest mapping resource type -> record id -> digest,
+and consecutive snapshots of the same scope (an account's resources, a
+project's jobs) are compared digest by digest without loading any record.
+
+The comparison is written next to the discovery output as delta.json:
+records added since the last imported snapshot in full, changed records as
+only their changed fields, and removed records by id and name. The generate
+and import scripts take --delta to work from it instead of the whole account.
+The imported pointer only moves once an import of a snapshot succeeds
+(mark_imported), so discovering twice before importing loses nothing: the
+second delta still carries the first run's additions.
+
+Fields that change without any configuration change (next run times, last
+login) are dropped before hashing, so they do not show up as changes.
+
+Usage:
+    delta = record_snapshot(output_dir, f"account-{account_id}", {"projects": projects, ...})
+    projects = load_records(output_dir, "projects", delta=True)
+    ...  # import them
+    mark_imported(*delta_snapshot(output_dir))
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Store location; DBT_DISCOVERY_STORE="" turns snapshots off
+DEFAULT_STORE_DIR = ".discovery-store"
+DELTA_FILE = "delta.json"
+
+# Fields that change on their own and would make every run look like a change
+VOLATILE_FIELDS = frozenset({
+    'next_run', 'next_run_humanized', 'last_login', 'most_recent_run', 'most_recent_completed_run',
+})
+
+# Comment line generated import files carry, so the import can advance the baseline
+SNAPSHOT_NOTE = "Discovery snapshot:"
+
+_SCOPE_RE = re.compile(r'[^A-Za-z0-9_.-]+')
+_SNAPSHOT_NOTE_RE = re.compile(rf'^(?:#\s*)?{SNAPSHOT_NOTE}\s+([0-9a-f]+)\s+of\s+(.+?)\s*$', re.MULTILINE)
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def stable_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in record.items() if key not in VOLATILE_FIELDS}
+
+
+def record_key(record: Dict[str, Any], digest: str) -> str:
+    """Records are matched across snapshots by id; anything without one only by content"""
+    return str(record['id']) if record.get('id') is not None else f"sha256:{digest}"
+
+
+class DiscoveryStore:
+    """Deduplicated records plus one manifest per snapshot"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.refs_dir = self.root / "refs"
+        self.imported_dir = self.root / "imported"
+        self.written = 0
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest[2:]}.json"
+
+    def put(self, record: Dict[str, Any]) -> str:
+        """Save a record unless an identical one is already stored; returns its digest"""
+        content = _canonical(record)
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            _write_atomic(path, content)
+            self.written += 1
+        return digest
+
+    def get(self, digest: str) -> Dict[str, Any]:
+        with open(self._object_path(digest), 'r') as f:
+            return json.load(f)
+
+    def _read_ref(self, ref: Path) -> Optional[Dict[str, Any]]:
+        try:
+            snapshot_id = ref.read_text().strip()
+            with open(self.snapshots_dir / f"{snapshot_id}.json", 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def latest(self, scope: str) -> Optional[Dict[str, Any]]:
+        """Most recent manifest of a scope, or None before its first snapshot"""
+        return self._read_ref(self.refs_dir / _SCOPE_RE.sub('_', scope))
+
+    def imported(self, scope: str) -> Optional[Dict[str, Any]]:
+        """Manifest of the scope's last imported snapshot, or None before its first import"""
+        return self._read_ref(self.imported_dir / _SCOPE_RE.sub('_', scope))
+
+    def mark_imported(self, scope: str, snapshot_id: str) -> bool:
+        """Make a stored snapshot the scope's imported baseline; False if it is not in the store"""
+        if not (self.snapshots_dir / f"{snapshot_id}.json").exists():
+            return False
+        _write_atomic(self.imported_dir / _SCOPE_RE.sub('_', scope), snapshot_id + "\n")
+        return True
+
+    def commit(self, scope: str, resources: Dict[str, List[Dict[str, Any]]]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Store a discovery run and return (manifest, previous manifest)
+
+        A run identical to the previous snapshot reuses that snapshot's id.
+        """
+        entries = {}
+        for resource, records in resources.items():
+            entries[resource] = {}
+            for record in records:
+                record = stable_record(record)
+                digest = self.put(record)
+                entries[resource][record_key(record, digest)] = digest
+
+        previous = self.latest(scope)
+        snapshot_id = hashlib.sha256(_canonical(entries).encode('utf-8')).hexdigest()
+        if previous and previous['id'] == snapshot_id:
+            return previous, previous
+
+        manifest = {
+            "id": snapshot_id,
+            "scope": scope,
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "parent": previous['id'] if previous else None,
+            "resources": entries,
+        }
+        _write_atomic(self.snapshots_dir / f"{snapshot_id}.json", json.dumps(manifest, indent=1))
+        # The ref moves last, so an interrupted run leaves the previous snapshot current
+        _write_atomic(self.refs_dir / _SCOPE_RE.sub('_', scope), snapshot_id + "\n")
+        return manifest, previous
+
+    def diff(self, previous: Optional[Dict[str, Any]], manifest: Dict[str, Any]) -> Dict[str, Dict[str, List[Any]]]:
+        """Added records in full, changed records as their changed fields, removed records by id and name"""
+        old_resources = previous['resources'] if previous else {}
+        delta = {}
+        for resource in sorted(set(manifest['resources']) | set(old_resources)):
+            new = manifest['resources'].get(resource, {})
+            old = old_resources.get(resource, {})
+            added, changed, removed = [], [], []
+            for key, digest in new.items():
+                if key not in old:
+                    added.append(self.get(digest))
+                elif old[key] != digest:
+                    before, after = self.get(old[key]), self.get(digest)
+                    fields = {field: after.get(field) for field in set(before) | set(after)
+                              if before.get(field) != after.get(field)}
+                    changed.append({"id": after.get('id'), "name": after.get('name'), "fields": fields})
+            for key, digest in old.items():
+                if key not in new:
+                    record = self.get(digest)
+                    removed.append({"id": record.get('id'), "name": record.get('name')})
+            delta[resource] = {"added": added, "changed": changed, "removed": removed}
+        return delta
+
+
+def _store_dir(store_dir: Optional[str]) -> str:
+    return os.getenv('DBT_DISCOVERY_STORE', DEFAULT_STORE_DIR) if store_dir is None else store_dir
+
+
+def record_snapshot(output_dir: Path, scope: str, resources: Dict[str, List[Dict[str, Any]]],
+                    store_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Commit a discovery run, write output_dir/delta.json and print a per-resource summary
+
+    The delta is taken against the last imported snapshot, not the previous
+    discovery run, so records stay in it until an import has consumed them.
+    """
+    store_dir = _store_dir(store_dir)
+    if not store_dir:
+        # A delta left by an earlier run would no longer match the discovery files
+        (Path(output_dir) / DELTA_FILE).unlink(missing_ok=True)
+        return None
+
+    store = DiscoveryStore(store_dir)
+    manifest, previous = store.commit(scope, resources)
+    base = store.imported(scope)
+    delta = {
+        "scope": scope,
+        # Equal to snapshot when everything is imported; None before the first import, when every record is added
+        "base": base['id'] if base else None,
+        "snapshot": manifest['id'],
+        "resources": store.diff(base, manifest),
+    }
+    _write_atomic(Path(output_dir) / DELTA_FILE, json.dumps(delta, indent=2, default=str) + "\n")
+
+    if previous is None:
+        print(f"📦 First snapshot of {scope} ({store.written} records stored)")
+    elif previous['id'] == manifest['id']:
+        print(f"📦 No changes in {scope} since snapshot {manifest['id'][:12]}")
+    else:
+        print(f"📦 Snapshot {manifest['id'][:12]} of {scope} "
+              f"({store.written} new records stored, previous {previous['id'][:12]})")
+
+    if base is None:
+        if previous is not None:
+            print(f"   Nothing imported from {scope} yet; {DELTA_FILE} lists every record")
+        return delta
+    if base['id'] == manifest['id']:
+        return delta
+    print(f"   Since the last import (snapshot {base['id'][:12]}):")
+    for resource, changes in delta['resources'].items():
+        if any(changes.values()):
+            print(f"     {resource}: +{len(changes['added'])} added, ~{len(changes['changed'])} changed, "
+                  f"-{len(changes['removed'])} removed")
+    return delta
+
+
+def mark_imported(scope: str, snapshot_id: str, store_dir: Optional[str] = None) -> bool:
+    """Record that a snapshot was imported, so later deltas start from it
+
+    Call only after the import succeeded. Returns False when the store is off
+    or does not have the snapshot.
+    """
+    store_dir = _store_dir(store_dir)
+    if not store_dir:
+        return False
+    if not DiscoveryStore(store_dir).mark_imported(scope, snapshot_id):
+        print(f"⚠️  Snapshot {snapshot_id[:12]} of {scope} is not in {store_dir}; the delta baseline stays")
+        return False
+    print(f"📦 Snapshot {snapshot_id[:12]} of {scope} imported; the next delta starts from it")
+    return True
+
+
+def delta_snapshot(discovery_dir: Path) -> Optional[Tuple[str, str]]:
+    """(scope, snapshot id) of the discovery files, None when discovery ran without a store"""
+    try:
+        delta = load_delta(discovery_dir)
+    except (OSError, ValueError):
+        return None
+    return delta['scope'], delta['snapshot']
+
+
+def snapshot_note(snapshot: Optional[Tuple[str, str]]) -> Optional[str]:
+    """Comment text naming the snapshot a generated import file was written from"""
+    if snapshot is None:
+        return None
+    scope, snapshot_id = snapshot
+    return f"{SNAPSHOT_NOTE} {snapshot_id} of {scope}"
+
+
+def find_snapshot_note(text: str) -> Optional[Tuple[str, str]]:
+    """(scope, snapshot id) from the note in a generated import file, if it has one"""
+    match = _SNAPSHOT_NOTE_RE.search(text)
+    return (match.group(2), match.group(1)) if match else None
+
+
+def load_delta(discovery_dir: Path) -> Dict[str, Any]:
+    """Read delta.json; raises FileNotFoundError when discovery ran without a store"""
+    with open(Path(discovery_dir) / DELTA_FILE, 'r') as f:
+        return json.load(f)
+
+
+def load_records(discovery_dir: Path, resource: str, delta: bool = False) -> List[Dict[str, Any]]:
+    """Records of one resource type: the full discovery file, or with delta only those added since the last import"""
+    if delta:
+        return load_delta(discovery_dir)['resources'].get(resource, {}).get('added', [])
+    with open(Path(discovery_dir) / f"{resource}.json", 'r') as f:
+        return json.load(f).get('data', [])
@@ -1,54 +1,104 @@
 #!/usr/bin/env python3
 # execute_job_imports.py
 
+import argparse
 import subprocess
 import sys
 from pathlib import Path
 
-def safe_import(import_command):
-    """Safely execute a terraform import command"""
-    print(f"Executing: {import_command}")
+from discovery_store import find_snapshot_note, mark_imported
+from terraform_imports import (IMPORT_JOURNAL_FILE, ImportJournal, ImportTracker, StateIndex, batch_import,
+                               parse_import_command, read_import_blocks, terraform_init, write_import_blocks)
+
+def safe_import(address, job_id):
+    """Import one job; returns None on success, otherwise the error"""
+    print(f"Importing {address} (ID {job_id})...")
     try:
+        # The address goes to terraform as one argument, so the quotes in its key need no escaping
         result = subprocess.run(
-            import_command.split(),
+            ["terraform", "import", "-input=false", address, str(job_id)],
             capture_output=True,
             text=True,
             check=False
         )
-        if result.returncode == 0:
-            print("  ✅ Import successful")
-        else:
-            print("  ⚠️  Import failed or resource already imported")
-            if result.stderr:
-                print(f"     Error: {result.stderr.strip()}")
     except Exception as e:
         print(f"  ❌ Error executing import: {e}")
+        print("")
+        return str(e)
+    if result.returncode == 0:
+        print("  ✅ Import successful")
+        print("")
+        return None
+    # Jobs already in the state were skipped up front, so this is a real failure
+    error = result.stderr.strip() or f"terraform import exited with {result.returncode}"
+    print("  ❌ Import failed")
+    print(f"     Error: {error}")
+    print("")
+    return error
+
+def print_batch_next_steps(blocks_file):
     print("")
+    print("📋 Next steps:")
+    print(f"1. Delete {blocks_file}: the jobs are in the Terraform state now")
+    print("2. Run 'terraform plan' and confirm it shows 'No changes'")
+    print("3. Your jobs are now managed by Terraform!")
 
 def main():
+    parser = argparse.ArgumentParser(description='Import production jobs into Terraform')
+    parser.add_argument('--batch', action='store_true',
+                        help='Import all jobs with one plan/apply of Terraform 1.5 import blocks '
+                             'instead of one terraform import per job')
+    parser.add_argument('--var-file', action='append', dest='var_files',
+                        help='tfvars for the plan, repeatable (default: env_file/prod_env.tfvars)')
+    parser.add_argument('--allow-changes', action='store_true',
+                        help='With --batch, also apply changes the plan makes to imported jobs')
+    parser.add_argument('--resume', action='store_true',
+                        help=f'Also skip jobs {IMPORT_JOURNAL_FILE} records as imported by an interrupted run')
+    args = parser.parse_args()
+    var_files = args.var_files or ["env_file/prod_env.tfvars"]
+    
     # Check for different import command files
     marketing_commands = Path("marketing_import_commands.txt")
     analytics_commands = Path("job_import_commands.txt")
+    marketing_blocks = Path("marketing_imports.tf")
+    analytics_blocks = Path("job_imports.tf")
     
-    if marketing_commands.exists():
+    if marketing_commands.exists() or marketing_blocks.exists():
         commands_file = marketing_commands
+        blocks_file = marketing_blocks
         team_type = "marketing"
-    elif analytics_commands.exists():
+    elif analytics_commands.exists() or analytics_blocks.exists():
         commands_file = analytics_commands
+        blocks_file = analytics_blocks
         team_type = "analytics"
     else:
         print("❌ Error: Run generate_job_import_commands.py first")
         return 1
     
+    if not args.batch and not commands_file.exists():
+        print(f"❌ Error: Only {blocks_file} was generated; run with --batch to apply it")
+        return 1
+    
     print(f"🚀 Starting {team_type} job import process...")
     print("⚠️  This will import your existing production jobs into Terraform management.")
     print("")
     
-    # Read import commands
-    with open(commands_file, 'r') as f:
-        import_commands = [line.strip() for line in f if line.strip()]
-    
-    print(f"Found {len(import_commands)} jobs to import")
+    # Written by generate_job_import_commands.py --format blocks, possibly reviewed since
+    from_blocks = args.batch and blocks_file.exists()
+    if from_blocks:
+        try:
+            imports, header = read_import_blocks(blocks_file)
+        except ValueError as e:
+            print(f"❌ Error: {blocks_file}: {e}")
+            return 1
+        print(f"Found {len(imports)} jobs to import in {blocks_file}")
+    else:
+        # Only the comment lines matter for the snapshot note
+        header = commands_file.read_text()
+        imports = [parsed for parsed in map(parse_import_command, header.splitlines()) if parsed]
+        print(f"Found {len(imports)} jobs to import")
+    # Discovery snapshot the generator noted in the file; the delta baseline moves to it on success
+    snapshot = find_snapshot_note(header)
     
     # Confirm with user
     confirm = input("Are you sure you want to proceed? (yes/no): ")
@@ -56,10 +106,46 @@ def main():
         print("❌ Import cancelled.")
         return 0
     
-    # Execute each import command
-    print("\n📥 Executing import commands...")
-    for import_cmd in import_commands:
-        safe_import(import_cmd)
+    print("")
+    if not terraform_init():
+        return 1
+    
+    # Read the state once, so jobs it already has are never attempted
+    tracker = ImportTracker(StateIndex.load(), ImportJournal(), resume=args.resume)
+    pending = [(address, job_id) for address, job_id in imports if tracker.pending(address, job_id)]
+    if not pending:
+        tracker.report()
+        if snapshot:
+            mark_imported(*snapshot)
+        print("✅ Nothing to import: every job is already managed")
+        return 0
+    
+    if args.batch:
+        if not from_blocks:
+            write_import_blocks(blocks_file, pending, f"Written from {commands_file} by execute_job_imports.py --batch")
+            print(f"📝 Wrote {len(pending)} import blocks to {blocks_file}")
+        elif len(pending) < len(imports):
+            note = f"{len(imports) - len(pending)} blocks for jobs already in the state removed by execute_job_imports.py"
+            write_import_blocks(blocks_file, pending, "\n".join(filter(None, [header, note])))
+            print(f"📝 Kept {len(pending)} import blocks in {blocks_file}")
+        failed = batch_import(var_files, allow_changes=args.allow_changes, initialized=True) != 0
+        for address, job_id in pending:
+            tracker.record(address, job_id, "batch plan/apply failed" if failed else None)
+        status = tracker.report()
+        if failed:
+            return 1
+        if snapshot and status == 0:
+            mark_imported(*snapshot)
+        print_batch_next_steps(blocks_file)
+        return status
+    
+    # Execute each missing import
+    print(f"\n📥 Importing {len(pending)} jobs...")
+    for address, job_id in pending:
+        tracker.record(address, job_id, safe_import(address, job_id))
+    status = tracker.report()
+    if snapshot and status == 0:
+        mark_imported(*snapshot)
     
     print("✅ Import process complete!")
     print("")
@@ -68,7 +154,7 @@ def main():
     # Run terraform plan to verify
     try:
         result = subprocess.run(
-            ["terraform", "plan", "-var-file=env_file/prod_env.tfvars"],
+            ["terraform", "plan"] + [f"-var-file={path}" for path in var_files],
             check=False
         )
     except Exception as e:
@@ -81,7 +167,7 @@ def main():
     print("3. Run 'terraform plan' again until it shows 'No changes'")
     print("4. Your jobs are now managed by Terraform!")
     
-    return 0
+    return status
 
 if __name__ == "__main__":
     exit(main())
\ No newline at end of file
@@ -2,11 +2,13 @@
 # generate_import_commands.py
 
 import os
-import json
-import requests
 import re
+import argparse
 from pathlib import Path
 
+from discovery_store import DELTA_FILE, delta_snapshot, load_delta, load_records, snapshot_note
+from terraform_imports import IMPORT_BLOCKS_FILE, write_import_blocks
+
 def clean_name(name):
     """Clean name for Terraform resource naming"""
     # Replace spaces and hyphens with underscores, convert to lowercase
@@ -16,6 +18,14 @@ def clean_name(name):
     return cleaned
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate Terraform import commands from dbt_discovery/')
+    parser.add_argument('--delta', action='store_true',
+                        help='Only resources added since the last import (dbt_discovery/delta.json)')
+    parser.add_argument('--format', choices=['commands', 'blocks'], default='commands',
+                        help=f'terraform import commands (import_commands.txt) or Terraform 1.5 '
+                             f'import blocks ({IMPORT_BLOCKS_FILE}) for a single plan/apply (default: commands)')
+    args = parser.parse_args()
+    
     # Get environment variables
     account_id = os.getenv('DBTCLOUD_ACCOUNT_ID')
     token = os.getenv('DBTCLOUD_TOKEN')
@@ -31,18 +41,34 @@ def main():
     base_url = f"{host_url}/api/v2/accounts/{account_id}"
     headers = {"Authorization": f"Token {token}"}
     discovery_dir = Path("dbt_discovery")
+    if args.delta and not (discovery_dir / DELTA_FILE).exists():
+        print(f"❌ Error: No {DELTA_FILE}; run discover_dbt_resources.py with the discovery store enabled first")
+        return 1
     
     commands = []
+    imports = []
+    
+    def add_import(address, resource_id):
+        commands.append(f"terraform import {address} {resource_id}")
+        imports.append((address, resource_id))
+    
+    # Lets the import move the delta baseline to the snapshot these imports came from
+    note = snapshot_note(delta_snapshot(discovery_dir))
+    if note:
+        commands.append(f"# {note}")
+    if args.delta:
+        commands.append(f"# Resources added since the last import ({DELTA_FILE})")
+    if note or args.delta:
+        commands.append("")
     
     # Generate project imports
     commands.append("# ===== PROJECT IMPORTS =====")
     try:
-        with open(discovery_dir / "projects.json", 'r') as f:
-            projects = json.load(f)
+        projects = load_records(discovery_dir, "projects", args.delta)
         
-        for project in projects.get('data', []):
+        for project in projects:
             resource_name = clean_name(project['name'])
-            commands.append(f"terraform import dbtcloud_project.{resource_name} {project['id']}")
+            add_import(f"dbtcloud_project.{resource_name}", project['id'])
     except FileNotFoundError:
         print("Warning: No projects.json found")
     
@@ -51,12 +77,11 @@ def main():
     # Generate environment imports
     commands.append("# ===== ENVIRONMENT IMPORTS =====")
     try:
-        with open(discovery_dir / "environments.json", 'r') as f:
-            environments = json.load(f)
+        environments = load_records(discovery_dir, "environments", args.delta)
         
-        for env in environments.get('data', []):
+        for env in environments:
             resource_name = clean_name(env['name'])
-            commands.append(f"terraform import dbtcloud_environment.{resource_name} {env['id']}")
+            add_import(f"dbtcloud_environment.{resource_name}", env['id'])
     except FileNotFoundError:
         print("Warning: No environments.json found")
     
@@ -65,13 +90,12 @@ def main():
     # Generate connection imports
     commands.append("# ===== CONNECTION IMPORTS =====")
     try:
-        with open(discovery_dir / "connections.json", 'r') as f:
-            connections = json.load(f)
+        connections = load_records(discovery_dir, "connections", args.delta)
         
-        for conn in connections.get('data', []):
+        for conn in connections:
             resource_name = clean_name(conn['name'])
             conn_type = "snowflake_connection" if conn['type'] == 'snowflake' else "connection"
-            commands.append(f"terraform import dbtcloud_{conn_type}.{resource_name} {conn['id']}")
+            add_import(f"dbtcloud_{conn_type}.{resource_name}", conn['id'])
     except FileNotFoundError:
         print("Warning: No connections.json found")
     
@@ -80,14 +104,13 @@ def main():
     # Generate user imports
     commands.append("# ===== USER IMPORTS =====")
     try:
-        with open(discovery_dir / "users.json", 'r') as f:
-            users = json.load(f)
+        users = load_records(discovery_dir, "users", args.delta)
         
-        for user in users.get('data', []):
+        for user in users:
             first_name = clean_name(user.get('first_name', 'user'))
             last_name = clean_name(user.get('last_name', 'name'))
             resource_name = f"{first_name}_{last_name}"
-            commands.append(f"terraform import dbtcloud_user.{resource_name} {user['id']}")
+            add_import(f"dbtcloud_user.{resource_name}", user['id'])
     except FileNotFoundError:
         print("Warning: No users.json found")
     
@@ -96,12 +119,11 @@ def main():
     # Generate group imports
     commands.append("# ===== GROUP IMPORTS =====")
     try:
-        with open(discovery_dir / "groups.json", 'r') as f:
-            groups = json.load(f)
+        groups = load_records(discovery_dir, "groups", args.delta)
         
-        for group in groups.get('data', []):
+        for group in groups:
             resource_name = clean_name(group['name'])
-            commands.append(f"terraform import dbtcloud_group.{resource_name} {group['id']}")
+            add_import(f"dbtcloud_group.{resource_name}", group['id'])
     except FileNotFoundError:
         print("Warning: No groups.json found")
     
@@ -110,10 +132,9 @@ def main():
     # Generate repository imports
     commands.append("# ===== REPOSITORY IMPORTS =====")
     try:
-        with open(discovery_dir / "repositories.json", 'r') as f:
-            repositories = json.load(f)
+        repositories = load_records(discovery_dir, "repositories", args.delta)
         
-        for repo in repositories.get('data', []):
+        for repo in repositories:
             # Extract repo name from URL
             remote_url = repo.get('remote_url', '')
             if remote_url:
@@ -121,17 +142,39 @@ def main():
                 resource_name = clean_name(repo_name)
             else:
                 resource_name = f"repo_{repo['id']}"
-            commands.append(f"terraform import dbtcloud_repository.{resource_name} {repo['id']}")
+            add_import(f"dbtcloud_repository.{resource_name}", repo['id'])
     except FileNotFoundError:
         print("Warning: No repositories.json found")
     
+    if args.delta:
+        # Already-imported resources that are gone need `terraform state rm`; list them for review
+        removed = [
+            f"# {resource}: {record.get('name') or ''} (ID: {record['id']})"
+            for resource, changes in load_delta(discovery_dir)['resources'].items()
+            for record in changes['removed']
+        ]
+        if removed:
+            commands.append("")
+            commands.append("# ===== REMOVED SINCE LAST IMPORT =====")
+            commands.extend(removed)
+    
+    if args.format == 'blocks':
+        # The per-type headers mean nothing without the commands; keep the delta notes
+        notes = [line[2:] for line in commands if line.startswith("# ") and not line.endswith("IMPORTS =====")]
+        header = "\n".join(["Generated by generate_import_commands.py; apply with complete_import.py --batch"] + notes)
+        write_import_blocks(IMPORT_BLOCKS_FILE, imports, header)
+        print("✅ Import blocks generated!")
+        print(f"📁 Saved to: {IMPORT_BLOCKS_FILE}")
+        print(f"📊 Generated {len(imports)} import blocks")
+        return 0
+    
     # Save commands to file
     with open("import_commands.txt", 'w') as f:
         f.write('\n'.join(commands))
     
     print("✅ Import commands generated!")
     print(f"📁 Saved to: import_commands.txt")
-    print(f"📊 Generated {len([c for c in commands if c.startswith('terraform')])} import commands")
+    print(f"📊 Generated {len(imports)} import commands")
     
     return 0
 
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 # generate_job_import_commands.py
 
-import json
+import argparse
 import os
 import re
 from pathlib import Path
 
+from discovery_store import DELTA_FILE, delta_snapshot, load_records, snapshot_note
+from job_categories import load_engine
+from terraform_imports import write_import_blocks
+
 def clean_terraform_name(name, team_name):
     """Clean job name for Terraform resource naming"""
     # Remove team prefix if present
@@ -24,23 +28,18 @@ def clean_terraform_name(name, team_name):
     return cleaned
 
 def get_marketing_category_prefix(job_name):
-    """Get category prefix for marketing job organization"""
-    name_lower = job_name.lower()
-    
-    if 'attribution' in name_lower:
-        return 'attribution_'
-    elif 'campaign' in name_lower:
-        return 'campaign_'
-    elif any(keyword in name_lower for keyword in ['ltv', 'customer']):
-        return 'customer_'
-    elif any(keyword in name_lower for keyword in ['executive', 'dashboard']):
-        return 'executive_'
-    elif any(keyword in name_lower for keyword in ['platform', 'ads']):
-        return 'platform_'
-    else:
-        return ''
+    """Get category prefix for marketing job organization (see job_categories.json)"""
+    return load_engine().category(job_name).prefix
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate Terraform import commands for production jobs')
+    parser.add_argument('--delta', action='store_true',
+                        help='Only jobs added since the last import (delta.json in the discovery folder)')
+    parser.add_argument('--format', choices=['commands', 'blocks'], default='commands',
+                        help='terraform import commands (*_import_commands.txt) or Terraform 1.5 import '
+                             'blocks (*_imports.tf) for a single plan/apply (default: commands)')
+    args = parser.parse_args()
+    
     # Check for both analytics and marketing job discovery directories
     analytics_discovery_dir = Path("job_discovery")
     marketing_discovery_dir = Path("marketing_job_discovery")
@@ -52,26 +51,33 @@ def main():
         production_file = "production_marketing_jobs.json"
         team_type = "marketing"
         output_file = "marketing_import_commands.txt"
+        blocks_file = "marketing_imports.tf"
         use_category_prefix = True
     elif analytics_discovery_dir.exists():
         discovery_dir = analytics_discovery_dir
         production_file = "production_jobs.json"
         team_type = "analytics"
         output_file = "job_import_commands.txt"
+        blocks_file = "job_imports.tf"
         use_category_prefix = False
     else:
         print("❌ Error: Run discover_team_jobs.py or discover_marketing_jobs.py first")
         return 1
     
-    print(f"🔧 Generating Terraform import commands for {team_type} production jobs...")
+    if args.delta and not (discovery_dir / DELTA_FILE).exists():
+        print(f"❌ Error: No {discovery_dir}/{DELTA_FILE}; run discovery with the discovery store enabled first")
+        return 1
+    
+    scope = "new " if args.delta else ""
+    print(f"🔧 Generating Terraform import commands for {scope}{team_type} production jobs...")
     
     try:
-        with open(discovery_dir / production_file, 'r') as f:
-            production_jobs = json.load(f)
+        production_jobs = load_records(discovery_dir, Path(production_file).stem, args.delta)
         
         import_commands = []
+        imports = []
         
-        for job in production_jobs.get('data', []):
+        for job in production_jobs:
             job_id = job['id']
             job_name = job['name']
             
@@ -86,10 +92,20 @@ def main():
             
             import_command = f"terraform import dbtcloud_job.team_jobs[\\\"{terraform_name}\\\"] {job_id}"
             import_commands.append(import_command)
+            imports.append((f'dbtcloud_job.team_jobs["{terraform_name}"]', job_id))
+        
+        # Lets execute_job_imports.py move the delta baseline to the snapshot these jobs came from
+        note = snapshot_note(delta_snapshot(discovery_dir))
+        
+        if args.format == 'blocks':
+            header = "Generated by generate_job_import_commands.py; apply with execute_job_imports.py --batch"
+            write_import_blocks(blocks_file, imports, "\n".join(filter(None, [header, note])))
+            print(f"✅ {len(imports)} import blocks generated in {blocks_file}")
+            return 0
         
         # Save commands to file
         with open(output_file, 'w') as f:
-            f.write('\n'.join(import_commands))
+            f.write('\n'.join([f"# {note}"] + import_commands if note else import_commands))
         
         print(f"✅ Import commands generated in {output_file}")
         print("")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Job categorization shared by discovery, import generation and tfvars conversion
+
+The categories live in job_categories.json (or JOB_CATEGORIES_FILE), in
+priority order. A job belongs to the first category that has a keyword or
+pattern anywhere in its lowercased name, and to the default category when none
+matches. discover_jobs.py files jobs by category, generate_job_import_commands.py
+prefixes resource keys with it and convert_jobs_to_tfvars.py labels each job
+with it, so all three always agree.
+
+The rules are compiled once into a flat keyword table in priority order, with
+keywords that contain an earlier keyword dropped ("adwords" after "ad"). A name
+is lowercased once and the table is checked with plain substring tests, which
+run in C and stop at the first hit. Patterns are compiled regular expressions,
+only tried for categories that outrank the keyword hit, so names are never run
+through a regular expression unless the rules define patterns.
+
+Usage:
+    engine = load_engine()
+    engine.categorize("Weekly Campaign Performance")        # 'campaign'
+    engine.category("Weekly Campaign Performance").prefix   # 'campaign_'
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+DEFAULT_RULES_FILE = Path(__file__).resolve().with_name("job_categories.json")
+
+
+class Category:
+    """A category's name, resource-key prefix and summary label"""
+
+    def __init__(self, name: str, prefix: str = "", label: Optional[str] = None):
+        self.name = name
+        self.prefix = prefix
+        self.label = label
+
+
+class CategoryEngine:
+    """Categories compiled into a priority-ordered keyword table and patterns"""
+
+    def __init__(self, categories: List[Dict[str, Any]], default: Optional[Dict[str, Any]] = None):
+        self.categories = [Category(c['name'], c.get('prefix', ""), c.get('label')) for c in categories]
+        self.default = Category(**(default or {"name": "general"}))
+
+        # (keyword, category index) in priority order; the first keyword in the name decides
+        self._keywords: List[Tuple[str, int]] = []
+        # (pattern, category index) in priority order
+        self._patterns: List[Tuple[Pattern[str], int]] = []
+        for index, category in enumerate(categories):
+            for keyword in category.get('keywords', []):
+                keyword = keyword.lower()
+                # A keyword containing an earlier one can never be the first hit
+                if keyword and not any(earlier in keyword for earlier, _ in self._keywords):
+                    self._keywords.append((keyword, index))
+            for pattern in category.get('patterns', []):
+                try:
+                    self._patterns.append((re.compile(pattern), index))
+                except re.error as e:
+                    raise ValueError(f"invalid pattern for category '{category['name']}': {e}")
+
+    @classmethod
+    def from_file(cls, path: str) -> "CategoryEngine":
+        with open(path, 'r') as f:
+            rules = json.load(f)
+        return cls(rules['categories'], rules.get('default'))
+
+    @property
+    def labels(self) -> Dict[str, Optional[str]]:
+        """Summary label of every category by name, the default last"""
+        return {category.name: category.label for category in self.categories + [self.default]}
+
+    def category(self, job_name: str) -> Category:
+        name = job_name.lower()
+        best = len(self.categories)
+        for keyword, index in self._keywords:
+            if keyword in name:
+                best = index
+                break
+        for pattern, index in self._patterns:
+            if index >= best:
+                break
+            if pattern.search(name):
+                best = index
+                break
+        return self.categories[best] if best < len(self.categories) else self.default
+
+    def categorize(self, job_name: str) -> str:
+        return self.category(job_name).name
+
+
+@lru_cache(maxsize=None)
+def load_engine(path: Optional[str] = None) -> CategoryEngine:
+    """Engine for the rules file (default: JOB_CATEGORIES_FILE or job_categories.json), compiled once per process"""
+    return CategoryEngine.from_file(path or os.getenv('JOB_CATEGORIES_FILE') or str(DEFAULT_RULES_FILE))
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Terraform 1.5 import blocks and the batch import that applies them
+
+`terraform import` handles one resource per process: every call loads the
+provider, takes the state lock and refreshes, so an account with a few hundred
+jobs takes minutes to hours. Since Terraform 1.5 the same imports can be
+declared as `import {}` blocks and carried out by one plan/apply, which loads
+the provider and locks the state once for all of them.
+
+The generators write the blocks (--format blocks) and the import scripts apply
+them with --batch: one `terraform init` against a plugin cache shared by every
+working directory, one `terraform plan -out`, and one `terraform apply` of that
+plan. The plan is applied only if importing is all it does; an imported resource
+whose configuration differs from dbt Cloud would otherwise be changed by the
+same apply, which `terraform import` never did.
+
+Before importing anything, the state is read once (`terraform state pull`, or
+the local terraform.tfstate) into a StateIndex of managed addresses and ids, so
+re-runs only import what is missing instead of letting `terraform import` fail
+on everything already managed. ImportTracker counts skipped, attempted and
+failed imports and appends each outcome to a journal, which --resume reads to
+continue an interrupted run even where the state cannot be read.
+
+Usage:
+    tracker = ImportTracker(StateIndex.load(), ImportJournal())
+    pending = [(address, id) for address, id in imports if tracker.pending(address, id)]
+    write_import_blocks("imports.tf", pending)
+    batch_import(var_files=["env_file/prod_env.tfvars"])
+"""
+
+import json
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Written next to main.tf: Terraform only reads import blocks from the root module
+IMPORT_BLOCKS_FILE = "imports.tf"
+PLAN_FILE = "import.tfplan"
+IMPORT_JOURNAL_FILE = "import_journal.jsonl"
+LOCAL_STATE_FILE = "terraform.tfstate"
+DEFAULT_PLUGIN_CACHE_DIR = "~/.terraform.d/plugin-cache"
+
+_IMPORT_BLOCK_RE = re.compile(r'^import\s*\{', re.MULTILINE)
+_IMPORT_BODY_RE = re.compile(r'^import\s*\{(.*?)^\}', re.MULTILINE | re.DOTALL)
+_IMPORT_TO_RE = re.compile(r'^\s*to\s*=\s*(\S+)\s*$', re.MULTILINE)
+_IMPORT_ID_RE = re.compile(r'^\s*id\s*=\s*("(?:[^"\\]|\\.)*")\s*$', re.MULTILINE)
+
+# Plan actions that leave dbt Cloud untouched
+_READ_ONLY_ACTIONS = (["no-op"], ["read"])
+
+
+def hcl_string(value: Any) -> str:
+    """Quoted HCL string; JSON escapes are valid HCL, template sequences are not"""
+    quoted = json.dumps(str(value), ensure_ascii=False)
+    return quoted.replace("${", "$${").replace("%{", "%%{")
+
+
+def import_block(address: str, resource_id: Any) -> str:
+    return f"import {{\n  to = {address}\n  id = {hcl_string(resource_id)}\n}}\n"
+
+
+def write_import_blocks(path: str, imports: Iterable[Tuple[str, Any]], header: Optional[str] = None) -> int:
+    """Write one import block per (address, id); returns the number written"""
+    blocks = [import_block(address, resource_id) for address, resource_id in imports]
+    comment = "".join(f"# {line}\n" if line else "#\n" for line in (header or "").splitlines())
+    with open(path, 'w') as f:
+        f.write(comment + ("\n" if comment else "") + "\n".join(blocks))
+    return len(blocks)
+
+
+def count_import_blocks(path: str) -> int:
+    with open(path, 'r') as f:
+        return len(_IMPORT_BLOCK_RE.findall(f.read()))
+
+
+def read_import_blocks(path: str) -> Tuple[List[Tuple[str, str]], str]:
+    """(address, id) of every import block in a file, and the file's leading comment
+
+    Raises ValueError for a block whose address or id is not a plain literal,
+    since it could not be checked against the state.
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+    header = []
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            break
+        header.append(line[1:].strip())
+
+    imports = []
+    for body in _IMPORT_BODY_RE.findall(text):
+        to, resource_id = _IMPORT_TO_RE.search(body), _IMPORT_ID_RE.search(body)
+        if not to or not resource_id:
+            raise ValueError(f"cannot read the address and id of import block: {' '.join(body.split())}")
+        # Undo hcl_string's escaping of template sequences
+        value = json.loads(resource_id.group(1)).replace("$${", "${").replace("%%{", "%{")
+        imports.append((to.group(1), value))
+    if len(imports) != len(_IMPORT_BLOCK_RE.findall(text)):
+        raise ValueError("some import blocks are not closed by a '}' line of their own")
+    return imports, "\n".join(header)
+
+
+def parse_import_command(line: str) -> Optional[Tuple[str, str]]:
+    """(address, id) of a `terraform import ADDRESS ID` line, None for comments and blank lines"""
+    parts = line.split()
+    if len(parts) != 4 or parts[:2] != ["terraform", "import"]:
+        return None
+    # The job generators escape the quotes around for_each keys for the shell
+    return parts[2].replace('\\"', '"'), parts[3]
+
+
+def plugin_cache_env() -> Dict[str, str]:
+    """Environment with TF_PLUGIN_CACHE_DIR set, so providers are downloaded once per machine"""
+    cache_dir = Path(os.getenv('TF_PLUGIN_CACHE_DIR') or DEFAULT_PLUGIN_CACHE_DIR).expanduser()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return dict(os.environ, TF_PLUGIN_CACHE_DIR=str(cache_dir), TF_IN_AUTOMATION="1")
+
+
+def terraform_init(env: Optional[Dict[str, str]] = None) -> bool:
+    """`terraform init` against the shared plugin cache; False (with the reason printed) on failure"""
+    env = env or plugin_cache_env()
+    print(f"🔧 Initializing Terraform (plugin cache: {env['TF_PLUGIN_CACHE_DIR']})...")
+    try:
+        returncode = subprocess.run(["terraform", "init", "-input=false"], env=env, check=False).returncode
+    except FileNotFoundError:
+        print("❌ terraform not found on PATH")
+        return False
+    if returncode != 0:
+        print("❌ terraform init failed")
+        return False
+    return True
+
+
+def resource_type(address: str) -> str:
+    """dbtcloud_job for module.jobs.dbtcloud_job.team_jobs["daily"]"""
+    parts = address.split('[', 1)[0].split('.')
+    while parts[0] == "module" and len(parts) > 2:
+        parts = parts[2:]
+    return parts[0]
+
+
+class StateIndex:
+    """Addresses and ids of the resources already in the Terraform state"""
+
+    def __init__(self, ids_by_address: Dict[str, str]):
+        self.ids_by_address = ids_by_address
+        self.addresses_by_id = {
+            (resource_type(address), resource_id): address for address, resource_id in ids_by_address.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids_by_address)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StateIndex":
+        """Index a raw (format version 4) state document"""
+        ids_by_address = {}
+        for resource in state.get('resources', []):
+            if resource.get('mode') != "managed":
+                continue
+            prefix = f"{resource['module']}." if resource.get('module') else ""
+            base = f"{prefix}{resource['type']}.{resource['name']}"
+            for instance in resource.get('instances', []):
+                key = instance.get('index_key')
+                if key is None:
+                    address = base
+                elif isinstance(key, str):
+                    address = f"{base}[{json.dumps(key)}]"
+                else:
+                    address = f"{base}[{key}]"
+                ids_by_address[address] = str((instance.get('attributes') or {}).get('id'))
+        return cls(ids_by_address)
+
+    @classmethod
+    def load(cls, state_file: str = LOCAL_STATE_FILE) -> Optional["StateIndex"]:
+        """Read the state once, from the configured backend or else the local state file
+
+        Returns None when neither can be read, in which case nothing can be skipped.
+        """
+        try:
+            pulled = subprocess.run(["terraform", "state", "pull"], capture_output=True, text=True, check=False)
+            if pulled.returncode == 0:
+                # Empty output: the backend has no state yet
+                return cls.from_state(json.loads(pulled.stdout) if pulled.stdout.strip() else {})
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(state_file, 'r') as f:
+                return cls.from_state(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not parse {state_file}: {e}")
+            return None
+
+    def managed_as(self, address: str, resource_id: Any) -> Optional[str]:
+        """Address that already manages this resource, if any"""
+        if address in self.ids_by_address:
+            return address
+        return self.addresses_by_id.get((resource_type(address), str(resource_id)))
+
+
+class ImportJournal:
+    """Import outcomes, appended as they happen so an interrupted run can resume"""
+
+    def __init__(self, path: str = IMPORT_JOURNAL_FILE):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, str]:
+        """address -> id of every import the journal records as done"""
+        try:
+            lines = self.path.read_text().splitlines()
+        except FileNotFoundError:
+            return {}
+        imported = {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A run killed mid-write leaves a partial last line
+                continue
+            if 'imported' in entry:
+                imported[entry['imported']] = str(entry['id'])
+        return imported
+
+    def start(self) -> None:
+        """Begin a new run, discarding the outcomes of any previous one"""
+        self.path.unlink(missing_ok=True)
+
+    def record(self, address: str, resource_id: Any, error: Optional[str] = None) -> None:
+        entry = {"imported": address, "id": str(resource_id)} if error is None else \
+            {"failed": address, "id": str(resource_id), "error": error}
+        try:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+
+    def finish(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class ImportTracker:
+    """Pre-flight filter and outcome counts shared by the import scripts"""
+
+    def __init__(self, state: Optional[StateIndex], journal: ImportJournal, resume: bool = False):
+        self.state = state
+        self.journal = journal
+        self.journaled = journal.load() if resume else {}
+        if not resume:
+            journal.start()
+        self.skipped = 0
+        self.attempted = 0
+        self.failed: List[str] = []
+        if state is None:
+            print("⚠️  Could not read the Terraform state; resources already in it cannot be skipped")
+        else:
+            print(f"🔎 {len(state)} resources already in the Terraform state")
+        if self.journaled:
+            print(f"♻️  Resuming from {journal.path} ({len(self.journaled)} imports already done)")
+
+    def pending(self, address: str, resource_id: Any) -> bool:
+        """Whether the resource still needs importing; counts it as skipped if not"""
+        managed = self.state.managed_as(address, resource_id) if self.state else None
+        if managed is None and self.journaled.get(address) == str(resource_id):
+            managed = address
+        if managed is None:
+            return True
+        self.skipped += 1
+        if managed != address:
+            print(f"  ⏭️  {address} (ID {resource_id}) is already managed as {managed}")
+        return False
+
+    def record(self, address: str, resource_id: Any, error: Optional[str] = None) -> None:
+        self.attempted += 1
+        if error is not None:
+            self.failed.append(address)
+        self.journal.record(address, resource_id, error)
+
+    def report(self) -> int:
+        """Print the counts; returns 1 if any import failed"""
+        imported = self.attempted - len(self.failed)
+        print(f"📊 {self.skipped} skipped (already managed), {self.attempted} attempted: "
+              f"{imported} imported, {len(self.failed)} failed")
+        if self.failed:
+            print(f"❌ Failed: {', '.join(self.failed)}")
+            print(f"   Outcomes are in {self.journal.path}; re-run with --resume to retry only these")
+            return 1
+        self.journal.finish()
+        return 0
+
+
+def summarize_plan(plan: Dict[str, Any]) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Addresses the plan imports, and (address, actions) of everything it would change"""
+    importing, changes = [], []
+    for resource_change in plan.get('resource_changes', []):
+        change = resource_change.get('change', {})
+        if change.get('importing'):
+            importing.append(resource_change['address'])
+        actions = change.get('actions', [])
+        if actions not in _READ_ONLY_ACTIONS:
+            changes.append((resource_change['address'], "/".join(actions)))
+    return importing, changes
+
+
+def batch_import(var_files: Sequence[str] = (), plan_file: str = PLAN_FILE, allow_changes: bool = False,
+                 initialized: bool = False) -> int:
+    """Init, plan and apply every import block in the working directory in one Terraform run
+
+    Returns 0 once applied, 1 if a step failed or the plan would change more than state.
+    """
+    try:
+        return _batch_import(var_files, plan_file, allow_changes, initialized)
+    except FileNotFoundError:
+        print("❌ terraform not found on PATH; batch imports need Terraform 1.5 or later")
+        return 1
+
+
+def _batch_import(var_files: Sequence[str], plan_file: str, allow_changes: bool, initialized: bool) -> int:
+    env = plugin_cache_env()
+    var_args = [f"-var-file={path}" for path in var_files]
+
+    if not initialized and not terraform_init(env):
+        return 1
+
+    print("📋 Planning all imports in a single run...")
+    plan_command = ["terraform", "plan", "-input=false", f"-out={plan_file}"] + var_args
+    if subprocess.run(plan_command, env=env, check=False).returncode != 0:
+        print("❌ terraform plan failed; fix the reported import blocks or fall back to the per-resource mode")
+        return 1
+
+    shown = subprocess.run(["terraform", "show", "-json", plan_file],
+                           env=env, capture_output=True, text=True, check=False)
+    if shown.returncode != 0:
+        print(f"❌ Could not read {plan_file}: {shown.stderr.strip()}")
+        return 1
+    importing, changes = summarize_plan(json.loads(shown.stdout))
+    print(f"📥 {len(importing)} resources to import, {len(changes)} to change")
+
+    if changes and not allow_changes:
+        print("❌ Not applying: the plan would also change these resources in dbt Cloud:")
+        for address, actions in changes:
+            print(f"   {actions}: {address}")
+        print("   Update the configuration to match dbt Cloud until only imports remain, "
+              "or pass --allow-changes to apply them too.")
+        Path(plan_file).unlink(missing_ok=True)
+        return 1
+
+    print("🚀 Applying the import plan...")
+    if subprocess.run(["terraform", "apply", "-input=false", plan_file], env=env, check=False).returncode != 0:
+        print("❌ terraform apply failed")
+        return 1
+    Path(plan_file).unlink(missing_ok=True)
+    print(f"✅ Imported {len(importing)} resources in one apply")
+    return 0
@@ -0,0 +1,94 @@
+"""JobManager checks in dbt_job_manager.py against job payloads shaped like dbt Cloud's"""
+
+import copy
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+TEAM_SCRIPTS = ["dbt-analytics-team/scripts", "dbt-marketing-analytics-team/scripts"]
+
+
+@pytest.fixture(params=TEAM_SCRIPTS)
+def manager(request, monkeypatch):
+    scripts_dir = ROOT / request.param
+    monkeypatch.syspath_prepend(str(scripts_dir))
+    spec = importlib.util.spec_from_file_location(f"dbt_job_manager_{request.param_index}",
+                                                  scripts_dir / "dbt_job_manager.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name, value in {"DBTCLOUD_ACCOUNT_ID": "1", "DBTCLOUD_TOKEN": "token", "PROJECT_ID": "101",
+                        "ENVIRONMENT_ID": "301", "DBT_JOB_MANAGER_CACHE_DIR": ""}.items():
+        monkeypatch.setenv(name, value)
+    job_manager = module.JobManager()
+    yield job_manager
+    job_manager.api.close()
+    sys.modules.pop(spec.name, None)
+
+
+def live_job(config, hours):
+    """The job as dbt Cloud returns it after creating it from config"""
+    job = copy.deepcopy(config)
+    del job['tags']
+    job.update({"id": 42, "account_id": 1, "state": 1, "created_at": "2024-01-01T00:00:00+00:00"})
+    job['settings']['target_name'] = job['settings']['target_name'] or "default"
+    job['triggers']['custom_branch_only'] = False
+    job['schedule'] = {
+        "cron": f"0 {','.join(map(str, hours))} * * 0,1,2,3,4,5,6",
+        "date": {"type": "days_of_week", "days": [0, 1, 2, 3, 4, 5, 6]},
+        "time": {"type": "at_exact_hours", "hours": hours},
+    }
+    return job
+
+
+SPEC = {"name": "daily_run", "execute_steps": ["dbt build"], "schedule_type": "every_day",
+        "schedule_hours": [18, 6], "target_name": "default"}
+
+
+def test_live_schedule_matches_days_and_hours(manager):
+    config = manager.prepare_job_config(SPEC)
+    existing = live_job(config, [6, 18])
+
+    assert manager.diff_job(existing, config) == {}
+    assert manager._is_unchanged(config, existing)
+
+
+def test_live_schedule_change_is_detected(manager):
+    config = manager.prepare_job_config(SPEC)
+    existing = live_job(config, [7])
+
+    assert manager.diff_job(existing, config) == {"schedule": {"old": "0 7 * * *", "new": "0 6,18 * * *"}}
+    assert not manager._is_unchanged(config, existing)
+
+
+def test_live_schedule_without_cron(manager):
+    config = manager.prepare_job_config(SPEC)
+    existing = live_job(config, [6, 18])
+    del existing['schedule']['cron']
+
+    assert manager._is_unchanged(config, existing)
+
+
+def test_deploy_matches_only_its_own_jobs(manager):
+    config = manager.prepare_job_config(SPEC)
+    own = live_job(config, [6, 18])
+    own['tags'] = config['tags']
+    other_team = dict(own, id=43, tags=["team:marketing-team", "branch:local", "user:unknown"])
+
+    job_index = manager.build_job_index([other_team, own])
+
+    assert job_index['by_name'] == {config['name']: own}
+
+
+def test_cleanup_journal_resumes_only_in_its_pipeline(manager, tmp_path):
+    record = manager.build_ownership_index([live_job(manager.prepare_job_config(SPEC), [6])]).table.record(0)
+    manager.cleanup_journal = str(tmp_path / "cleanup.jsonl")
+    manager.pipeline_id = "1001"
+    manager._start_cleanup_journal([record])
+
+    assert [job.id for job in manager._load_cleanup_journal()[0]] == [42]
+
+    manager.pipeline_id = "1002"
+    assert manager._load_cleanup_journal() is None
@@ -0,0 +1,80 @@
+"""Delta baselines of terraform-import/discovery_store.py"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "terraform-import"))
+
+from discovery_store import (delta_snapshot, find_snapshot_note, load_records, mark_imported,  # noqa: E402
+                             record_snapshot, snapshot_note)
+
+SCOPE = "analytics-team-jobs-101"
+
+
+def job(job_id, **fields):
+    return dict({"id": job_id, "name": f"job-{job_id}", "execute_steps": ["dbt build"]}, **fields)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return str(tmp_path / "store")
+
+
+def discover(output_dir, store, jobs):
+    output_dir.mkdir(exist_ok=True)
+    return record_snapshot(output_dir, SCOPE, {"production_jobs": jobs}, store_dir=store)
+
+
+def added_ids(output_dir):
+    return sorted(record['id'] for record in load_records(output_dir, "production_jobs", delta=True))
+
+
+def test_discovering_twice_before_an_import_keeps_the_first_additions(tmp_path, store):
+    output_dir = tmp_path / "job_discovery"
+    discover(output_dir, store, [job(1)])
+    assert mark_imported(*delta_snapshot(output_dir), store_dir=store)
+
+    discover(output_dir, store, [job(1), job(2)])
+    # No import in between: the second run must still list job 2
+    discover(output_dir, store, [job(1), job(2), job(3)])
+
+    assert added_ids(output_dir) == [2, 3]
+
+
+def test_import_moves_the_baseline(tmp_path, store):
+    output_dir = tmp_path / "job_discovery"
+    discover(output_dir, store, [job(1)])
+    discover(output_dir, store, [job(1), job(2)])
+    mark_imported(*delta_snapshot(output_dir), store_dir=store)
+
+    delta = discover(output_dir, store, [job(1), job(2, execute_steps=["dbt run"]), job(3)])
+
+    assert added_ids(output_dir) == [3]
+    assert [change['id'] for change in delta['resources']['production_jobs']['changed']] == [2]
+
+
+def test_nothing_imported_yet_lists_every_record(tmp_path, store):
+    output_dir = tmp_path / "job_discovery"
+    discover(output_dir, store, [job(1)])
+    delta = discover(output_dir, store, [job(1), job(2)])
+
+    assert delta['base'] is None
+    assert added_ids(output_dir) == [1, 2]
+
+
+def test_generated_file_note_names_its_snapshot(tmp_path, store):
+    output_dir = tmp_path / "job_discovery"
+    discover(output_dir, store, [job(1)])
+    snapshot = delta_snapshot(output_dir)
+    text = f"# {snapshot_note(snapshot)}\nterraform import dbtcloud_job.team_jobs[\\\"job_1\\\"] 1\n"
+
+    # A later discovery run does not change which snapshot the file came from
+    discover(output_dir, store, [job(1), job(2)])
+
+    assert find_snapshot_note(text) == snapshot
+    assert mark_imported(*find_snapshot_note(text), store_dir=store)
+    assert added_ids(output_dir) == [1, 2]
+    discover(output_dir, store, [job(1), job(2)])
+    assert added_ids(output_dir) == [2]
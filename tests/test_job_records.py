@@ -0,0 +1,95 @@
+"""Job ownership in job_records.py: tags first, then job names and descriptions"""
+
+import importlib.util
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+TEAM_SCRIPTS = ["dbt-analytics-team/scripts", "dbt-marketing-analytics-team/scripts"]
+TEAM = "analytics-team"
+
+
+@pytest.fixture(params=TEAM_SCRIPTS)
+def job_records(request):
+    spec = importlib.util.spec_from_file_location(f"job_records_{request.param_index}",
+                                                  ROOT / request.param / "job_records.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+def job(job_id, name, tags=None, description=None, created_at="2024-01-01T00:00:00Z"):
+    return {"id": job_id, "name": name, "project_id": 101, "environment_id": 301, "state": 1,
+            "created_at": created_at, "tags": tags, "description": description}
+
+
+def owned_ids(index, rows):
+    return sorted(index.table.ids[row] for row in rows)
+
+
+def test_tags_decide_ownership(job_records):
+    index = job_records.OwnershipIndex.from_jobs([
+        job(1, "anything", ["team:analytics-team", "branch:feat-x", "user:jane-doe"]),
+        job(2, "analytics-team-daily", ["team:analytics-team", "branch:main", "user:jane-doe"]),
+        job(3, "analytics-team-feat-x-jane-doe-daily", ["team:marketing-team", "branch:feat-x", "user:jane-doe"]),
+    ], TEAM, "feat-x", "jane-doe")
+
+    assert owned_ids(index, index.branch_rows(TEAM, "feat-x", "jane-doe")) == [1]
+    assert owned_ids(index, index.production_rows(TEAM)) == [2]
+    assert owned_ids(index, index.branch_rows("marketing-team")) == [3]
+
+
+def test_untagged_jobs_of_the_current_branch(job_records):
+    index = job_records.OwnershipIndex.from_jobs([
+        job(1, "analytics-team-feat-x-jane-doe-core-daily-refresh"),
+        job(2, "analytics-team-core-daily-refresh"),
+        job(3, "marketing-team-campaign-daily"),
+    ], TEAM, "feat-x", "jane-doe")
+
+    assert owned_ids(index, index.branch_rows(TEAM, "feat-x", "jane-doe")) == [1]
+    assert owned_ids(index, index.production_rows(TEAM)) == [2]
+    assert 2 not in owned_ids(index, index.branch_rows(TEAM))
+    assert TEAM in index.owners and len(index.owners) == 1
+
+
+def test_untagged_jobs_of_other_branches_are_branch_jobs(job_records):
+    index = job_records.OwnershipIndex.from_jobs([
+        job(1, "analytics-team-fix-y-john-smith-core-daily-refresh",
+            description="Daily refresh (Branch: fix-y, User: john-smith)"),
+        job(2, "analytics-team-core-daily-refresh", description="Daily refresh"),
+        job(3, "analytics-team-core-daily-refresh-2", description="Copy (Branch: fix-y, User: john-smith)"),
+        job(4, "analytics-team-main-john-smith-daily", description="Daily (Branch: main, User: john-smith)"),
+    ], TEAM, "feat-x", "jane-doe")
+
+    # Cleanup runs on the default branch and still finds other branches' jobs
+    assert owned_ids(index, index.branch_rows(TEAM)) == [1]
+    assert owned_ids(index, index.branch_rows(TEAM, "fix-y", "john-smith")) == [1]
+    assert owned_ids(index, index.branch_rows(TEAM, "feat-x", "jane-doe")) == []
+    assert owned_ids(index, index.production_rows(TEAM)) == [2, 3, 4]
+
+
+def test_untagged_jobs_on_a_production_branch(job_records):
+    index = job_records.OwnershipIndex.from_jobs([
+        job(1, "analytics-team-core-daily-refresh"),
+        job(2, "analytics-team-fix-y-john-smith-daily", description="Daily (Branch: fix-y, User: john-smith)"),
+    ], TEAM, "main", "jane-doe")
+
+    assert owned_ids(index, index.production_rows(TEAM)) == [1]
+    assert owned_ids(index, index.branch_rows(TEAM)) == [2]
+
+
+def test_select_old_branch_jobs(job_records):
+    index = job_records.OwnershipIndex.from_jobs([
+        job(1, "a", ["team:analytics-team", "branch:feat-x", "user:jane-doe"], created_at="2024-01-01T00:00:00Z"),
+        job(2, "b", ["team:analytics-team", "branch:feat-x", "user:jane-doe"], created_at="2024-03-01T00:00:00Z"),
+        job(3, "c", ["team:analytics-team", "branch:main", "user:jane-doe"], created_at="2024-01-01T00:00:00Z"),
+        job(4, "d", ["team:analytics-team", "branch:fix-y", "user:jane-doe"], created_at=None),
+    ], TEAM)
+
+    rows = index.table.select(created_before=datetime(2024, 2, 1), rows=index.branch_rows(TEAM))
+
+    assert [record.id for record in index.table.records(rows)] == [1]
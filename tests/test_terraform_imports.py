@@ -0,0 +1,104 @@
+"""Pre-flight of existing import blocks files in terraform-import/complete_import.py and execute_job_imports.py"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "terraform-import"))
+
+import complete_import  # noqa: E402
+import execute_job_imports  # noqa: E402
+from terraform_imports import (ImportJournal, ImportTracker, StateIndex, read_import_blocks,  # noqa: E402
+                               write_import_blocks)
+
+MANAGED = ("dbtcloud_project.analytics", "101")
+MISSING = ("dbtcloud_environment.production", "301")
+STATE = {
+    "version": 4,
+    "resources": [{"mode": "managed", "type": "dbtcloud_project", "name": "analytics",
+                   "instances": [{"attributes": {"id": "101"}}]}],
+}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DBT_DISCOVERY_STORE", "")
+    return tmp_path
+
+
+class FakeBatchImport:
+    """batch_import stand-in that records the blocks each apply would import"""
+
+    def __init__(self, blocks_file, result=0):
+        self.blocks_file = blocks_file
+        self.result = result
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(read_import_blocks(self.blocks_file)[0])
+        return self.result
+
+
+def fake_batch_import(monkeypatch, blocks_file, result=0):
+    fake = FakeBatchImport(blocks_file, result)
+    for module in (complete_import, execute_job_imports):
+        monkeypatch.setattr(module, "batch_import", fake)
+    return fake
+
+
+def journal_entries(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()] if Path(path).exists() else []
+
+
+def test_read_import_blocks_round_trip(workdir):
+    write_import_blocks("imports.tf", [MANAGED, ('dbtcloud_job.team_jobs["daily"]', 7)], "Header\nSecond line")
+
+    imports, header = read_import_blocks("imports.tf")
+
+    assert imports == [MANAGED, ('dbtcloud_job.team_jobs["daily"]', "7")]
+    assert header == "Header\nSecond line"
+
+
+def test_complete_import_skips_blocks_already_in_state(workdir, monkeypatch):
+    applied = fake_batch_import(monkeypatch, "imports.tf")
+    write_import_blocks("imports.tf", [MANAGED, MISSING], "Generated by generate_import_commands.py")
+    tracker = ImportTracker(StateIndex.from_state(STATE), ImportJournal(), resume=False)
+    args = argparse.Namespace(var_files=[], allow_changes=False)
+
+    assert complete_import.import_existing_blocks(args, tracker) == 0
+
+    assert applied.calls == [[MISSING]]
+    assert (tracker.skipped, tracker.attempted, tracker.failed) == (1, 1, [])
+    assert read_import_blocks("imports.tf")[1].startswith("Generated by generate_import_commands.py")
+
+
+def test_complete_import_journals_failed_blocks(workdir, monkeypatch):
+    fake_batch_import(monkeypatch, "imports.tf", result=1)
+    write_import_blocks("imports.tf", [MANAGED, MISSING])
+    tracker = ImportTracker(StateIndex.from_state(STATE), ImportJournal(), resume=False)
+    args = argparse.Namespace(var_files=[], allow_changes=False)
+
+    assert complete_import.import_existing_blocks(args, tracker) == 1
+
+    assert [entry.get('failed') for entry in journal_entries("import_journal.jsonl")] == [MISSING[0]]
+
+
+def test_execute_job_imports_skips_blocks_already_in_state(workdir, monkeypatch):
+    managed_job = ('dbtcloud_job.team_jobs["daily"]', "42")
+    missing_job = ('dbtcloud_job.team_jobs["hourly"]', "43")
+    state = {"version": 4, "resources": [{"mode": "managed", "type": "dbtcloud_job", "name": "team_jobs",
+                                          "instances": [{"index_key": "daily", "attributes": {"id": "42"}}]}]}
+    applied = fake_batch_import(monkeypatch, "job_imports.tf")
+    write_import_blocks("job_imports.tf", [managed_job, missing_job])
+    monkeypatch.setattr(execute_job_imports, "terraform_init", lambda: True)
+    monkeypatch.setattr(execute_job_imports.StateIndex, "load", classmethod(lambda cls: cls.from_state(state)))
+    monkeypatch.setattr("builtins.input", lambda prompt: "yes")
+    monkeypatch.setattr(sys, "argv", ["execute_job_imports.py", "--batch"])
+
+    assert execute_job_imports.main() == 0
+
+    assert applied.calls == [[missing_job]]
@@ -0,0 +1,118 @@
+"""The .tfvars subset of HCL that tfvars_parser.py reads"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+TEAM_SCRIPTS = ["dbt-analytics-team/scripts", "dbt-marketing-analytics-team/scripts"]
+
+
+@pytest.fixture(params=TEAM_SCRIPTS)
+def parser(request):
+    spec = importlib.util.spec_from_file_location(f"tfvars_parser_{request.param_index}",
+                                                  ROOT / request.param / "tfvars_parser.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+def test_string_escapes(parser):
+    text = r'''
+name = "say \"hi\"\tthen\\leave\n"
+unicode = "café \U0001F600"
+template = "${var.team_name}-\$keep"
+'''
+    assert parser.parse_tfvars(text) == {
+        "name": 'say "hi"\tthen\\leave\n',
+        "unicode": "café \U0001F600",
+        "template": "${var.team_name}-\\$keep",
+    }
+
+
+def test_multi_line_lists_and_maps(parser):
+    text = '''
+jobs = [
+  {
+    name           = "core-daily-refresh"
+    execute_steps  = [
+      "dbt seed",
+      "dbt run --select tag:core"
+    ]
+    schedule_hours = [6, 18]
+    settings = { threads = 4, "target-name": "prod" }
+    ratio          = -1.5e2
+    enabled        = true
+    description    = null
+  },
+  { name = "empty" }
+]
+'''
+    assert parser.parse_tfvars(text) == {"jobs": [
+        {
+            "name": "core-daily-refresh",
+            "execute_steps": ["dbt seed", "dbt run --select tag:core"],
+            "schedule_hours": [6, 18],
+            "settings": {"threads": 4, "target-name": "prod"},
+            "ratio": -150.0,
+            "enabled": True,
+            "description": None,
+        },
+        {"name": "empty"},
+    ]}
+
+
+def test_comments(parser):
+    text = '''
+# hash comment
+account_id = 1 // line comment
+/* block
+   comment = "not an attribute" */
+url = "https://cloud.getdbt.com/#jobs" # the # inside the string stays
+'''
+    assert parser.parse_tfvars(text) == {"account_id": 1, "url": "https://cloud.getdbt.com/#jobs"}
+
+
+def test_trailing_commas(parser):
+    assert parser.parse_tfvars('steps = ["dbt build", "dbt test",]\nmap = { a = 1, b = 2, }') == {
+        "steps": ["dbt build", "dbt test"],
+        "map": {"a": 1, "b": 2},
+    }
+
+
+def test_heredocs(parser):
+    text = '''
+notes = <<EOT
+Runs "dbt build" \\n verbatim
+  keeps indentation
+EOT
+jobs = [{
+  description = <<-EOT
+    Indented heredoc
+      nested line
+    EOT
+}]
+'''
+    assert parser.parse_tfvars(text) == {
+        "notes": 'Runs "dbt build" \\n verbatim\n  keeps indentation\n',
+        "jobs": [{"description": "Indented heredoc\n  nested line\n"}],
+    }
+
+
+@pytest.mark.parametrize("text, message, line, column", [
+    ('a = 1\nb = "unterminated\n', "Unexpected character '\"'", 2, 5),
+    ('jobs = [\n  1,\n  2\n  3\n]', "Expected ',' or ']', found '3'", 4, 3),
+    ('a = 1\na = 2', "Duplicate attribute 'a'", 2, 1),
+    ('map = { a = 1\n', "Unterminated object", 2, 1),
+    ('value = upper("x")', "Unsupported expression 'upper'", 1, 9),
+    ('a = 1\nnotes = <<EOT\nnever closed\n', "Unterminated heredoc", 2, 9),
+])
+def test_error_positions(parser, text, message, line, column):
+    with pytest.raises(parser.TfvarsSyntaxError) as error:
+        parser.parse_tfvars(text, source="jobs.tfvars")
+
+    assert (error.value.line, error.value.column) == (line, column)
+    assert str(error.value) == f"jobs.tfvars:{line}:{column}: {message}"